@@ -0,0 +1,17 @@
+"""
+Convenience script to run the request router in front of several Flask nodes.
+"""
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.config import config
+from src.ui.router_app import run_router
+
+if __name__ == "__main__":
+    print(f"Starting router ({config.ROUTER_STRATEGY}) for: {', '.join(config.ROUTER_BACKENDS)}")
+    print(f"Listening on http://{config.ROUTER_HOST}:{config.ROUTER_PORT}")
+    print("-" * 50)
+    run_router()
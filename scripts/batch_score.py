@@ -0,0 +1,319 @@
+"""
+Offline batch scoring for the Fake News Detector.
+Streams articles from a JSONL or CSV file, scores them in vectorized
+batches across worker processes with ModelService, and writes one JSON
+result per input record, in input order. Progress is checkpointed, so
+an interrupted job resumes where it stopped with --resume.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.services.model_service import ModelService
+
+# Bump when the checkpoint layout changes
+CHECKPOINT_VERSION = 1
+
+
+@dataclass(slots=True)
+class Record:
+    """One input record: its position, text (None if unreadable) and optional id."""
+    index: int
+    text: Optional[str]
+    record_id: Any = None
+    error: Optional[str] = None
+    # Byte offset just past the record (JSONL only), for seeking on resume
+    end_offset: Optional[int] = None
+
+
+def detect_format(path: str, fmt: Optional[str]) -> str:
+    """Pick the input format from --format or the file extension."""
+    if fmt:
+        return fmt
+    suffix = Path(path).suffix.lower()
+    if suffix in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if suffix == ".csv":
+        return "csv"
+    raise ValueError(f"Cannot tell the format of {path}; pass --format jsonl or --format csv")
+
+
+def iter_jsonl(path: str, text_field: str, id_field: Optional[str],
+               start_index: int = 0, start_offset: int = 0) -> Iterator[Record]:
+    """
+    Stream records from a JSONL file, starting at a byte offset.
+
+    Lines are read as bytes so every record knows the offset right after
+    it, which lets a checkpoint resume with a seek instead of a re-read.
+    """
+    index = start_index
+    with open(path, 'rb') as f:
+        f.seek(start_offset)
+        offset = start_offset
+        for raw in f:
+            offset += len(raw)
+            if not raw.strip():
+                continue
+            try:
+                item = json.loads(raw)
+                if not isinstance(item, dict):
+                    raise ValueError("record is not a JSON object")
+            except ValueError as e:
+                yield Record(index, None, error=f"Invalid JSON: {e}", end_offset=offset)
+            else:
+                text = item.get(text_field)
+                record_id = item.get(id_field) if id_field else None
+                if not isinstance(text, str):
+                    yield Record(index, None, record_id, error=f"Missing '{text_field}' field", end_offset=offset)
+                else:
+                    yield Record(index, text, record_id, end_offset=offset)
+            index += 1
+
+
+def iter_csv(path: str, text_field: str, id_field: Optional[str], start_index: int = 0) -> Iterator[Record]:
+    """
+    Stream records from a CSV file with a header row.
+
+    Quoted fields may span lines, so resuming skips already-scored rows
+    by count rather than seeking.
+    """
+    csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames is None or text_field not in reader.fieldnames:
+            raise ValueError(f"CSV file must have a '{text_field}' column")
+        for index, row in enumerate(reader):
+            if index < start_index:
+                continue
+            yield Record(index, row[text_field] or "", row.get(id_field) if id_field else None)
+
+
+def iter_batches(records: Iterator[Record], size: int) -> Iterator[List[Record]]:
+    """Group records into lists of at most size records."""
+    batch: List[Record] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def score_batch(service: ModelService, batch: List[Record]) -> List[str]:
+    """Score a batch and format one output line per record, in order."""
+    texts = [record.text for record in batch if record.text is not None]
+    results = iter(service.predict_batch(texts))
+
+    lines = []
+    for record in batch:
+        output = {"index": record.index}
+        if record.record_id is not None:
+            output["id"] = record.record_id
+        if record.text is None:
+            output["error"] = record.error
+        else:
+            output.update(next(results).to_dict())
+        lines.append(json.dumps(output, ensure_ascii=False) + "\n")
+    return lines
+
+
+def input_signature(path: str) -> Tuple[int, int]:
+    """(size, mtime in ns) of the input, used to detect a changed file on resume."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def load_checkpoint(path: Path) -> Optional[dict]:
+    """Read a checkpoint file, or None if there is none."""
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version in {path}")
+    return checkpoint
+
+
+def save_checkpoint(path: Path, checkpoint: dict) -> None:
+    """Write a checkpoint atomically."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Score a JSONL or CSV file of articles.")
+    parser.add_argument("input", help="JSONL or CSV file of articles")
+    parser.add_argument("output", help="JSONL file for the results (one line per input record)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None,
+                        help="Input format (default: from the file extension)")
+    parser.add_argument("--text-field", default="text", help="Field or column holding the article text")
+    parser.add_argument("--id-field", default=None, help="Optional field or column copied to the output as 'id'")
+    parser.add_argument("--model-path", default=None, help="Model to score with (default: config MODEL_PATH)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Scoring processes (0 = score in this process; default: all cores)")
+    parser.add_argument("--batch-size", type=int, default=2048, help="Records per scoring batch")
+    parser.add_argument("--worker-chunk-size", type=int, default=256,
+                        help="Records sent to a worker per task")
+    parser.add_argument("--checkpoint-every", type=int, default=20000,
+                        help="Records between checkpoints")
+    parser.add_argument("--progress-interval", type=float, default=5.0,
+                        help="Seconds between progress lines")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Reuse predictions for near-duplicate texts (MinHash over cleaned tokens)")
+    parser.add_argument("--dedup-threshold", type=float, default=None,
+                        help="Minimum estimated Jaccard similarity for reuse (default: config DEDUP_THRESHOLD)")
+    parser.add_argument("--prediction-cache", nargs="?", const="", default=None, metavar="PATH",
+                        help="Reuse and store predictions in the persistent cache "
+                             "(default path: config PREDICTION_CACHE_PATH)")
+    parser.add_argument("--resume", action="store_true", help="Continue from the output's checkpoint")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Start over even if a checkpoint exists for the output")
+    return parser.parse_args()
+
+
+def main():
+    """Score the input file and write ordered results."""
+    args = parse_args()
+    fmt = detect_format(args.input, args.format)
+    output_path = Path(args.output)
+    checkpoint_path = output_path.with_name(output_path.name + ".checkpoint")
+
+    service = ModelService(args.model_path)
+    service.load_model()
+
+    checkpoint = load_checkpoint(checkpoint_path)
+    if checkpoint is not None and not (args.resume or args.overwrite):
+        print(f"Error: {checkpoint_path} exists; pass --resume to continue or --overwrite to start over")
+        sys.exit(1)
+
+    signature = list(input_signature(args.input))
+    start_index = start_offset = output_bytes = 0
+    if args.resume and checkpoint is not None:
+        if checkpoint["input_signature"] != signature:
+            print("Error: Input file changed since the checkpoint was written; use --overwrite")
+            sys.exit(1)
+        if checkpoint["model_version"] != service.model_version:
+            print("Warning: Model changed since the checkpoint; resumed rows use the new model")
+        if checkpoint.get("complete"):
+            print(f"Nothing to do: {output_path} is complete ({checkpoint['records']} records)")
+            return
+        start_index = checkpoint["records"]
+        start_offset = checkpoint.get("input_offset") or 0
+        output_bytes = checkpoint["output_bytes"]
+        print(f"Resuming after {start_index} records")
+
+    if fmt == "jsonl":
+        records = iter_jsonl(args.input, args.text_field, args.id_field, start_index, start_offset)
+    else:
+        records = iter_csv(args.input, args.text_field, args.id_field, start_index)
+
+    if args.dedup:
+        service.enable_dedup(threshold=args.dedup_threshold)
+    if args.prediction_cache is not None:
+        service.enable_prediction_cache(args.prediction_cache or None)
+    if args.workers > 0:
+        service.enable_process_pool(workers=args.workers, chunk_size=args.worker_chunk_size)
+
+    # Several batches stay in flight so workers keep busy while results are
+    # written; futures are drained in submission order to keep input order
+    in_flight = max(2, args.workers * 2) if args.workers > 0 else 1
+    done = start_index
+    last_checkpoint = done
+    started = last_report = time.perf_counter()
+    scored = 0
+    # (records done, input offset, output bytes) as of the last batch fully
+    # written; stored in one assignment so an interrupt never splits it
+    progress = (start_index, start_offset, output_bytes)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output = open(output_path, 'r+b' if output_bytes else 'wb')
+    try:
+        # Drop anything written after the last checkpoint
+        output.truncate(output_bytes)
+        output.seek(output_bytes)
+
+        def write_checkpoint(complete: bool = False) -> None:
+            records, offset, written = progress
+            output.flush()
+            os.fsync(output.fileno())
+            save_checkpoint(checkpoint_path, {
+                "version": CHECKPOINT_VERSION,
+                "input": str(Path(args.input).resolve()),
+                "input_signature": signature,
+                "input_offset": None if complete else offset,
+                "model_version": service.model_version,
+                "records": records,
+                "output_bytes": written,
+                "complete": complete,
+            })
+
+        with ThreadPoolExecutor(max_workers=in_flight) as executor:
+            pending = deque()
+            batches = iter_batches(records, args.batch_size)
+            while True:
+                while len(pending) < in_flight:
+                    batch = next(batches, None)
+                    if batch is None:
+                        break
+                    pending.append((batch, executor.submit(score_batch, service, batch)))
+                if not pending:
+                    break
+
+                batch, future = pending.popleft()
+                output.write("".join(future.result()).encode('utf-8'))
+                progress = (batch[-1].index + 1, batch[-1].end_offset, output.tell())
+                done = progress[0]
+                scored += len(batch)
+
+                if done - last_checkpoint >= args.checkpoint_every:
+                    write_checkpoint()
+                    last_checkpoint = done
+
+                now = time.perf_counter()
+                if now - last_report >= args.progress_interval:
+                    print(f"{done} records ({scored / (now - started):.0f} records/s)")
+                    last_report = now
+
+        write_checkpoint(complete=True)
+    except KeyboardInterrupt:
+        # Checkpoint the last batch fully written; a batch the interrupt cut
+        # short is truncated away and rescored on --resume
+        write_checkpoint()
+        print(f"\nInterrupted after {progress[0]} records; rerun with --resume to continue")
+        sys.exit(130)
+    finally:
+        output.close()
+        # Read before the pool goes away, since workers report its counts
+        dedup_stats = service.dedup_stats
+        cache_stats = service.prediction_cache_stats
+        service.disable_process_pool()
+        service.disable_prediction_cache()
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✓ Scored {scored} records in {elapsed:.1f}s "
+          f"({scored / elapsed if elapsed else 0:.0f} records/s) -> {output_path}")
+    if dedup_stats["enabled"]:
+        print(f"Near-duplicates: reused {dedup_stats['reused']} of {dedup_stats['lookups']} "
+              f"predictions ({dedup_stats['reuse_rate']:.1%})")
+    if cache_stats["enabled"]:
+        print(f"Prediction cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+              f"({cache_stats['hit_rate']:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Inference throughput benchmark for the Fake News Detector.
+Compares in-process scoring from concurrent threads against the
+process-pool backend at increasing worker counts.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.services.model_service import ModelService
+from src.services.sample_service import sample_service
+
+
+def build_corpus(size: int, words_per_text: int) -> list:
+    """Build benchmark texts by concatenating sample headlines."""
+    headlines = [s.text for s in sample_service.get_all_samples()]
+    corpus = []
+    for i in range(size):
+        words = []
+        j = i
+        while len(words) < words_per_text:
+            words.extend(headlines[j % len(headlines)].split())
+            j += 1
+        corpus.append(" ".join(words[:words_per_text]))
+    return corpus
+
+
+def run_concurrent(service: ModelService, texts: list, clients: int, batch_size: int) -> float:
+    """Score texts from concurrent client threads and return texts per second."""
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(service.predict_batch, batches))
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    """Run the benchmark and print a throughput table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--texts", type=int, default=2000, help="Number of texts to score")
+    parser.add_argument("--words", type=int, default=300, help="Words per text")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent client threads")
+    parser.add_argument("--batch-size", type=int, default=16, help="Texts per request")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1,
+                        help="Largest worker count to benchmark")
+    args = parser.parse_args()
+
+    texts = build_corpus(args.texts, args.words)
+    print(f"Scoring {len(texts)} texts of {args.words} words "
+          f"from {args.clients} threads in batches of {args.batch_size}")
+    print("-" * 50)
+
+    service = ModelService()
+    service.load_model()
+    # Warm up lazily initialised resources before timing
+    service.predict_batch(texts[:args.batch_size])
+    baseline = run_concurrent(service, texts, args.clients, args.batch_size)
+    print(f"{'in-process':<16}{baseline:>12.1f} texts/s{1.0:>8.2f}x")
+
+    workers = 1
+    while workers <= args.max_workers:
+        service.enable_process_pool(workers=workers)
+        try:
+            service.predict_batch(texts[:args.batch_size])
+            throughput = run_concurrent(service, texts, args.clients, args.batch_size)
+        finally:
+            service.disable_process_pool()
+        label = f"pool x{workers}"
+        print(f"{label:<16}{throughput:>12.1f} texts/s{throughput / baseline:>8.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
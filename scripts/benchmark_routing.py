@@ -0,0 +1,159 @@
+"""
+Routing benchmark for the Fake News Detector.
+Starts several local Flask nodes, each with its own prediction cache,
+puts the router in front of them, and compares cache hit ratio and
+throughput of consistent-hash routing against round-robin for a
+workload that repeats texts.
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import List
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.services.sample_service import sample_service
+
+
+def build_texts(count: int, words_per_text: int, seed: int = 42) -> List[str]:
+    """Build distinct texts from random words of the sample headlines."""
+    vocabulary = sorted({word for s in sample_service.get_all_samples() for word in s.text.split()})
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(vocabulary, k=words_per_text)) for _ in range(count)]
+
+
+def run_node(port: int, model_path: str, cache_path: str) -> None:
+    """Serve one Flask node with a cache file of its own (as on separate hosts)."""
+    sys.stdout = open(os.devnull, 'w')
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    from src.config import config
+    config.MODEL_PATH = model_path
+    config.PREDICTION_CACHE_ENABLED = True
+    config.PREDICTION_CACHE_PATH = cache_path
+    config.PREDICTION_CACHE_FLUSH_INTERVAL = 0.05
+    config.MODEL_RELOAD_INTERVAL = 0
+    config.SAMPLES_RELOAD_INTERVAL = 0
+    from src.ui.flask_app import run_app
+    run_app(port=port)
+
+
+def run_router_node(port: int, backends: List[str], strategy: str) -> None:
+    """Serve the router in front of the given backends."""
+    sys.stdout = open(os.devnull, 'w')
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    from src.ui.router_app import run_router
+    run_router(port=port, backends=backends, strategy=strategy)
+
+
+def wait_until_live(urls: List[str], timeout: float = 120.0) -> None:
+    """Block until every URL's /livez answers."""
+    deadline = time.monotonic() + timeout
+    for url in urls:
+        while True:
+            try:
+                if requests.get(url + '/livez', timeout=1).ok:
+                    break
+            except requests.RequestException:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{url} did not start")
+            time.sleep(0.2)
+
+
+def run_strategy(strategy: str, args: argparse.Namespace, workload: List[str]) -> dict:
+    """Start fresh nodes and a router, replay the workload, and collect stats."""
+    context = get_context('spawn')
+    backends = [f"http://127.0.0.1:{args.base_port + i}" for i in range(args.nodes)]
+    router_url = f"http://127.0.0.1:{args.router_port}"
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        processes = [
+            context.Process(target=run_node, daemon=True, args=(
+                args.base_port + i, args.model_path, str(Path(cache_dir) / f"node-{i}.sqlite3")
+            ))
+            for i in range(args.nodes)
+        ]
+        processes.append(context.Process(
+            target=run_router_node, daemon=True, args=(args.router_port, backends, strategy)
+        ))
+        for process in processes:
+            process.start()
+
+        try:
+            wait_until_live(backends + [router_url])
+            session_pool = ThreadPoolExecutor(max_workers=args.clients)
+            sessions = {}
+
+            def send(text: str) -> None:
+                session = sessions.setdefault(threading.get_ident(), requests.Session())
+                response = session.post(router_url + '/predict', json={"text": text}, timeout=30)
+                response.raise_for_status()
+
+            started = time.perf_counter()
+            list(session_pool.map(send, workload))
+            elapsed = time.perf_counter() - started
+            session_pool.shutdown()
+
+            # Let the nodes commit their last cache writes before reading stats
+            time.sleep(0.5)
+            hits = misses = 0
+            for backend in backends:
+                stats = requests.get(backend + '/metrics/prediction-cache', timeout=5).json()
+                hits += stats["hits"]
+                misses += stats["misses"]
+            routed = requests.get(router_url + '/router/backends', timeout=5).json()["backends"]
+        finally:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
+
+    return {
+        "strategy": strategy,
+        "throughput": len(workload) / elapsed,
+        "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+        "per_node": [routed[backend]["texts"] for backend in backends],
+    }
+
+
+def main():
+    """Run both routing strategies and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=3, help="Number of Flask nodes")
+    parser.add_argument("--distinct", type=int, default=600, help="Distinct texts in the workload")
+    parser.add_argument("--repeats", type=int, default=5, help="Times each text is requested")
+    parser.add_argument("--words", type=int, default=60, help="Words per text")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent client threads")
+    parser.add_argument("--base-port", type=int, default=5101, help="Port of the first node")
+    parser.add_argument("--router-port", type=int, default=5100, help="Router port")
+    parser.add_argument("--model-path", default=None, help="Model served by the nodes (default: config MODEL_PATH)")
+    args = parser.parse_args()
+    if args.model_path is None:
+        from src.config import config
+        args.model_path = config.MODEL_PATH
+
+    texts = build_texts(args.distinct, args.words)
+    workload = texts * args.repeats
+    random.Random(42).shuffle(workload)
+    print(f"{len(workload)} requests over {args.distinct} distinct texts, "
+          f"{args.nodes} nodes, {args.clients} clients")
+    print("-" * 60)
+
+    print(f"{'strategy':<14}{'req/s':>10}{'hit ratio':>11}  texts per node")
+    for strategy in ("round_robin", "hash"):
+        result = run_strategy(strategy, args, workload)
+        print(f"{result['strategy']:<14}{result['throughput']:>10.1f}{result['hit_ratio']:>11.1%}  "
+              f"{result['per_node']}")
+
+
+if __name__ == "__main__":
+    main()
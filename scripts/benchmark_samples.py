@@ -0,0 +1,102 @@
+"""
+Sample loading memory benchmark for the Fake News Detector.
+Generates a synthetic samples file and compares peak and retained
+memory of a whole-document json.load with plain dataclasses against
+SampleService's streaming parser with slotted, interned samples.
+"""
+import argparse
+import json
+import sys
+import tempfile
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.services.sample_service import SampleService
+
+CATEGORIES = ["politics", "health", "science", "environment", "business", "world"]
+SOURCES = ["Reuters", "AP", "Fabricated example", "News archive", "Social media"]
+
+
+@dataclass
+class DictSample:
+    """Sample record as stored before slotted samples (has a __dict__)."""
+    text: str
+    label: str
+    category: str = ""
+    source: str = ""
+
+
+def load_with_json_load(path: str) -> list:
+    """Load samples the way SampleService did before streaming."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [
+        DictSample(
+            text=item['text'],
+            label=item['label'],
+            category=item.get('category', ''),
+            source=item.get('source', '')
+        )
+        for item in data['samples']
+    ]
+
+
+def load_with_sample_service(path: str) -> SampleService:
+    """Load samples with the current SampleService."""
+    service = SampleService(path)
+    service.load_samples()
+    return service
+
+
+def write_samples(path: str, count: int) -> None:
+    """Write a synthetic samples file with the given number of entries."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"samples": [\n')
+        for i in range(count):
+            item = {
+                "text": f"Synthetic headline number {i} about {CATEGORIES[i % len(CATEGORIES)]} events",
+                "label": "fake" if i % 2 else "true",
+                "category": CATEGORIES[i % len(CATEGORIES)],
+                "source": SOURCES[i % len(SOURCES)]
+            }
+            f.write(("," if i else "") + json.dumps(item) + "\n")
+        f.write("]}\n")
+
+
+def measure(loader, path: str) -> tuple:
+    """Return (peak bytes during load, bytes retained afterwards)."""
+    tracemalloc.start()
+    result = loader(path)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak, retained
+
+
+def main():
+    """Run the benchmark and print memory per sample."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=200_000, help="Number of synthetic samples")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "samples.json")
+        write_samples(path, args.samples)
+        size = Path(path).stat().st_size
+        print(f"{args.samples} samples, file size {size / 1e6:.1f} MB")
+        print("-" * 64)
+        print(f"{'loader':<28}{'peak MB':>10}{'retained MB':>14}{'B/sample':>12}")
+
+        for name, loader in [
+            ("json.load + dataclass", load_with_json_load),
+            ("streaming + slots/intern", load_with_sample_service),
+        ]:
+            peak, retained = measure(loader, path)
+            print(f"{name:<28}{peak / 1e6:>10.1f}{retained / 1e6:>14.1f}"
+                  f"{retained / args.samples:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
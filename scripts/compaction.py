@@ -0,0 +1,144 @@
+"""
+Feature-pruned model export for the Fake News Detector.
+Shrinks a trained TF-IDF + logistic regression model to a target
+vocabulary size, refits it on the kept features, and reports artifact
+size, load time, per-request latency and accuracy for each size.
+"""
+import pickle
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Sequence
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.feature_selection import chi2
+from sklearn.preprocessing import normalize
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from scripts.sweep import build_vectorizer, measure_latency
+
+
+@dataclass
+class CompactionResult:
+    """Measurements of one exported model size."""
+    n_features: int
+    path: Path
+    size_bytes: int
+    load_ms: float
+    latency_ms: float
+    accuracy: float
+
+
+def rank_features(model, X_train, y_train, method: str) -> np.ndarray:
+    """
+    Order feature columns from most to least useful.
+
+    Args:
+        model: Fitted linear model over all features
+        X_train: Training TF-IDF matrix
+        y_train: Training labels
+        method: 'weight' (absolute logistic weight) or 'chi2' (chi-squared test)
+
+    Returns:
+        Column indices, best first
+    """
+    if method == 'weight':
+        scores = np.abs(model.coef_).max(axis=0)
+    elif method == 'chi2':
+        scores = np.nan_to_num(chi2(X_train, y_train)[0])
+    else:
+        raise ValueError(f"Unknown pruning method: {method}")
+    return np.argsort(-scores, kind='stable')
+
+
+def measure_load_ms(data: bytes, repeats: int = 5) -> float:
+    """Median milliseconds to unpickle a serialized artifact."""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        pickle.loads(data)
+        timings.append(time.perf_counter() - started)
+    return float(np.median(timings) * 1000)
+
+
+def export_compact_models(model, vectorizer, X_train, X_test, y_train, y_test,
+                          test_texts: Sequence[str], model_path: str, sizes: Sequence[int],
+                          method: str = 'weight') -> List[CompactionResult]:
+    """
+    Export pruned copies of a model and report how each one performs.
+
+    Restricting TF-IDF rows to the kept columns and re-normalizing them
+    gives exactly what a vectorizer with the smaller vocabulary produces,
+    so the model is refit on those rows without re-vectorizing any text.
+    Each artifact is saved next to model_path as <name>.compact-<size>.pkl
+    in the usual (model, vectorizer) format.
+
+    Args:
+        model: Fitted logistic regression over the full vocabulary
+        vectorizer: Fitted TfidfVectorizer
+        X_train, X_test: TF-IDF matrices of the train/test split
+        y_train, y_test: Labels of the train/test split
+        test_texts: Cleaned test texts, used to time single predictions
+        model_path: Path of the full model artifact
+        sizes: Target vocabulary sizes
+        method: Feature ranking method ('weight' or 'chi2')
+
+    Returns:
+        One result for the full model followed by one per exported size
+    """
+    model_path = Path(model_path)
+    order = rank_features(model, X_train, y_train, method)
+    terms = vectorizer.get_feature_names_out()
+    latency_texts = list(test_texts[:200])
+
+    data = pickle.dumps((model, vectorizer))
+    results = [CompactionResult(
+        n_features=len(terms),
+        path=model_path,
+        size_bytes=len(data),
+        load_ms=measure_load_ms(data),
+        latency_ms=measure_latency(model, vectorizer, latency_texts),
+        accuracy=float((model.predict(X_test) == y_test).mean())
+    )]
+
+    for size in sorted(set(sizes), reverse=True):
+        if size >= len(terms):
+            print(f"Skipping compact size {size}: model only has {len(terms)} features")
+            continue
+        columns = np.sort(order[:size])
+        compact_model = clone(model).fit(normalize(X_train[:, columns]), y_train)
+        compact_vectorizer = build_vectorizer(
+            terms[columns], vectorizer.idf_[columns], vectorizer.ngram_range,
+            lowercase=vectorizer.lowercase,
+            token_pattern=vectorizer.token_pattern,
+            norm=vectorizer.norm,
+            sublinear_tf=vectorizer.sublinear_tf
+        )
+
+        data = pickle.dumps((compact_model, compact_vectorizer))
+        path = model_path.with_name(f"{model_path.stem}.compact-{size}{model_path.suffix}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+        results.append(CompactionResult(
+            n_features=size,
+            path=path,
+            size_bytes=len(data),
+            load_ms=measure_load_ms(data),
+            latency_ms=measure_latency(compact_model, compact_vectorizer, latency_texts),
+            accuracy=float((compact_model.predict(normalize(X_test[:, columns])) == y_test).mean())
+        ))
+
+    return results
+
+
+def print_report(results: List[CompactionResult]) -> None:
+    """Print size, load time, latency and accuracy change per model size."""
+    full = results[0]
+    print(f"{'features':>9}{'size KB':>10}{'load ms':>9}{'p50 ms':>8}{'accuracy':>10}{'delta':>9}  artifact")
+    for r in results:
+        print(f"{r.n_features:>9}{r.size_bytes / 1024:>10.0f}{r.load_ms:>9.2f}{r.latency_ms:>8.3f}"
+              f"{r.accuracy:>10.4f}{r.accuracy - full.accuracy:>+9.4f}  {r.path.name}")
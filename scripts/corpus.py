@@ -0,0 +1,285 @@
+"""
+Training corpus loading and cleaning for the Fake News Detector.
+Cleans texts in parallel across worker processes and caches the
+cleaned corpus as Parquet, keyed by the input CSVs and the text
+processor configuration, so unchanged data skips cleaning entirely.
+For out-of-core training the corpus is streamed in chunks and cached
+as a directory of bounded-size Parquet shards instead.
+"""
+import hashlib
+import multiprocessing
+import os
+import shutil
+import tracemalloc
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.config import config
+from src.utils.text_processor import TextProcessor
+from scripts.profiling import NULL_PROFILER, StageProfiler
+
+# Bump when the cached corpus layout or loading steps change
+CACHE_FORMAT_VERSION = 1
+
+# Text processor owned by each cleaning worker process
+_worker_processor: Optional[TextProcessor] = None
+
+
+def _init_cleaner() -> None:
+    """Create the text processor once per worker process."""
+    global _worker_processor
+    # A forked worker inherits the parent's allocation tracing, which only
+    # slows cleaning down; the parent cannot see worker memory anyway
+    if tracemalloc.is_tracing() and multiprocessing.parent_process() is not None:
+        tracemalloc.stop()
+    _worker_processor = TextProcessor()
+
+
+def _clean(text) -> str:
+    """Clean one text inside a worker process (missing values become empty)."""
+    if not isinstance(text, str):
+        return ""
+    return _worker_processor.clean_text(text)
+
+
+def clean_texts(texts: Iterable, workers: Optional[int] = None, chunksize: int = 256) -> List[str]:
+    """
+    Clean texts in parallel, preserving input order.
+
+    Args:
+        texts: Raw texts (missing values are cleaned to "")
+        workers: Number of worker processes. If None, uses all cores.
+        chunksize: Number of texts sent to a worker per task
+
+    Returns:
+        List of cleaned texts
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_cleaner()
+        return [_clean(text) for text in texts]
+
+    with Pool(workers, initializer=_init_cleaner) as pool:
+        return pool.map(_clean, texts, chunksize=chunksize)
+
+
+def _file_digest(path: str) -> str:
+    """SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def corpus_cache_key(true_csv: str, fake_csv: str) -> str:
+    """
+    Cache key for a cleaned corpus.
+
+    Covers the contents of both CSVs and the text processor configuration
+    (stopwords, MIN_WORD_LENGTH and lemmatizer).
+    """
+    parts = [
+        f"format={CACHE_FORMAT_VERSION}",
+        f"true={_file_digest(true_csv)}",
+        f"fake={_file_digest(fake_csv)}",
+        f"processor={TextProcessor().fingerprint}",
+    ]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:24]
+
+
+def load_raw_corpus(true_csv: str, fake_csv: str, profiler: StageProfiler = NULL_PROFILER) -> pd.DataFrame:
+    """
+    Load and label both CSVs, then combine and shuffle them.
+
+    Returns:
+        DataFrame with 'text' and 'label' columns (0 = fake, 1 = true)
+    """
+    with profiler.stage("csv_load"):
+        df_true = pd.read_csv(true_csv)
+        df_fake = pd.read_csv(fake_csv)
+
+    # Add labels
+    df_fake["label"] = 0  # Fake
+    df_true["label"] = 1  # True
+
+    print(f"Fake samples: {len(df_fake)}")
+    print(f"True samples: {len(df_true)}")
+
+    # Combine datasets
+    with profiler.stage("concat_shuffle"):
+        return pd.concat([df_fake, df_true], ignore_index=True).sample(frac=1, random_state=42).reset_index(drop=True)
+
+
+def holdout_split(labels: np.ndarray, test_size: float = 0.2) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split row numbers into training and held-out rows.
+
+    This is the stratified split train_model.py evaluates on, so other
+    scripts can validate a model on exactly the rows it never saw.
+
+    Returns:
+        Tuple of (training row numbers, held-out row numbers)
+    """
+    return train_test_split(
+        np.arange(len(labels)), test_size=test_size, random_state=42, stratify=labels
+    )
+
+
+def load_clean_corpus(true_csv: str = "True.csv", fake_csv: str = "Fake.csv",
+                      workers: Optional[int] = None, use_cache: bool = True,
+                      cache_dir: Optional[str] = None,
+                      profiler: StageProfiler = NULL_PROFILER) -> pd.DataFrame:
+    """
+    Get the shuffled, cleaned training corpus, from cache when possible.
+
+    Args:
+        true_csv: Path to the true news CSV (needs a 'text' column)
+        fake_csv: Path to the fake news CSV (needs a 'text' column)
+        workers: Number of cleaning processes. If None, uses all cores.
+        use_cache: Read and write the Parquet cache
+        cache_dir: Cache directory. If None, uses config default.
+        profiler: Records the loading stages (cache read, CSV load,
+            concatenation and shuffle, cleaning, cache write)
+
+    Returns:
+        DataFrame with 'text_clean' and 'label' columns, empty texts removed
+    """
+    cache_path = None
+    if use_cache:
+        cache_path = Path(cache_dir or config.CACHE_DIR) / f"clean_corpus_{corpus_cache_key(true_csv, fake_csv)}.parquet"
+        if cache_path.exists():
+            try:
+                with profiler.stage("cache_read"):
+                    df = pd.read_parquet(cache_path)
+                print(f"Loaded cleaned corpus from cache: {cache_path}")
+                return df
+            except Exception as e:
+                print(f"Warning: Could not read corpus cache ({e}), cleaning again")
+
+    df = load_raw_corpus(true_csv, fake_csv, profiler=profiler)
+    print(f"Total samples: {len(df)}")
+
+    print(f"\nCleaning text with {workers or os.cpu_count() or 1} processes...")
+    with profiler.stage("cleaning"):
+        df['text_clean'] = clean_texts(df['text'].tolist(), workers=workers)
+        df = df.loc[df['text_clean'].str.len() > 0, ['text_clean', 'label']].reset_index(drop=True)
+
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.tmp')
+            with profiler.stage("cache_write"):
+                df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, cache_path)
+            print(f"Cached cleaned corpus to: {cache_path}")
+        except Exception as e:
+            print(f"Warning: Could not write corpus cache: {e}")
+
+    return df
+
+
+def iter_raw_chunks(true_csv: str, fake_csv: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Stream labelled rows from both CSVs without loading either fully.
+
+    Each yielded chunk combines up to chunk_size rows from each file, so
+    both classes stay mixed while one file still has rows left.
+
+    Yields:
+        DataFrames with 'text' and 'label' columns (0 = fake, 1 = true)
+    """
+    readers = [
+        (pd.read_csv(fake_csv, usecols=['text'], chunksize=chunk_size), 0),
+        (pd.read_csv(true_csv, usecols=['text'], chunksize=chunk_size), 1),
+    ]
+    try:
+        while readers:
+            parts = []
+            for entry in list(readers):
+                reader, label = entry
+                chunk = next(reader, None)
+                if chunk is None:
+                    reader.close()
+                    readers.remove(entry)
+                    continue
+                parts.append(chunk.assign(label=label))
+            if parts:
+                yield pd.concat(parts, ignore_index=True)
+    finally:
+        for reader, _ in readers:
+            reader.close()
+
+
+def build_clean_shards(true_csv: str = "True.csv", fake_csv: str = "Fake.csv",
+                       chunk_size: Optional[int] = None, workers: Optional[int] = None,
+                       cache_dir: Optional[str] = None, shard_dir: Optional[str] = None) -> List[Path]:
+    """
+    Clean the corpus chunk by chunk into Parquet shards on disk.
+
+    Only one chunk per file is held in memory at a time. Shards are
+    written to a temporary directory that is renamed into place once
+    complete, so an existing shard directory is always a full corpus and
+    is reused as-is.
+
+    Args:
+        true_csv: Path to the true news CSV (needs a 'text' column)
+        fake_csv: Path to the fake news CSV (needs a 'text' column)
+        chunk_size: Rows read from each CSV per shard. If None, uses config default.
+        workers: Number of cleaning processes. If None, uses all cores.
+        cache_dir: Cache directory. If None, uses config default.
+        shard_dir: Exact shard directory. If None, uses a directory under
+            cache_dir keyed like the in-memory corpus cache.
+
+    Returns:
+        Shard paths in corpus order, each with 'text_clean' and 'label' columns
+    """
+    chunk_size = chunk_size or config.OOC_CHUNK_SIZE
+    if shard_dir is None:
+        key = corpus_cache_key(true_csv, fake_csv)
+        shard_dir = Path(cache_dir or config.CACHE_DIR) / f"clean_shards_{key}_{chunk_size}"
+    shard_dir = Path(shard_dir)
+
+    if shard_dir.is_dir():
+        shards = sorted(shard_dir.glob("part-*.parquet"))
+        print(f"Using {len(shards)} cached corpus shards from: {shard_dir}")
+        return shards
+
+    tmp_dir = shard_dir.with_name(shard_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    workers = workers or os.cpu_count() or 1
+    print(f"Cleaning corpus in chunks of {chunk_size} rows with {workers} processes...")
+    pool = Pool(workers, initializer=_init_cleaner) if workers > 1 else None
+    if pool is None:
+        _init_cleaner()
+
+    rows = 0
+    try:
+        for index, chunk in enumerate(iter_raw_chunks(true_csv, fake_csv, chunk_size)):
+            texts = chunk['text'].tolist()
+            if pool is None:
+                cleaned = [_clean(text) for text in texts]
+            else:
+                cleaned = pool.map(_clean, texts, chunksize=256)
+            chunk = pd.DataFrame({'text_clean': cleaned, 'label': chunk['label'].to_numpy(np.int8)})
+            chunk = chunk.loc[chunk['text_clean'].str.len() > 0].reset_index(drop=True)
+            chunk.to_parquet(tmp_dir / f"part-{index:05d}.parquet", index=False)
+            rows += len(chunk)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    os.replace(tmp_dir, shard_dir)
+    shards = sorted(shard_dir.glob("part-*.parquet"))
+    print(f"Wrote {rows} cleaned samples in {len(shards)} shards to: {shard_dir}")
+    return shards
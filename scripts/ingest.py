@@ -0,0 +1,441 @@
+"""
+Directory-watching ingestion daemon for the Fake News Detector.
+Polls a directory for JSONL shards dropped by the crawler and scores
+them through a pipeline of read, clean, vectorize, score and write
+stages. Each stage has its own workers, and the stages are connected by
+bounded queues. Every shard gets an ordered predictions file. Finished
+shards are recorded in a ledger, so a restart skips them. Per-stage
+throughput and queue depth are reported periodically.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.config import config
+from src.services.model_service import ModelService
+from src.utils.text_processor import TextProcessor
+from scripts.batch_score import Record, iter_batches, iter_jsonl
+from scripts.pipeline import Pipeline, Stage, format_stats
+
+LEDGER_NAME = "ingest-ledger.jsonl"
+
+# Text processor owned by each cleaning worker process
+_worker_processor: Optional[TextProcessor] = None
+
+
+def _init_cleaner() -> None:
+    """Create the text processor once per cleaning process."""
+    global _worker_processor
+    # Ctrl+C reaches the whole process group; let the daemon shut its
+    # cleaners down instead of having them die mid-batch
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_processor = TextProcessor()
+
+
+def _clean_batch(texts: List[str]) -> List[str]:
+    """Clean a batch of texts inside a cleaning process."""
+    return [_worker_processor.clean_text(text) for text in texts]
+
+
+@dataclass
+class Shard:
+    """A shard being processed, and the state its writer needs."""
+    path: Path
+    signature: Tuple[int, int]
+    output_path: Path
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    next_seq: int = 0
+    pending: Dict[int, "Chunk"] = field(default_factory=dict)
+    output: Any = None
+    records: int = 0
+    errors: int = 0
+    model_versions: Set[str] = field(default_factory=set)
+    failed: bool = False
+    started: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class Chunk:
+    """A run of consecutive records of one shard, filled in stage by stage."""
+    shard: Shard
+    seq: int
+    records: List[Record]
+    # Marks the shard's end; its writer finalizes the shard after writing it
+    last: bool = False
+    cleaned: Optional[List[str]] = None
+    model: Any = None
+    model_version: Optional[str] = None
+    vectors: Any = None
+    scored: Optional[List[Tuple[str, float, bool]]] = None
+    # Set when a stage failed; every readable record gets it as its error
+    error: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+class Ledger:
+    """Append-only record of finished shards, keyed by name, size and mtime."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._done: Set[Tuple[str, int, int]] = set()
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._done.add((entry["shard"], entry["size"], entry["mtime_ns"]))
+
+    def contains(self, name: str, signature: Tuple[int, int]) -> bool:
+        """Check whether this exact shard was already processed."""
+        with self._lock:
+            return (name, *signature) in self._done
+
+    def record(self, entry: dict) -> None:
+        """Durably add a finished shard."""
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._done.add((entry["shard"], entry["size"], entry["mtime_ns"]))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._done)
+
+
+class IngestionDaemon:
+    """Finds new shards and runs them through the scoring pipeline."""
+
+    def __init__(self, args: argparse.Namespace, service: ModelService):
+        self.args = args
+        self.service = service
+        self.input_dir = Path(args.input_dir)
+        self.output_dir = Path(args.output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.ledger = Ledger(self.output_dir / LEDGER_NAME)
+        # Partial outputs of shards interrupted last time
+        for stale in self.output_dir.glob("*.predictions.jsonl.tmp"):
+            stale.unlink()
+        self._active: Set[str] = set()
+        # Shards that could not be read or written, skipped until they change
+        self._failed: Set[Tuple[str, int, int]] = set()
+        self._active_lock = threading.Lock()
+        self.shards_done = 0
+        # Set on shutdown so interrupted shards are never finalized
+        self._stopping = threading.Event()
+
+        # Cleaning is CPU-bound Python, so it runs in processes; each
+        # clean stage thread keeps one of them busy
+        self._cleaners_lock = threading.Lock()
+        self._cleaners = self._create_cleaners()
+        self.pipeline = Pipeline([
+            Stage("read", self.read_shard, args.read_workers, args.queue_size, fan_out=True,
+                  on_error=self._stage_failed),
+            Stage("clean", self.clean_chunk, args.clean_workers, args.queue_size,
+                  on_error=self._stage_failed),
+            Stage("vectorize", self.vectorize_chunk, args.vectorize_workers, args.queue_size,
+                  on_error=self._stage_failed),
+            Stage("score", self.score_chunk, args.score_workers, args.queue_size,
+                  on_error=self._stage_failed),
+            Stage("write", self.write_chunk, args.write_workers, args.queue_size,
+                  on_error=self._stage_failed),
+        ], weight=len)
+
+    # Stages
+
+    def read_shard(self, shard: Shard) -> Iterator[Chunk]:
+        """Split a shard into chunks, ending with an empty last chunk."""
+        records = iter_jsonl(str(shard.path), self.args.text_field, self.args.id_field)
+        seq = 0
+        try:
+            for batch in iter_batches(records, self.args.chunk_size):
+                yield Chunk(shard, seq, batch)
+                seq += 1
+        except OSError as e:
+            print(f"Warning: Could not read {shard.path.name}, skipping it until it changes: {e}")
+            self._abandon(shard)
+            return
+        yield Chunk(shard, seq, [], last=True)
+
+    def clean_chunk(self, chunk: Chunk) -> Chunk:
+        """Clean the chunk's readable texts in a cleaning process."""
+        texts = [record.text for record in chunk.records if record.text is not None]
+        if not texts:
+            chunk.cleaned = []
+            return chunk
+
+        executor = self._cleaners
+        try:
+            try:
+                chunk.cleaned = executor.submit(_clean_batch, texts).result()
+            except BrokenProcessPool:
+                # A cleaning process died (e.g. killed for memory); retry once on a fresh pool
+                if self._stopping.is_set():
+                    return None
+                chunk.cleaned = self._restart_cleaners(executor).submit(_clean_batch, texts).result()
+        except Exception as e:
+            chunk.error = f"Cleaning failed: {str(e)}"
+        return chunk
+
+    def vectorize_chunk(self, chunk: Chunk) -> Chunk:
+        """Vectorize the non-empty cleaned texts with the current model's vectorizer."""
+        if chunk.error is not None:
+            return chunk
+        try:
+            model, vectorizer, version = self.service.model_snapshot()
+            chunk.model, chunk.model_version = model, version
+            non_empty = [text for text in chunk.cleaned if text]
+            if non_empty:
+                chunk.vectors = vectorizer.transform(non_empty)
+        except Exception as e:
+            chunk.error = f"Prediction failed: {str(e)}"
+        return chunk
+
+    def score_chunk(self, chunk: Chunk) -> Chunk:
+        """Classify the chunk's vectors with the model they were made for."""
+        if chunk.error is None and chunk.vectors is not None:
+            try:
+                chunk.scored = ModelService.classify_vectors(chunk.model, chunk.vectors)
+            except Exception as e:
+                chunk.error = f"Prediction failed: {str(e)}"
+        chunk.model, chunk.vectors = None, None
+        return chunk
+
+    def write_chunk(self, chunk: Chunk) -> Chunk:
+        """Write chunks of a shard in order, and finalize the shard after its last one."""
+        shard = chunk.shard
+        with shard.lock:
+            if shard.failed or self._stopping.is_set():
+                return chunk
+            shard.pending[chunk.seq] = chunk
+            while shard.next_seq in shard.pending:
+                ready = shard.pending.pop(shard.next_seq)
+                shard.next_seq += 1
+                if shard.output is None:
+                    shard.output = open(self._tmp_path(shard), 'w', encoding='utf-8')
+                shard.output.writelines(self._format(ready))
+                if ready.last:
+                    self._finish(shard)
+        return chunk
+
+    # Helpers
+
+    def _create_cleaners(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.args.clean_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_cleaner
+        )
+
+    def _restart_cleaners(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """Replace a broken cleaning pool, unless another thread already did."""
+        with self._cleaners_lock:
+            if self._cleaners is broken:
+                print("Warning: A cleaning process died; restarting the cleaning pool")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._cleaners = self._create_cleaners()
+            return self._cleaners
+
+    @staticmethod
+    def _tmp_path(shard: Shard) -> Path:
+        return shard.output_path.with_name(shard.output_path.name + ".tmp")
+
+    def _format(self, chunk: Chunk) -> List[str]:
+        """One output line per record, like scripts/batch_score.py."""
+        cleaned = iter(chunk.cleaned or [])
+        scored = iter(chunk.scored or [])
+        shard = chunk.shard
+        lines = []
+        for record in chunk.records:
+            output = {"index": record.index}
+            if record.record_id is not None:
+                output["id"] = record.record_id
+            if record.text is None:
+                output["error"] = record.error
+            elif chunk.error is not None:
+                output["error"] = chunk.error
+            elif not record.text.strip():
+                next(cleaned)
+                output["error"] = "Empty text provided"
+            elif not next(cleaned):
+                output["error"] = "Text contains no valid words after preprocessing"
+            else:
+                label, confidence, is_fake = next(scored)
+                output.update({"label": label, "confidence": confidence, "is_fake": is_fake})
+            if "error" in output:
+                shard.errors += 1
+            lines.append(json.dumps(output, ensure_ascii=False) + "\n")
+        shard.records += len(chunk.records)
+        if chunk.model_version is not None and chunk.records:
+            shard.model_versions.add(chunk.model_version)
+        return lines
+
+    def _finish(self, shard: Shard) -> None:
+        """Publish a shard's output atomically, then record it in the ledger."""
+        shard.output.flush()
+        os.fsync(shard.output.fileno())
+        shard.output.close()
+        os.replace(self._tmp_path(shard), shard.output_path)
+        self.ledger.record({
+            "shard": shard.path.name,
+            "size": shard.signature[0],
+            "mtime_ns": shard.signature[1],
+            "records": shard.records,
+            "errors": shard.errors,
+            "model_versions": sorted(shard.model_versions),
+            "output": shard.output_path.name,
+            "seconds": round(time.perf_counter() - shard.started, 3),
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+        with self._active_lock:
+            self._active.discard(shard.path.name)
+            self.shards_done += 1
+        print(f"✓ {shard.path.name}: {shard.records} records ({shard.errors} errors) -> {shard.output_path.name}")
+
+    def _abandon(self, shard: Shard) -> None:
+        """Drop a shard that could not be processed, and its partial output."""
+        with shard.lock:
+            shard.failed = True
+            shard.pending.clear()
+            if shard.output is not None:
+                try:
+                    shard.output.close()
+                except OSError:
+                    pass
+                self._tmp_path(shard).unlink(missing_ok=True)
+        with self._active_lock:
+            self._active.discard(shard.path.name)
+            self._failed.add((shard.path.name, *shard.signature))
+
+    def _stage_failed(self, item: Any, error: Exception) -> None:
+        """Abandon the shard of an item a stage raised on (e.g. disk full while writing)."""
+        shard = item if isinstance(item, Shard) else item.shard
+        if not shard.failed:
+            print(f"Warning: Dropping {shard.path.name}, skipping it until it changes: {error}")
+            self._abandon(shard)
+
+    # Discovery
+
+    def new_shards(self) -> List[Shard]:
+        """Shards that are complete on disk and neither processed nor in progress."""
+        settled_before = time.time_ns() - int(self.args.settle * 1e9)
+        shards = []
+        for path in sorted(self.input_dir.glob(self.args.pattern)):
+            if not path.is_file():
+                continue
+            stat = path.stat()
+            signature = (stat.st_size, stat.st_mtime_ns)
+            # The crawler may still be writing recently modified files
+            if stat.st_mtime_ns > settled_before:
+                continue
+            with self._active_lock:
+                if (path.name in self._active or (path.name, *signature) in self._failed
+                        or self.ledger.contains(path.name, signature)):
+                    continue
+                self._active.add(path.name)
+            shards.append(Shard(path, signature, self.output_dir / f"{path.stem}.predictions.jsonl"))
+        return shards
+
+    @property
+    def active_shards(self) -> int:
+        with self._active_lock:
+            return len(self._active)
+
+    def report(self, final: bool = False) -> None:
+        """Print stage stats: since the last report, or since start when final."""
+        stats = self.pipeline.stats if final else self.pipeline.interval_stats()
+        if not final and self.active_shards == 0 and not any(stage["records"] for stage in stats):
+            return
+        print(f"\n{self.shards_done} shards done, {self.active_shards} in progress, "
+              f"model {self.service.model_version}" + (" (totals)" if final else ""))
+        print(format_stats(stats))
+
+    def run(self) -> None:
+        """Poll and process shards until interrupted (or, with --once, until idle)."""
+        self.pipeline.start()
+        last_report = time.perf_counter()
+        try:
+            while True:
+                for shard in self.new_shards():
+                    print(f"Found {shard.path.name}")
+                    # Blocks while the read queue is full
+                    self.pipeline.put(shard)
+
+                if self.args.once and self.active_shards == 0:
+                    break
+
+                now = time.perf_counter()
+                if now - last_report >= self.args.report_interval:
+                    self.report()
+                    last_report = now
+                time.sleep(self.args.poll_interval)
+        except KeyboardInterrupt:
+            # Unfinished shards are not in the ledger and get rescored next time
+            self._stopping.set()
+            print("\nInterrupted; unfinished shards will be rescored on restart")
+        else:
+            self.pipeline.close()
+        finally:
+            self.report(final=True)
+            self._cleaners.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Score JSONL shards dropped into a directory.")
+    parser.add_argument("input_dir", help="Directory the crawler writes JSONL shards to")
+    parser.add_argument("output_dir", help="Directory for predictions and the ledger")
+    parser.add_argument("--pattern", default="*.jsonl", help="Glob of shard files in input_dir")
+    parser.add_argument("--text-field", default="text", help="Field holding the article text")
+    parser.add_argument("--id-field", default=None, help="Optional field copied to the output as 'id'")
+    parser.add_argument("--model-path", default=None, help="Model to score with (default: config MODEL_PATH)")
+    parser.add_argument("--chunk-size", type=int, default=512, help="Records per pipeline item")
+    parser.add_argument("--queue-size", type=int, default=8, help="Chunks waiting in front of each stage")
+    parser.add_argument("--read-workers", type=int, default=1, help="Shards read at once")
+    parser.add_argument("--clean-workers", type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                        help="Cleaning processes")
+    parser.add_argument("--vectorize-workers", type=int, default=2, help="Vectorizing threads")
+    parser.add_argument("--score-workers", type=int, default=1, help="Scoring threads")
+    parser.add_argument("--write-workers", type=int, default=1, help="Writing threads")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between directory scans")
+    parser.add_argument("--settle", type=float, default=5.0,
+                        help="Seconds a shard must be unmodified before it is read")
+    parser.add_argument("--report-interval", type=float, default=30.0, help="Seconds between stats reports")
+    parser.add_argument("--once", action="store_true", help="Exit once the shards present are processed")
+    return parser.parse_args()
+
+
+def main():
+    """Run the ingestion daemon."""
+    args = parse_args()
+    if not Path(args.input_dir).is_dir():
+        print(f"Error: {args.input_dir} is not a directory")
+        sys.exit(1)
+
+    service = ModelService(args.model_path)
+    service.load_model()
+    if config.MODEL_RELOAD_INTERVAL > 0:
+        service.start_auto_reload(config.MODEL_RELOAD_INTERVAL)
+
+    daemon = IngestionDaemon(args, service)
+    print(f"Watching {args.input_dir} ({len(daemon.ledger)} shards in the ledger)")
+    daemon.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Staged processing pipeline for the Fake News Detector scripts.
+Runs a chain of stages, each with its own worker threads, connected by
+bounded queues, so a slow stage blocks the ones before it instead of
+letting work pile up in memory. Each stage reports throughput, busy
+time and how long it waited on its neighbours, which points at the
+bottleneck.
+"""
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+# Put on a stage's queue once per worker to stop it
+_STOP = object()
+
+_COUNTERS = ("items_in", "items_out", "records", "failures")
+
+
+class Stage:
+    """
+    One step of a pipeline.
+
+    func takes an item and returns the item for the next stage (None to
+    drop it). With fan_out, func returns an iterable of items instead,
+    each passed on separately. If func raises, the item is dropped and
+    on_error, if given, is called with the item and the exception.
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1,
+                 queue_size: int = 4, fan_out: bool = False,
+                 on_error: Optional[Callable[[Any, Exception], None]] = None):
+        """
+        Initialize the stage.
+
+        Args:
+            name: Name shown in stats
+            func: Work done per item
+            workers: Threads running func
+            queue_size: Maximum items waiting for this stage
+            fan_out: func returns an iterable of output items
+            on_error: Called with the item and exception when func raises
+        """
+        if workers <= 0 or queue_size <= 0:
+            raise ValueError("workers and queue_size must be positive")
+
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.queue_size = queue_size
+        self.fan_out = fan_out
+        self.on_error = on_error
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(_COUNTERS, 0)
+        self._counters.update(busy_seconds=0.0, blocked_seconds=0.0)
+
+    def add(self, **deltas: float) -> None:
+        """Add to this stage's counters."""
+        with self._lock:
+            for name, delta in deltas.items():
+                self._counters[name] += delta
+
+    def counters(self) -> dict:
+        """Copy of the raw counters."""
+        with self._lock:
+            return dict(self._counters)
+
+    def stats(self, elapsed: float, since: Optional[dict] = None) -> dict:
+        """
+        Stats over elapsed wall-clock seconds.
+
+        Args:
+            elapsed: Seconds the counters cover
+            since: Earlier counters() to subtract, for stats over an interval
+        """
+        counters = self.counters()
+        if since is not None:
+            counters = {name: value - since[name] for name, value in counters.items()}
+        capacity = self.workers * elapsed
+        busy = counters["busy_seconds"] / capacity if capacity else 0.0
+        blocked = counters["blocked_seconds"] / capacity if capacity else 0.0
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "items_in": counters["items_in"],
+            "items_out": counters["items_out"],
+            "records": counters["records"],
+            "records_per_s": counters["records"] / elapsed if elapsed else 0.0,
+            "failures": counters["failures"],
+            # Shares of worker time spent working, waiting for the next
+            # stage's queue, and waiting for input
+            "busy": busy,
+            "blocked_on_output": blocked,
+            "idle": max(0.0, 1.0 - busy - blocked),
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue_size,
+        }
+
+
+class Pipeline:
+    """
+    Chain of stages connected by bounded queues.
+
+    Items put into the pipeline go through every stage in order; the
+    last stage's outputs are discarded. Item order is not preserved
+    when a stage has several workers.
+    """
+
+    def __init__(self, stages: List[Stage], weight: Callable[[Any], int] = lambda item: 1):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Stages in processing order
+            weight: Records an output item counts for in throughput stats
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+
+        self.stages = stages
+        self._weight = weight
+        self._threads: List[List[threading.Thread]] = []
+        self._started: Optional[float] = None
+        self._interval_start: Optional[Tuple[float, List[dict]]] = None
+
+    def start(self) -> None:
+        """Start every stage's workers."""
+        self._started = time.perf_counter()
+        for position, stage in enumerate(self.stages):
+            downstream = self.stages[position + 1].queue if position + 1 < len(self.stages) else None
+            threads = [
+                threading.Thread(target=self._work, args=(stage, downstream),
+                                 name=f"{stage.name}-{i}", daemon=True)
+                for i in range(stage.workers)
+            ]
+            for thread in threads:
+                thread.start()
+            self._threads.append(threads)
+
+    def put(self, item: Any, timeout: Optional[float] = None) -> None:
+        """
+        Feed an item to the first stage, blocking while its queue is full.
+
+        Raises:
+            queue.Full: If the queue stayed full for timeout seconds
+        """
+        self.stages[0].queue.put(item, timeout=timeout)
+
+    def _work(self, stage: Stage, downstream: Optional["queue.Queue[Any]"]) -> None:
+        while True:
+            item = stage.queue.get()
+            if item is _STOP:
+                return
+
+            # Counters are updated per output, so a long fan-out shows up
+            # in the stats while it runs
+            mark = time.perf_counter()
+            try:
+                result = stage.func(item)
+                outputs: Iterable[Any] = (result if stage.fan_out else [result]) if result is not None else []
+                for output in outputs:
+                    if output is None:
+                        continue
+                    produced = time.perf_counter()
+                    if downstream is not None:
+                        downstream.put(output)
+                    handed_off = time.perf_counter()
+                    stage.add(items_out=1, records=self._weight(output),
+                              busy_seconds=produced - mark, blocked_seconds=handed_off - produced)
+                    mark = handed_off
+            except Exception as e:
+                print(f"Error in {stage.name} stage: {e}")
+                stage.add(failures=1)
+                if stage.on_error is not None:
+                    try:
+                        stage.on_error(item, e)
+                    except Exception as callback_error:
+                        print(f"Error in {stage.name} stage error handler: {callback_error}")
+            stage.add(items_in=1, busy_seconds=time.perf_counter() - mark)
+
+    def close(self) -> None:
+        """Let queued items drain through every stage, then stop the workers."""
+        for stage, threads in zip(self.stages, self._threads):
+            for _ in threads:
+                stage.queue.put(_STOP)
+            for thread in threads:
+                thread.join()
+
+    @property
+    def stats(self) -> List[dict]:
+        """Per-stage stats since start()."""
+        elapsed = time.perf_counter() - self._started if self._started is not None else 0.0
+        return [stage.stats(elapsed) for stage in self.stages]
+
+    def interval_stats(self) -> List[dict]:
+        """Per-stage stats since the previous call (or since start())."""
+        now = time.perf_counter()
+        previous, since = self._interval_start or (self._started or now, None)
+        counters = [stage.counters() for stage in self.stages]
+        self._interval_start = (now, counters)
+        return [
+            stage.stats(now - previous, since[i] if since is not None else None)
+            for i, stage in enumerate(self.stages)
+        ]
+
+
+def format_stats(stats: List[dict]) -> str:
+    """Render pipeline stats as a table."""
+    lines = [f"{'stage':<11}{'workers':>8}{'records':>10}{'rec/s':>9}{'busy':>7}"
+             f"{'idle':>7}{'blocked':>9}{'queue':>9}{'failed':>8}"]
+    for stage in stats:
+        lines.append(
+            f"{stage['stage']:<11}{stage['workers']:>8}{stage['records']:>10}"
+            f"{stage['records_per_s']:>9.0f}{stage['busy']:>7.0%}{stage['idle']:>7.0%}"
+            f"{stage['blocked_on_output']:>9.0%}{stage['queue_depth']:>5}/{stage['queue_size']:<3}"
+            f"{stage['failures']:>8}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,175 @@
+"""
+Stage profiler for the training scripts.
+Records wall time, CPU time and peak memory for each named stage of a
+run and writes them as a JSON report, so regressions in the retraining
+pipeline show up as numbers rather than impressions.
+"""
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _max_rss() -> Optional[int]:
+    """Peak resident set size of this process so far, in bytes (None on Windows)."""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class StageProfiler:
+    """
+    Collects per-stage timings and memory peaks.
+
+    Wall time uses a monotonic clock. CPU time is split into this process
+    and finished child processes (e.g. a cleaning pool that has been
+    joined). Memory is always recorded cheaply from the process's peak
+    resident set size: its value when the stage ends, and how much the
+    stage raised it (0 if the stage stayed below an earlier peak). With
+    trace_memory, the highest tracemalloc allocation above the stage's
+    starting level is recorded too; it covers Python objects and numpy
+    arrays allocated in this process, and is None otherwise. Stages
+    entered more than once under the same name are accumulated. Stages
+    must not be nested, because the tracemalloc peak is reset when each
+    stage starts.
+    """
+
+    def __init__(self, enabled: bool = True, trace_memory: bool = False):
+        """
+        Initialize the profiler.
+
+        Args:
+            enabled: If False, stage() measures nothing (for optional profiling)
+            trace_memory: Track allocation peaks with tracemalloc (slows
+                allocation-heavy stages)
+        """
+        self.enabled = enabled
+        self.trace_memory = trace_memory and enabled
+        self._stages: Dict[str, dict] = {}
+        self._started = datetime.now(timezone.utc)
+        self._start_wall = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure the enclosed block as the named stage."""
+        if not self.enabled:
+            yield
+            return
+
+        if self.trace_memory:
+            start_memory, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        start_rss = _max_rss()
+        start_times = os.times()
+        start_wall = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start_wall
+            end_times = os.times()
+            end_rss = _max_rss()
+            peak = 0
+            retained = 0
+            if self.trace_memory:
+                current, peak_memory = tracemalloc.get_traced_memory()
+                peak = max(peak_memory - start_memory, 0)
+                retained = current - start_memory
+
+            record = self._stages.setdefault(name, {
+                "name": name,
+                "calls": 0,
+                "wall_seconds": 0.0,
+                "cpu_seconds": 0.0,
+                "child_cpu_seconds": 0.0,
+                "max_rss_bytes": None,
+                "rss_growth_bytes": None,
+                "peak_alloc_bytes": 0 if self.trace_memory else None,
+                "retained_bytes": 0 if self.trace_memory else None,
+            })
+            record["calls"] += 1
+            record["wall_seconds"] += wall
+            record["cpu_seconds"] += (end_times.user - start_times.user) + (end_times.system - start_times.system)
+            record["child_cpu_seconds"] += (
+                (end_times.children_user - start_times.children_user)
+                + (end_times.children_system - start_times.children_system)
+            )
+            if end_rss is not None:
+                record["max_rss_bytes"] = end_rss
+                record["rss_growth_bytes"] = (record["rss_growth_bytes"] or 0) + end_rss - start_rss
+            if self.trace_memory:
+                record["peak_alloc_bytes"] = max(record["peak_alloc_bytes"], peak)
+                record["retained_bytes"] += retained
+
+    def report(self, **metadata) -> dict:
+        """
+        Build the machine-readable report.
+
+        Args:
+            **metadata: Extra top-level fields (e.g. mode, sample counts)
+
+        Returns:
+            Dictionary with run metadata, totals and one entry per stage
+        """
+        stages = [
+            {
+                **record,
+                "wall_seconds": round(record["wall_seconds"], 6),
+                "cpu_seconds": round(record["cpu_seconds"], 6),
+                "child_cpu_seconds": round(record["child_cpu_seconds"], 6),
+            }
+            for record in self._stages.values()
+        ]
+        return {
+            "started": self._started.isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "memory_traced": self.trace_memory,
+            "total_wall_seconds": round(time.perf_counter() - self._start_wall, 6),
+            "max_rss_bytes": _max_rss(),
+            **metadata,
+            "stages": stages,
+        }
+
+    def write(self, path: str, **metadata) -> Path:
+        """Write the report as JSON and return its path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(**metadata), f, indent=2)
+        return path
+
+    def print_summary(self) -> None:
+        """Print one line per stage."""
+        def megabytes(value: Optional[int]) -> str:
+            return '-' if value is None else f"{value / 1e6:.1f}"
+
+        print(f"{'stage':<22}{'wall s':>9}{'cpu s':>9}{'child s':>9}{'rss MB':>9}{'+rss MB':>9}{'alloc MB':>10}")
+        for record in self._stages.values():
+            print(f"{record['name']:<22}{record['wall_seconds']:>9.2f}{record['cpu_seconds']:>9.2f}"
+                  f"{record['child_cpu_seconds']:>9.2f}{megabytes(record['max_rss_bytes']):>9}"
+                  f"{megabytes(record['rss_growth_bytes']):>9}{megabytes(record['peak_alloc_bytes']):>10}")
+
+
+# Shared no-op profiler for callers that do not profile
+NULL_PROFILER = StageProfiler(enabled=False)
+
+
+def profile_path(model_path: str) -> Path:
+    """Report path next to a model artifact (<name>.profile.json)."""
+    model_path = Path(model_path)
+    return model_path.with_name(f"{model_path.stem}.profile.json")
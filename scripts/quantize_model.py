@@ -0,0 +1,104 @@
+"""
+Quantized model export for the Fake News Detector.
+Converts the serving model's coefficients and idf weights to int8 (with
+a scale) or float16, and only writes the quantized artifact after
+checking that it predicts the same labels as the float64 model on the
+held-out split used by train_model.py.
+"""
+import argparse
+import pickle
+import tracemalloc
+from pathlib import Path
+import numpy as np
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.config import config
+from src.services.quantized_model import QUANTIZED_DTYPES, quantize_artifact
+from scripts.corpus import holdout_split, load_clean_corpus
+from scripts.sweep import measure_latency
+
+
+def load_footprint(data: bytes) -> int:
+    """Bytes allocated while unpickling an artifact."""
+    tracemalloc.start()
+    loaded = pickle.loads(data)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del loaded
+    return retained
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Export a quantized copy of the model.")
+    parser.add_argument("--model-path", default=config.MODEL_PATH,
+                        help=f"float64 model to quantize (default: {config.MODEL_PATH})")
+    parser.add_argument("--output", default=None,
+                        help="Quantized artifact path (default: <model>.<dtype>.pkl)")
+    parser.add_argument("--dtype", choices=QUANTIZED_DTYPES, default="int8",
+                        help="Storage type for coefficients and idf weights")
+    parser.add_argument("--true-csv", default="True.csv", help="CSV of true news with a 'text' column")
+    parser.add_argument("--fake-csv", default="Fake.csv", help="CSV of fake news with a 'text' column")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-clean the corpus instead of using the Parquet cache")
+    parser.add_argument("--cache-dir", default=None,
+                        help=f"Directory for the cleaned corpus cache (default: {config.CACHE_DIR})")
+    parser.add_argument("--max-mismatch-rate", type=float, default=0.0,
+                        help="Largest share of held-out labels allowed to differ (default: 0)")
+    return parser.parse_args()
+
+
+def main():
+    """Quantize, validate against the float64 model and export."""
+    args = parse_args()
+    model_path = Path(args.model_path)
+    output = Path(args.output) if args.output else model_path.with_name(
+        f"{model_path.stem}.{args.dtype}{model_path.suffix}"
+    )
+
+    original_data = model_path.read_bytes()
+    model, vectorizer = pickle.loads(original_data)
+    quantized_model, quantized_vectorizer = quantize_artifact(model, vectorizer, args.dtype)
+    quantized_data = pickle.dumps((quantized_model, quantized_vectorizer))
+
+    print("Loading held-out split...")
+    df = load_clean_corpus(true_csv=args.true_csv, fake_csv=args.fake_csv,
+                           use_cache=not args.no_cache, cache_dir=args.cache_dir)
+    _, test_rows = holdout_split(df['label'].to_numpy())
+    texts = df['text_clean'].to_numpy()[test_rows].tolist()
+    y_test = df['label'].to_numpy()[test_rows]
+
+    # Validate on the held-out split
+    expected = model.predict(vectorizer.transform(texts))
+    actual = quantized_model.predict(quantized_vectorizer.transform(texts))
+    mismatches = int((expected != actual).sum())
+    probability_error = float(np.abs(
+        model.predict_proba(vectorizer.transform(texts))[:, 1]
+        - quantized_model.predict_proba(quantized_vectorizer.transform(texts))[:, 1]
+    ).max()) if texts else 0.0
+
+    print(f"\nValidation on {len(texts)} held-out texts ({args.dtype}):")
+    print(f"Label mismatches: {mismatches}")
+    print(f"Max probability difference: {probability_error:.6f}")
+    print(f"Accuracy: float64 {(expected == y_test).mean():.4f}, quantized {(actual == y_test).mean():.4f}")
+
+    sample = texts[:200]
+    print(f"\n{'artifact':<12}{'file KB':>9}{'loaded KB':>11}{'p50 ms':>8}")
+    for name, data, (m, v) in [
+        ("float64", original_data, (model, vectorizer)),
+        (args.dtype, quantized_data, (quantized_model, quantized_vectorizer)),
+    ]:
+        print(f"{name:<12}{len(data) / 1024:>9.0f}{load_footprint(data) / 1024:>11.0f}"
+              f"{measure_latency(m, v, sample):>8.3f}")
+
+    if not texts or mismatches > args.max_mismatch_rate * len(texts):
+        print(f"\n✗ Quantized labels differ from the float64 model; {output} not written")
+        sys.exit(1)
+
+    output.write_bytes(quantized_data)
+    print(f"\n✓ Quantized model saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
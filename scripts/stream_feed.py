@@ -0,0 +1,104 @@
+"""
+Feed client for the streaming prediction endpoint.
+Sends the articles of a JSONL file to /predict/stream over one
+connection, optionally paced like a live feed, while a second thread
+reads predictions back as they finish and writes them as JSONL.
+"""
+import argparse
+import http.client
+import json
+import socket
+import sys
+import threading
+import time
+from typing import Iterator, Optional
+from urllib.parse import urlsplit
+
+
+def iter_items(path: str, text_field: str, id_field: Optional[str]) -> Iterator[dict]:
+    """Yield {"id", "text"} items from a JSONL file (ids default to line numbers)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield {
+                "id": record.get(id_field, line_number) if id_field else line_number,
+                "text": record.get(text_field, "")
+            }
+
+
+def send_chunk(sock: socket.socket, data: bytes) -> None:
+    """Send one chunk of a chunked request body."""
+    sock.sendall(b"%x\r\n%s\r\n" % (len(data), data))
+
+
+def main():
+    """Stream a JSONL file through /predict/stream and print throughput."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("input", help="JSONL file of articles")
+    parser.add_argument("--output", default=None, help="JSONL file for the predictions (default: stdout)")
+    parser.add_argument("--url", default="http://127.0.0.1:5000/predict/stream", help="Streaming endpoint URL")
+    parser.add_argument("--text-field", default="text", help="Field holding the article text")
+    parser.add_argument("--id-field", default=None, help="Field sent as the item id (default: line number)")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="Articles per second to send, like a live feed (0 = as fast as possible)")
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=None)
+    connection.putrequest("POST", url.path or "/")
+    connection.putheader("Content-Type", "application/x-ndjson")
+    connection.putheader("Accept", "application/x-ndjson")
+    connection.putheader("Transfer-Encoding", "chunked")
+    connection.endheaders()
+    # Send on the socket itself: http.client lets go of it once a
+    # "Connection: close" response starts, while the body is still going out
+    sock = connection.sock
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    summary = {}
+    started = time.perf_counter()
+
+    def read_predictions():
+        # The server answers while the body is still being sent
+        response = connection.getresponse()
+        if response.status != 200:
+            print(f"Error: {response.status} {response.read().decode('utf-8', 'replace')}", file=sys.stderr)
+            return
+        for line in response:
+            if not line.strip():
+                continue
+            prediction = json.loads(line)
+            if prediction.get("done"):
+                summary.update(prediction)
+                return
+            out.write(json.dumps(prediction) + "\n")
+
+    reader = threading.Thread(target=read_predictions, daemon=True)
+    reader.start()
+
+    sent = 0
+    try:
+        for item in iter_items(args.input, args.text_field, args.id_field):
+            if args.rate > 0:
+                delay = started + sent / args.rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            send_chunk(sock, json.dumps(item).encode('utf-8') + b"\n")
+            sent += 1
+        sock.sendall(b"0\r\n\r\n")
+    except OSError as e:
+        print(f"Error: Connection closed while sending: {e}", file=sys.stderr)
+
+    reader.join()
+    elapsed = time.perf_counter() - started
+    if out is not sys.stdout:
+        out.close()
+
+    print(f"Sent {sent} articles, received {summary.get('delivered', 0)} predictions "
+          f"in {elapsed:.1f}s ({sent / elapsed:.1f}/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Hyperparameter sweep for the Fake News Detector.
+Cleans and tokenizes the corpus once, builds one n-gram count matrix
+per NGRAM_RANGE, and derives every MIN_DF / MAX_DF / MAX_FEATURES
+variant from it by column selection instead of re-vectorizing. Cross-
+validated fits for all configurations run in parallel across cores,
+and each configuration is reported with accuracy, model size and
+measured inference latency, marking the latency/accuracy Pareto front.
+"""
+import argparse
+import csv
+import itertools
+import math
+import pickle
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.config import config
+from scripts.corpus import load_clean_corpus
+
+# Same tokenization as TfidfVectorizer's default token_pattern
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+@dataclass
+class SweepResult:
+    """Scores of one hyperparameter configuration."""
+    ngram_range: Tuple[int, int]
+    min_df: float
+    max_df: float
+    max_features: int
+    C: float
+    n_features: int
+    accuracy: float
+    accuracy_std: float
+    size_bytes: int
+    latency_ms: float
+    pareto: bool = False
+
+
+def word_ngrams(tokens: Sequence[str], ngram_range: Tuple[int, int]) -> List[str]:
+    """Build space-joined n-grams from a token list, like CountVectorizer does."""
+    low, high = ngram_range
+    grams = list(tokens) if low == 1 else []
+    for n in range(max(low, 2), high + 1):
+        grams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    return grams
+
+
+def absolute_df(value: float, n_docs: int) -> int:
+    """Convert a MIN_DF/MAX_DF value (count or proportion) to a document count."""
+    if isinstance(value, float) and value <= 1.0:
+        return int(math.ceil(value * n_docs)) if value < 1.0 else n_docs
+    return int(value)
+
+
+def select_features(counts, min_df: float, max_df: float, max_features: int) -> np.ndarray:
+    """
+    Pick vocabulary columns of a CSC count matrix the way TfidfVectorizer would.
+
+    Keeps terms whose document frequency is within [min_df, max_df],
+    then the max_features most frequent of those by total count.
+
+    Returns:
+        Sorted column indices into the count matrix
+    """
+    n_docs = counts.shape[0]
+    dfs = np.diff(counts.indptr)
+    keep = np.flatnonzero((dfs >= absolute_df(min_df, n_docs)) & (dfs <= absolute_df(max_df, n_docs)))
+    if max_features and len(keep) > max_features:
+        totals = np.asarray(counts[:, keep].sum(axis=0)).ravel()
+        keep = np.sort(keep[np.argsort(-totals, kind='stable')[:max_features]])
+    return keep
+
+
+def fit_fold(X, y, train_index, test_index, C: float) -> float:
+    """Fit on one CV fold and return its held-out accuracy."""
+    model = LogisticRegression(C=C, max_iter=1000, random_state=42)
+    model.fit(X[train_index], y[train_index])
+    return float((model.predict(X[test_index]) == y[test_index]).mean())
+
+
+def fit_full(X, y, C: float) -> LogisticRegression:
+    """Fit the final model of a configuration on all samples."""
+    return LogisticRegression(C=C, max_iter=1000, random_state=42).fit(X, y)
+
+
+def build_vectorizer(terms: Sequence[str], idf: np.ndarray, ngram_range: Tuple[int, int],
+                     **params) -> TfidfVectorizer:
+    """
+    Assemble a fitted TfidfVectorizer from a selected vocabulary and its idf weights.
+
+    Extra keyword arguments are passed to TfidfVectorizer (e.g. norm).
+    """
+    vectorizer = TfidfVectorizer(
+        vocabulary={term: i for i, term in enumerate(terms)},
+        ngram_range=ngram_range,
+        **params
+    )
+    vectorizer.fit([""])
+    vectorizer.idf_ = idf
+    return vectorizer
+
+
+def measure_latency(model, vectorizer, texts: Sequence[str]) -> float:
+    """Median milliseconds to vectorize and score one cleaned text."""
+    # Warm up caches so the first configuration timed is not penalized
+    for text in texts[:20]:
+        model.predict_proba(vectorizer.transform([text]))
+    timings = []
+    for text in texts:
+        started = time.perf_counter()
+        model.predict_proba(vectorizer.transform([text]))
+        timings.append(time.perf_counter() - started)
+    return float(np.median(timings) * 1000)
+
+
+def mark_pareto(results: List[SweepResult]) -> None:
+    """Flag results no other result beats on both accuracy and latency."""
+    for result in results:
+        result.pareto = not any(
+            other.accuracy >= result.accuracy and other.latency_ms <= result.latency_ms
+            and (other.accuracy > result.accuracy or other.latency_ms < result.latency_ms)
+            for other in results
+        )
+
+
+def parse_ngram_range(value: str) -> Tuple[int, int]:
+    """Parse an n-gram range given as 'min,max'."""
+    low, high = (int(part) for part in value.split(","))
+    if low < 1 or low > high:
+        raise argparse.ArgumentTypeError("ngram range must be 'min,max' with 1 <= min <= max")
+    return low, high
+
+
+def parse_df(value: str) -> float:
+    """Parse MIN_DF/MAX_DF values: integers are counts, decimals are proportions."""
+    return float(value) if "." in value else int(value)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Sweep vectorizer and model hyperparameters.")
+    parser.add_argument("--true-csv", default="True.csv", help="CSV of true news with a 'text' column")
+    parser.add_argument("--fake-csv", default="Fake.csv", help="CSV of fake news with a 'text' column")
+    parser.add_argument("--max-features", type=int, nargs="+", default=[2000, config.MAX_FEATURES, 10000])
+    parser.add_argument("--min-df", type=parse_df, nargs="+", default=[config.MIN_DF, 5])
+    parser.add_argument("--max-df", type=parse_df, nargs="+", default=[config.MAX_DF])
+    parser.add_argument("--ngram-range", type=parse_ngram_range, nargs="+",
+                        default=[(1, 1), tuple(config.NGRAM_RANGE)])
+    parser.add_argument("--C", type=float, nargs="+", default=[0.5, 1.0, 4.0],
+                        help="Inverse regularization strengths for LogisticRegression")
+    parser.add_argument("--folds", type=int, default=5, help="Cross-validation folds")
+    parser.add_argument("--jobs", type=int, default=-1, help="Parallel fits (default: all cores)")
+    parser.add_argument("--workers", type=int, default=None, help="Processes used for text cleaning")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-clean the corpus instead of using the Parquet cache")
+    parser.add_argument("--cache-dir", default=None,
+                        help=f"Directory for the cleaned corpus cache (default: {config.CACHE_DIR})")
+    parser.add_argument("--latency-samples", type=int, default=200,
+                        help="Texts timed per configuration for inference latency")
+    parser.add_argument("--output", default=None, help="Optional CSV file for the results table")
+    return parser.parse_args()
+
+
+def print_table(results: List[SweepResult]) -> None:
+    """Print results sorted by accuracy, best first."""
+    header = (f"{'ngram':<7}{'min_df':>7}{'max_df':>7}{'max_feat':>9}{'C':>6}{'feats':>7}"
+              f"{'cv acc':>15}{'size KB':>9}{'p50 ms':>8}  pareto")
+    print(header)
+    print("-" * len(header))
+    for r in sorted(results, key=lambda r: (-r.accuracy, r.latency_ms)):
+        print(f"{'%d,%d' % r.ngram_range:<7}{r.min_df:>7}{r.max_df:>7}{r.max_features:>9}{r.C:>6}"
+              f"{r.n_features:>7}{r.accuracy:>9.4f}±{r.accuracy_std:.3f}{r.size_bytes / 1024:>9.0f}"
+              f"{r.latency_ms:>8.3f}  {'*' if r.pareto else ''}")
+
+
+def main():
+    """Run the sweep and report every configuration."""
+    args = parse_args()
+
+    print("Loading cleaned corpus...")
+    df = load_clean_corpus(true_csv=args.true_csv, fake_csv=args.fake_csv, workers=args.workers,
+                           use_cache=not args.no_cache, cache_dir=args.cache_dir)
+    texts = df['text_clean'].tolist()
+    y = df['label'].to_numpy()
+    n_docs = len(texts)
+
+    # Tokenize once; every n-gram range reuses the same token streams
+    tokens = [TOKEN_PATTERN.findall(text) for text in texts]
+    folds = list(StratifiedKFold(n_splits=args.folds, shuffle=True, random_state=42).split(texts, y))
+    latency_texts = texts[:args.latency_samples]
+    lowest_min_df = min(absolute_df(value, n_docs) for value in args.min_df)
+
+    # (ngram range, min_df, max_df, max_features) -> (TF-IDF matrix, terms, idf)
+    feature_sets: Dict[tuple, tuple] = {}
+    for ngram_range in args.ngram_range:
+        started = time.perf_counter()
+        counter = CountVectorizer(analyzer=lambda doc, r=ngram_range: word_ngrams(doc, r), min_df=lowest_min_df)
+        counts = counter.fit_transform(tokens).tocsc()
+        vocabulary = counter.get_feature_names_out()
+        print(f"Counted n-grams {ngram_range}: {counts.shape[1]} terms in {time.perf_counter() - started:.1f}s")
+
+        for min_df, max_df, max_features in itertools.product(args.min_df, args.max_df, args.max_features):
+            columns = select_features(counts, min_df, max_df, max_features)
+            if len(columns) == 0:
+                print(f"Warning: No terms left for ngram={ngram_range} min_df={min_df} max_df={max_df}")
+                continue
+            transformer = TfidfTransformer()
+            X = transformer.fit_transform(counts[:, columns].tocsr())
+            feature_sets[(ngram_range, min_df, max_df, max_features)] = (X, vocabulary[columns], transformer.idf_)
+
+    configs = [(key, C) for key in feature_sets for C in args.C]
+    print(f"\nCross-validating {len(configs)} configurations x {args.folds} folds...")
+    started = time.perf_counter()
+    parallel = Parallel(n_jobs=args.jobs)
+    scores = parallel(
+        delayed(fit_fold)(feature_sets[key][0], y, train_index, test_index, C)
+        for key, C in configs for train_index, test_index in folds
+    )
+    models = parallel(delayed(fit_full)(feature_sets[key][0], y, C) for key, C in configs)
+    print(f"Fitted in {time.perf_counter() - started:.1f}s")
+
+    results = []
+    for i, ((key, C), model) in enumerate(zip(configs, models)):
+        ngram_range, min_df, max_df, max_features = key
+        _, terms, idf = feature_sets[key]
+        fold_scores = scores[i * args.folds:(i + 1) * args.folds]
+        vectorizer = build_vectorizer(terms, idf, ngram_range)
+        results.append(SweepResult(
+            ngram_range=ngram_range,
+            min_df=min_df,
+            max_df=max_df,
+            max_features=max_features,
+            C=C,
+            n_features=len(terms),
+            accuracy=float(np.mean(fold_scores)),
+            accuracy_std=float(np.std(fold_scores)),
+            size_bytes=len(pickle.dumps((model, vectorizer))),
+            latency_ms=measure_latency(model, vectorizer, latency_texts)
+        ))
+
+    mark_pareto(results)
+    print()
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(list(SweepResult.__dataclass_fields__))
+            for r in results:
+                writer.writerow([f"{r.ngram_range[0]},{r.ngram_range[1]}", r.min_df, r.max_df, r.max_features,
+                                 r.C, r.n_features, r.accuracy, r.accuracy_std, r.size_bytes, r.latency_ms,
+                                 r.pareto])
+        print(f"\nResults written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
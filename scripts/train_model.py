@@ -1,10 +1,15 @@
 """
 Model training script for the Fake News Detector.
-Trains a Logistic Regression classifier with TF-IDF features.
+Trains a Logistic Regression classifier with TF-IDF features, or, with
+--out-of-core, an SGD logistic regression over hashed features that is
+fitted incrementally from cleaned corpus shards with bounded memory.
 """
+import argparse
+import tempfile
+import time
+import zlib
 import pandas as pd
 import numpy as np
-import re
 import matplotlib.pyplot as plt
 import seaborn as sns
 import sklearn
@@ -12,129 +17,279 @@ import nltk
 import pickle
 from pathlib import Path
 
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.metrics import accuracy_score, confusion_matrix, classification_report
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
 
 # Import config
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.config import config
+from scripts.compaction import export_compact_models, print_report
+from scripts.corpus import build_clean_shards, holdout_split, load_clean_corpus
+from scripts.profiling import StageProfiler, profile_path
 
-# Show versions
-print('Numpy', np.__version__)
-print('Pandas', pd.__version__)
-print('Sklearn', sklearn.__version__)
-
-# Download necessary resources
-print("\nDownloading NLTK resources...")
-nltk.download('stopwords', quiet=True)
-nltk.download('wordnet', quiet=True)
-
-# Load datasets
-print("\nLoading datasets...")
-df_true = pd.read_csv("True.csv")
-df_fake = pd.read_csv("Fake.csv")
-
-# Add labels
-df_fake["label"] = 0  # Fake
-df_true["label"] = 1  # True
-
-# Combine datasets
-df = pd.concat([df_fake, df_true], ignore_index=True).sample(frac=1, random_state=42).reset_index(drop=True)
-print(f"Total samples: {len(df)}")
-print(f"Fake samples: {len(df_fake)}")
-print(f"True samples: {len(df_true)}")
-
-# Preprocessing
-stop_words = set(stopwords.words("english"))
-lemmatizer = WordNetLemmatizer()
-
-def clean_text(text):
-    """Clean and preprocess text."""
-    if pd.isna(text):
-        return ""
-    text = str(text).lower()
-    text = re.sub(r"\[.*?\]", "", text)
-    text = re.sub(r"https?://\S+|www\.\S+", "", text)
-    text = re.sub(r"<.*?>+", "", text)
-    text = re.sub(r"[^a-zA-Z]", " ", text)
-    words = [
-        lemmatizer.lemmatize(word)
-        for word in text.split()
-        if word not in stop_words and len(word) > config.MIN_WORD_LENGTH
-    ]
-    return " ".join(words)
-
-print("\nCleaning text...")
-df['text_clean'] = df['text'].apply(clean_text)
-df = df[df['text_clean'].str.len() > 0].reset_index(drop=True)
-print(f"Samples after cleaning: {len(df)}")
-
-# TF-IDF vectorization
-print("\nVectorizing text...")
-vectorizer = TfidfVectorizer(
-    max_features=config.MAX_FEATURES,
-    min_df=config.MIN_DF,
-    max_df=config.MAX_DF,
-    ngram_range=config.NGRAM_RANGE
-)
-X = vectorizer.fit_transform(df['text_clean'])
-y = df['label'].values
-
-print(f"Feature matrix shape: {X.shape}")
-
-# Split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
-print(f"Training samples: {len(X_train)}")
-print(f"Test samples: {len(X_test)}")
-
-# Train model
-print("\nTraining model...")
-model = LogisticRegression(max_iter=1000, random_state=42)
-model.fit(X_train, y_train)
-print("Training complete!")
-
-# Save model + vectorizer
-model_path = Path(config.MODEL_PATH)
-model_path.parent.mkdir(parents=True, exist_ok=True)
-
-with open(model_path, "wb") as f:
-    pickle.dump((model, vectorizer), f)
-
-print(f"\nModel and vectorizer saved to: {model_path}")
-
-# Evaluate
-print("\nEvaluating model...")
-y_pred = model.predict(X_test)
-accuracy = accuracy_score(y_test, y_pred)
-
-print(f"\nAccuracy: {accuracy:.4f}")
-print("\nClassification Report:")
-print(classification_report(y_test, y_pred, target_names=['Fake', 'True']))
-
-# Confusion matrix
-print("\nGenerating confusion matrix...")
-plt.figure(figsize=(6, 4))
-sns.heatmap(
-    confusion_matrix(y_test, y_pred),
-    annot=True,
-    fmt='d',
-    cmap='Blues',
-    xticklabels=['Fake', 'True'],
-    yticklabels=['Fake', 'True']
-)
-plt.title("Confusion Matrix")
-plt.xlabel("Predicted")
-plt.ylabel("Actual")
-plt.tight_layout()
-plt.savefig("confusion_matrix.png")
-plt.close()
-print("Confusion matrix saved to: confusion_matrix.png")
-
-print("\n✓ Training complete!")
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Train the fake news classifier.")
+    parser.add_argument("--true-csv", default="True.csv", help="CSV of true news with a 'text' column")
+    parser.add_argument("--fake-csv", default="Fake.csv", help="CSV of fake news with a 'text' column")
+    parser.add_argument("--model-path", default=config.MODEL_PATH,
+                        help=f"Where to write the trained model (default: {config.MODEL_PATH})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes used for text cleaning (default: all cores)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-clean the corpus instead of using the Parquet cache")
+    parser.add_argument("--cache-dir", default=None,
+                        help=f"Directory for the cleaned corpus cache (default: {config.CACHE_DIR})")
+    parser.add_argument("--out-of-core", action="store_true",
+                        help="Stream the corpus in chunks and train incrementally on hashed features")
+    parser.add_argument("--chunk-size", type=int, default=config.OOC_CHUNK_SIZE,
+                        help=f"Out-of-core: rows read from each CSV per chunk (default: {config.OOC_CHUNK_SIZE})")
+    parser.add_argument("--epochs", type=int, default=config.OOC_EPOCHS,
+                        help=f"Out-of-core: passes over the training data (default: {config.OOC_EPOCHS})")
+    parser.add_argument("--compact-sizes", type=int, nargs="+", default=None,
+                        help="Also export pruned models with these vocabulary sizes (e.g. 500 1000 2000)")
+    parser.add_argument("--compact-method", choices=["weight", "chi2"], default="weight",
+                        help="Rank features by logistic weight magnitude or chi-squared score")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also record per-stage peak allocations with tracemalloc (slower)")
+    args = parser.parse_args()
+    if args.out_of_core and args.compact_sizes:
+        parser.error("--compact-sizes needs a vocabulary and cannot be used with --out-of-core")
+    return args
+
+
+def save_confusion_matrix(y_test, y_pred, path: str = "confusion_matrix.png") -> None:
+    """Plot the confusion matrix of test predictions to an image file."""
+    plt.figure(figsize=(6, 4))
+    sns.heatmap(
+        confusion_matrix(y_test, y_pred),
+        annot=True,
+        fmt='d',
+        cmap='Blues',
+        xticklabels=['Fake', 'True'],
+        yticklabels=['Fake', 'True']
+    )
+    plt.title("Confusion Matrix")
+    plt.xlabel("Predicted")
+    plt.ylabel("Actual")
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def train_in_memory(args: argparse.Namespace, profiler: StageProfiler):
+    """
+    Fit TF-IDF and logistic regression on the whole corpus in memory.
+
+    Returns:
+        Tuple of (model, vectorizer, held-out labels, held-out predictions)
+    """
+    # Load and clean datasets (cleaned corpus is cached between runs)
+    print("\nLoading datasets...")
+    df = load_clean_corpus(
+        true_csv=args.true_csv,
+        fake_csv=args.fake_csv,
+        workers=args.workers,
+        use_cache=not args.no_cache,
+        cache_dir=args.cache_dir,
+        profiler=profiler
+    )
+    print(f"Samples after cleaning: {len(df)}")
+
+    # TF-IDF vectorization
+    print("\nVectorizing text...")
+    with profiler.stage("vectorizer_fit"):
+        vectorizer = TfidfVectorizer(
+            max_features=config.MAX_FEATURES,
+            min_df=config.MIN_DF,
+            max_df=config.MAX_DF,
+            ngram_range=config.NGRAM_RANGE
+        )
+        X = vectorizer.fit_transform(df['text_clean'])
+        y = df['label'].values
+
+    print(f"Feature matrix shape: {X.shape}")
+
+    # Split
+    with profiler.stage("split"):
+        train_rows, test_rows = holdout_split(y)
+        X_train, X_test, y_train, y_test = X[train_rows], X[test_rows], y[train_rows], y[test_rows]
+    print(f"Training samples: {X_train.shape[0]}")
+    print(f"Test samples: {X_test.shape[0]}")
+
+    # Train model
+    print("\nTraining model...")
+    with profiler.stage("model_fit"):
+        model = LogisticRegression(max_iter=1000, random_state=42)
+        model.fit(X_train, y_train)
+    print("Training complete!")
+
+    if args.compact_sizes:
+        print(f"\nExporting compact models (pruned by {args.compact_method})...")
+        with profiler.stage("compaction"):
+            results = export_compact_models(
+                model, vectorizer, X_train, X_test, y_train, y_test,
+                test_texts=df['text_clean'].to_numpy()[test_rows],
+                model_path=args.model_path,
+                sizes=args.compact_sizes,
+                method=args.compact_method
+            )
+        print_report(results)
+
+    with profiler.stage("evaluation"):
+        y_pred = model.predict(X_test)
+    return model, vectorizer, y_test, y_pred
+
+
+def holdout_mask(texts: pd.Series, fraction: float = config.OOC_HOLDOUT_FRACTION) -> np.ndarray:
+    """
+    Assign texts to the held-out set by a stable hash of their content.
+
+    The split needs no stored indices, is identical on every epoch and
+    run, and keeps duplicate texts on the same side of the split.
+    """
+    threshold = int(fraction * 2 ** 32)
+    return np.fromiter(
+        (zlib.crc32(text.encode('utf-8')) < threshold for text in texts),
+        dtype=bool, count=len(texts)
+    )
+
+
+def train_out_of_core(args: argparse.Namespace, profiler: StageProfiler):
+    """
+    Fit an SGD logistic regression over hashed features, shard by shard.
+
+    Memory is bounded by one shard: the hashing vectorizer is stateless,
+    and the model is updated with partial_fit. Shard order and rows
+    within a shard are reshuffled every epoch.
+
+    Returns:
+        Tuple of (model, vectorizer, held-out labels, held-out predictions)
+    """
+    vectorizer = HashingVectorizer(
+        n_features=config.HASHING_N_FEATURES,
+        ngram_range=config.NGRAM_RANGE,
+        alternate_sign=False,
+        norm='l2'
+    )
+    model = SGDClassifier(loss='log_loss', alpha=1e-6, random_state=42)
+    classes = np.array([0, 1])
+    rng = np.random.default_rng(42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print("\nPreparing cleaned corpus shards...")
+        # CSV reading and cleaning are interleaved chunk by chunk, so they form one stage
+        with profiler.stage("csv_load_and_cleaning"):
+            shards = build_clean_shards(
+                true_csv=args.true_csv,
+                fake_csv=args.fake_csv,
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+                cache_dir=args.cache_dir,
+                shard_dir=str(Path(tmp) / "shards") if args.no_cache else None
+            )
+
+        print(f"\nTraining for {args.epochs} epochs over {len(shards)} shards...")
+        for epoch in range(1, args.epochs + 1):
+            started = time.perf_counter()
+            seen = 0
+            with profiler.stage("model_fit"):
+                for index in rng.permutation(len(shards)):
+                    chunk = pd.read_parquet(shards[index])
+                    chunk = chunk.loc[~holdout_mask(chunk['text_clean'])]
+                    if chunk.empty:
+                        continue
+                    order = rng.permutation(len(chunk))
+                    texts = chunk['text_clean'].to_numpy()[order]
+                    labels = chunk['label'].to_numpy()[order]
+                    model.partial_fit(vectorizer.transform(texts), labels, classes=classes)
+                    seen += len(chunk)
+            print(f"Epoch {epoch}/{args.epochs}: {seen} samples in {time.perf_counter() - started:.1f}s")
+        print("Training complete!")
+
+        # Score the held-out rows shard by shard; only labels are kept
+        with profiler.stage("evaluation"):
+            y_test, y_pred = [], []
+            for shard in shards:
+                chunk = pd.read_parquet(shard)
+                chunk = chunk.loc[holdout_mask(chunk['text_clean'])]
+                if chunk.empty:
+                    continue
+                y_test.append(chunk['label'].to_numpy())
+                y_pred.append(model.predict(vectorizer.transform(chunk['text_clean'])))
+
+            y_test = np.concatenate(y_test) if y_test else np.array([], dtype=np.int8)
+            y_pred = np.concatenate(y_pred) if y_pred else np.array([], dtype=np.int8)
+    print(f"Test samples: {len(y_test)}")
+    return model, vectorizer, y_test, y_pred
+
+
+def main():
+    """Train, save and evaluate the model."""
+    args = parse_args()
+
+    # Show versions
+    print('Numpy', np.__version__)
+    print('Pandas', pd.__version__)
+    print('Sklearn', sklearn.__version__)
+
+    # Download necessary resources
+    print("\nDownloading NLTK resources...")
+    nltk.download('stopwords', quiet=True)
+    nltk.download('wordnet', quiet=True)
+
+    # Per-stage wall time, CPU time and peak memory, saved next to the model
+    profiler = StageProfiler(trace_memory=args.trace_memory)
+
+    if args.out_of_core:
+        model, vectorizer, y_test, y_pred = train_out_of_core(args, profiler)
+    else:
+        model, vectorizer, y_test, y_pred = train_in_memory(args, profiler)
+
+    # Save model + vectorizer
+    model_path = Path(args.model_path)
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with profiler.stage("serialization"):
+        with open(model_path, "wb") as f:
+            pickle.dump((model, vectorizer), f)
+
+    print(f"\nModel and vectorizer saved to: {model_path}")
+
+    # Evaluate
+    print("\nEvaluating model...")
+    with profiler.stage("evaluation"):
+        accuracy = accuracy_score(y_test, y_pred)
+        report = classification_report(y_test, y_pred, target_names=['Fake', 'True'])
+
+    print(f"\nAccuracy: {accuracy:.4f}")
+    print("\nClassification Report:")
+    print(report)
+
+    # Confusion matrix
+    print("\nGenerating confusion matrix...")
+    with profiler.stage("confusion_matrix"):
+        save_confusion_matrix(y_test, y_pred)
+    print("Confusion matrix saved to: confusion_matrix.png")
+
+    # Profile report
+    print("\nStage profile:")
+    profiler.print_summary()
+    report_path = profiler.write(
+        profile_path(model_path),
+        mode="out_of_core" if args.out_of_core else "in_memory",
+        model_path=str(model_path),
+        model_bytes=model_path.stat().st_size,
+        test_samples=int(len(y_test)),
+        accuracy=float(accuracy)
+    )
+    print(f"Profile report saved to: {report_path}")
+
+    print("\n✓ Training complete!")
+
+
+if __name__ == "__main__":
+    main()
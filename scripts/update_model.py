@@ -0,0 +1,283 @@
+"""
+Incremental model updates for the Fake News Detector.
+Reads a JSONL stream of labeled feedback, updates an incrementally
+trainable copy of the live classifier in mini-batches with partial_fit,
+writes a new versioned model artifact and atomically swaps it in at
+MODEL_PATH, where ModelService picks it up without a restart.
+
+Each feedback line is a JSON object such as
+    {"text": "...", "label": "fake"}
+with label "fake"/"true" (any case) or 0/1.
+"""
+import argparse
+import copy
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.config import config
+from src.utils.text_processor import TextProcessor
+
+CLASSES = np.array([0, 1])
+
+
+def parse_label(value: Any) -> Optional[int]:
+    """Map a feedback label to 0 (fake) or 1 (true), or None if unrecognized."""
+    if isinstance(value, str):
+        return {"fake": 0, "true": 1}.get(value.strip().lower())
+    if isinstance(value, int) and not isinstance(value, bool) and value in (0, 1):
+        return value
+    return None
+
+
+def iter_feedback(stream: TextIO, text_processor: TextProcessor) -> Iterator[Tuple[str, int]]:
+    """
+    Parse and clean feedback records, skipping invalid lines.
+
+    Yields:
+        Tuples of (cleaned text, label)
+    """
+    skipped = 0
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            label = parse_label(record.get("label"))
+            cleaned = text_processor.clean_text(record.get("text") or "")
+        except Exception:
+            label, cleaned = None, ""
+        if label is None or not cleaned:
+            skipped += 1
+            if skipped <= 10:
+                print(f"Warning: Skipping invalid feedback on line {line_number}")
+            continue
+        yield cleaned, label
+    if skipped:
+        print(f"Skipped {skipped} invalid feedback records")
+
+
+def iter_batches(records: Iterable[Tuple[str, int]], size: int) -> Iterator[Tuple[List[str], np.ndarray]]:
+    """Group (text, label) records into mini-batches of at most size records."""
+    texts: List[str] = []
+    labels: List[int] = []
+    for text, label in records:
+        texts.append(text)
+        labels.append(label)
+        if len(texts) == size:
+            yield texts, np.array(labels)
+            texts, labels = [], []
+    if texts:
+        yield texts, np.array(labels)
+
+
+def to_incremental(model: Any, learning_rate: float) -> Any:
+    """
+    Get a copy of a classifier that supports partial_fit.
+
+    Models that already support partial_fit (e.g. from out-of-core
+    training) are copied. A fitted linear model such as the default
+    LogisticRegression is converted to an SGD logistic regression
+    starting from the same weights, so it predicts exactly like the
+    original until the first update.
+
+    Raises:
+        ValueError: If the model is neither incremental nor linear
+    """
+    if hasattr(model, 'partial_fit'):
+        return copy.deepcopy(model)
+    if not hasattr(model, 'coef_'):
+        raise ValueError(f"Cannot update {type(model).__name__} incrementally")
+
+    incremental = SGDClassifier(
+        loss='log_loss',
+        learning_rate='constant',
+        eta0=learning_rate,
+        alpha=1e-5,
+        random_state=42
+    )
+    # partial_fit continues from existing coefficients when they are set
+    incremental.coef_ = model.coef_.copy()
+    incremental.intercept_ = model.intercept_.copy()
+    incremental.classes_ = model.classes_.copy()
+    incremental.t_ = 1.0
+    if hasattr(model, 'n_features_in_'):
+        incremental.n_features_in_ = model.n_features_in_
+    return incremental
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Write a file so readers see either the old or the complete new contents."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_manifest(versions_dir: Path) -> dict:
+    """Read the versions manifest, or start an empty one."""
+    manifest_path = versions_dir / "manifest.json"
+    if manifest_path.exists():
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {"baseline": None, "live": None, "versions": []}
+
+
+def record_baseline(model_path: Path, versions_dir: Path, manifest: dict) -> Path:
+    """
+    Find the artifact of the last full retrain.
+
+    If the live model is not the last artifact written by an update, it
+    came from a full retrain (scripts/train_model.py), so it is copied
+    into the versions directory and becomes the new drift baseline.
+
+    Returns:
+        Path of the baseline artifact
+    """
+    digest = file_digest(model_path)
+    baseline = manifest.get("baseline")
+    if manifest.get("live") != digest or baseline is None:
+        baseline_path = versions_dir / f"baseline-{digest[:12]}.pkl"
+        if not baseline_path.exists():
+            versions_dir.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(model_path, baseline_path)
+        manifest["baseline"] = {"path": baseline_path.name, "digest": digest}
+        manifest["live"] = digest
+        print(f"Recorded full-retrain baseline: {baseline_path}")
+    return versions_dir / manifest["baseline"]["path"]
+
+
+def accuracy_on(model: Any, vectorizer: Any, stream: TextIO, text_processor: TextProcessor,
+                batch_size: int) -> Tuple[int, int]:
+    """Count (correct, total) predictions of a model on a labeled JSONL stream."""
+    correct = total = 0
+    for texts, labels in iter_batches(iter_feedback(stream, text_processor), batch_size):
+        correct += int((model.predict(vectorizer.transform(texts)) == labels).sum())
+        total += len(labels)
+    return correct, total
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Update the model from labeled feedback.")
+    parser.add_argument("feedback", help="JSONL file of labeled feedback ('-' for stdin)")
+    parser.add_argument("--model-path", default=config.MODEL_PATH,
+                        help=f"Live model artifact to update and replace (default: {config.MODEL_PATH})")
+    parser.add_argument("--versions-dir", default=str(config.MODEL_VERSIONS_DIR),
+                        help=f"Directory for versioned artifacts (default: {config.MODEL_VERSIONS_DIR})")
+    parser.add_argument("--batch-size", type=int, default=config.UPDATE_BATCH_SIZE,
+                        help=f"Feedback records per update (default: {config.UPDATE_BATCH_SIZE})")
+    parser.add_argument("--learning-rate", type=float, default=config.UPDATE_LEARNING_RATE,
+                        help=f"SGD step size when converting a batch-trained model "
+                             f"(default: {config.UPDATE_LEARNING_RATE})")
+    parser.add_argument("--eval", default=None,
+                        help="Optional labeled JSONL file to compare against the baseline")
+    parser.add_argument("--no-publish", action="store_true",
+                        help="Write the new version without replacing the live model")
+    return parser.parse_args()
+
+
+def main():
+    """Apply the feedback stream and publish a new model version."""
+    args = parse_args()
+    model_path = Path(args.model_path)
+    versions_dir = Path(args.versions_dir)
+
+    with open(model_path, 'rb') as f:
+        model, vectorizer = pickle.load(f)
+
+    manifest = load_manifest(versions_dir)
+    baseline_path = record_baseline(model_path, versions_dir, manifest)
+    with open(baseline_path, 'rb') as f:
+        baseline_model, baseline_vectorizer = pickle.load(f)
+
+    updated = to_incremental(model, args.learning_rate)
+    text_processor = TextProcessor()
+
+    # Test-then-train: each batch is scored before the model learns from it
+    records = batches = 0
+    updated_correct = baseline_correct = 0
+    started = time.perf_counter()
+
+    stream = sys.stdin if args.feedback == '-' else open(args.feedback, 'r', encoding='utf-8')
+    try:
+        for texts, labels in iter_batches(iter_feedback(stream, text_processor), args.batch_size):
+            X = vectorizer.transform(texts)
+            updated_correct += int((updated.predict(X) == labels).sum())
+            baseline_correct += int((baseline_model.predict(baseline_vectorizer.transform(texts)) == labels).sum())
+            updated.partial_fit(X, labels, classes=CLASSES)
+            records += len(labels)
+            batches += 1
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    elapsed = time.perf_counter() - started
+    if records == 0:
+        print("No valid feedback records; model unchanged")
+        return
+
+    print(f"\nApplied {records} feedback records in {batches} batches")
+    print(f"Throughput: {records / elapsed:.0f} records/s ({elapsed:.2f}s)")
+    print(f"Prequential accuracy: updated {updated_correct / records:.4f}, "
+          f"baseline {baseline_correct / records:.4f}")
+
+    report = {"records": records, "batches": batches, "records_per_second": round(records / elapsed, 1)}
+    if args.eval:
+        with open(args.eval, 'r', encoding='utf-8') as f:
+            correct, total = accuracy_on(updated, vectorizer, f, text_processor, args.batch_size)
+        with open(args.eval, 'r', encoding='utf-8') as f:
+            base_correct, _ = accuracy_on(baseline_model, baseline_vectorizer, f, text_processor, args.batch_size)
+        if total:
+            drift = (correct - base_correct) / total
+            print(f"Eval accuracy: updated {correct / total:.4f}, baseline {base_correct / total:.4f} "
+                  f"(drift {drift:+.4f} on {total} records)")
+            report.update(eval_accuracy=correct / total, baseline_eval_accuracy=base_correct / total)
+
+    # Versioned artifact, then an atomic swap of the live model
+    data = pickle.dumps((updated, vectorizer))
+    digest = hashlib.sha256(data).hexdigest()
+    version = f"model-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}-{digest[:8]}"
+    atomic_write(versions_dir / f"{version}.pkl", data)
+    print(f"\nWrote model version: {versions_dir / (version + '.pkl')}")
+
+    manifest["versions"].append({
+        "version": version,
+        "digest": digest,
+        "parent": manifest.get("live"),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "published": not args.no_publish,
+        **report
+    })
+    if not args.no_publish:
+        atomic_write(model_path, data)
+        manifest["live"] = digest
+        print(f"Published to: {model_path}")
+    atomic_write(versions_dir / "manifest.json", json.dumps(manifest, indent=2).encode('utf-8'))
+
+
+if __name__ == "__main__":
+    main()
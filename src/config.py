@@ -22,19 +22,118 @@ class Config:
     if not os.path.exists(MODEL_PATH):
         MODEL_PATH = str(BASE_DIR / "fake_news_model.pkl")
     
+    # Online model updates (scripts/update_model.py)
+    # Every artifact written by an update is kept here; MODEL_PATH points at the live one
+    MODEL_VERSIONS_DIR = MODEL_DIR / "versions"
+    # Feedback records per partial_fit call
+    UPDATE_BATCH_SIZE = 256
+    # Constant SGD step size, kept small so corrections nudge rather than retrain
+    UPDATE_LEARNING_RATE = 0.01
+    # Seconds between checks of the model file for a new artifact (0 = never reload)
+    MODEL_RELOAD_INTERVAL = 5.0
+    
     # Data configuration
     DATA_DIR = SRC_DIR / "data"
     SAMPLES_PATH = str(DATA_DIR / "samples.json")
     
+    # Cache for derived training data (e.g. the cleaned corpus)
+    CACHE_DIR = BASE_DIR / "cache"
+    
     # ML Model hyperparameters
     MAX_FEATURES = 5000
     MIN_DF = 2
     MAX_DF = 0.95
     NGRAM_RANGE: Tuple[int, int] = (1, 2)
     
+    # Out-of-core training (scripts/train_model.py --out-of-core)
+    # Rows read from each CSV per chunk
+    OOC_CHUNK_SIZE = 10000
+    # Passes over the training data
+    OOC_EPOCHS = 5
+    # Size of the hashed feature space (stateless, no vocabulary to fit)
+    HASHING_N_FEATURES = 2 ** 20
+    # Share of rows held out for evaluation (assigned by text hash)
+    OOC_HOLDOUT_FRACTION = 0.2
+    
     # Text processing configuration
     MIN_WORD_LENGTH = 2
     
+    # Inference backend configuration
+    # Number of worker processes used for predictions (0 = score in-process)
+    INFERENCE_WORKERS = 0
+    # Maximum number of texts sent to a worker per task
+    INFERENCE_CHUNK_SIZE = 32
+    
+    # Near-duplicate prediction reuse
+    # Reuse the prediction of an earlier text whose cleaned token set is
+    # estimated (MinHash) to be at least DEDUP_THRESHOLD Jaccard-similar
+    DEDUP_ENABLED = False
+    DEDUP_THRESHOLD = 0.9
+    # MinHash signature length (more = more accurate, slower)
+    DEDUP_NUM_PERM = 128
+    # Signatures kept per index (least recently used are evicted);
+    # with the process-pool backend every worker keeps its own index
+    DEDUP_MAX_ENTRIES = 20000
+    
+    # Persistent prediction cache (SQLite, shared by all processes using the file)
+    PREDICTION_CACHE_ENABLED = False
+    PREDICTION_CACHE_PATH = CACHE_DIR / "predictions.sqlite3"
+    # Maximum cached predictions (least recently used are evicted)
+    PREDICTION_CACHE_MAX_ENTRIES = 200000
+    # Maximum seconds a cache write is buffered before it is committed
+    PREDICTION_CACHE_FLUSH_INTERVAL = 0.5
+    
+    # Admission control for prediction routes
+    # Requests are routed to the first lane whose max_chars fits the input;
+    # each lane has its own concurrency cap (max_in_flight), wait queue
+    # (max_queue) and, with the process-pool backend, optionally its own
+    # dedicated worker processes (workers, 0 = share the default pool)
+    PREDICTION_LANES: Tuple[dict, ...] = (
+        {"name": "short", "max_chars": 2000, "max_in_flight": 6, "max_queue": 32, "workers": 0},
+        {"name": "long", "max_chars": None, "max_in_flight": 2, "max_queue": 8, "workers": 1},
+    )
+    # Seconds a queued prediction may wait before it is rejected
+    PREDICTION_QUEUE_TIMEOUT = 2.0
+    # Retry-After hint (seconds) sent with 503 responses
+    RETRY_AFTER_SECONDS = 1
+    # Maximum characters per input text (None = unlimited)
+    MAX_INPUT_CHARS = None
+    
+    # Incremental as-you-type scoring sessions
+    # Maximum open sessions (the least recently used is closed beyond this)
+    SESSION_MAX_ACTIVE = 1000
+    # Seconds after which an unused session is closed
+    SESSION_IDLE_TIMEOUT = 600.0
+    # Seconds between keep-alive comments on session event streams
+    SESSION_EVENT_KEEPALIVE = 15.0
+    # Maximum concurrent session event streams (503 beyond this)
+    SESSION_MAX_EVENT_STREAMS = 256
+    
+    # Streaming /predict/stream feed scoring
+    # Maximum concurrent stream connections (503 beyond this)
+    STREAM_MAX_CONNECTIONS = 32
+    # Items a connection may have read but not yet delivered; a client that
+    # stops reading results is not read from either
+    STREAM_WINDOW = 256
+    # Texts from all streams are scored in batches of up to this many...
+    STREAM_MAX_BATCH = 64
+    # ...waiting at most this many seconds for a batch to fill up
+    STREAM_MAX_WAIT = 0.01
+    # Batches scored concurrently
+    STREAM_BATCH_WORKERS = 2
+    # Maximum texts queued for batching across all streams
+    STREAM_QUEUE_SIZE = 1024
+    # Seconds of silence after which a keep-alive line is sent
+    STREAM_KEEPALIVE = 15.0
+    
+    # Health check configuration
+    # Text scored by the periodic readiness canary
+    CANARY_TEXT = "Senate confirms new Federal Reserve chairman after lengthy debate"
+    # Seconds between canary predictions
+    READINESS_CHECK_INTERVAL = 10.0
+    # Lane saturation (in-flight + queued over capacity) above which /readyz fails
+    READINESS_MAX_SATURATION = 0.9
+    
     # UI Configuration - Streamlit
     STREAMLIT_PAGE_TITLE = "Fake News Detector"
     STREAMLIT_LAYOUT = "centered"
@@ -44,6 +143,24 @@ class Config:
     FLASK_PORT = 5000
     FLASK_DEBUG = False
     
+    # Router mode (src/ui/router_app.py) in front of several Flask nodes
+    ROUTER_HOST = "127.0.0.1"
+    ROUTER_PORT = 8000
+    # Base URLs of the backend nodes
+    ROUTER_BACKENDS: Tuple[str, ...] = ("http://127.0.0.1:5001", "http://127.0.0.1:5002")
+    # 'hash' (consistent hashing of the normalized text) or 'round_robin'
+    ROUTER_STRATEGY = "hash"
+    # Virtual nodes per backend on the hash ring
+    ROUTER_VNODES = 160
+    # Seconds to wait for a backend response
+    ROUTER_TIMEOUT = 10.0
+    # Seconds between backend health checks (0 = none; removed backends are
+    # then only re-probed by requests once no backend is left)
+    ROUTER_HEALTH_INTERVAL = 2.0
+    # Bearer token required to add or remove backends at runtime; if unset,
+    # only clients on the router's own machine may change them
+    ROUTER_ADMIN_TOKEN = os.environ.get("ROUTER_ADMIN_TOKEN") or None
+    
     # UI Theme colors
     PRIMARY_COLOR = "#6a0dad"
     SECONDARY_COLOR = "#bb86fc"
@@ -52,6 +169,13 @@ class Config:
     
     # Sample headlines configuration
     DEFAULT_SAMPLE_COUNT = 5
+    # Seconds between checks of samples.json for changes (0 = never reload)
+    SAMPLES_RELOAD_INTERVAL = 5.0
+    # Page sizes for cursor-paginated /samples responses
+    SAMPLES_PAGE_DEFAULT_LIMIT = 100
+    SAMPLES_PAGE_MAX_LIMIT = 1000
+    # Cache-Control header sent with /samples responses (revalidated via ETag)
+    SAMPLES_CACHE_CONTROL = "public, max-age=60"
     
     @classmethod
     def validate(cls) -> bool:
@@ -84,6 +208,58 @@ class Config:
         if len(cls.NGRAM_RANGE) != 2 or cls.NGRAM_RANGE[0] > cls.NGRAM_RANGE[1]:
             raise ValueError("NGRAM_RANGE must be a tuple (min, max) where min <= max")
         
+        if cls.OOC_CHUNK_SIZE <= 0 or cls.OOC_EPOCHS <= 0 or cls.HASHING_N_FEATURES <= 0:
+            raise ValueError("OOC_CHUNK_SIZE, OOC_EPOCHS and HASHING_N_FEATURES must be positive")
+        
+        if not (0 < cls.OOC_HOLDOUT_FRACTION < 1):
+            raise ValueError("OOC_HOLDOUT_FRACTION must be between 0 and 1")
+        
+        if cls.UPDATE_BATCH_SIZE <= 0 or cls.UPDATE_LEARNING_RATE <= 0:
+            raise ValueError("UPDATE_BATCH_SIZE and UPDATE_LEARNING_RATE must be positive")
+        
+        if cls.INFERENCE_WORKERS < 0:
+            raise ValueError("INFERENCE_WORKERS must be zero or positive")
+        
+        if cls.INFERENCE_CHUNK_SIZE <= 0:
+            raise ValueError("INFERENCE_CHUNK_SIZE must be positive")
+        
+        if not (0 < cls.DEDUP_THRESHOLD <= 1):
+            raise ValueError("DEDUP_THRESHOLD must be between 0 and 1")
+        
+        if cls.DEDUP_NUM_PERM <= 0 or cls.DEDUP_MAX_ENTRIES <= 0:
+            raise ValueError("DEDUP_NUM_PERM and DEDUP_MAX_ENTRIES must be positive")
+        
+        if cls.PREDICTION_CACHE_MAX_ENTRIES <= 0 or cls.PREDICTION_CACHE_FLUSH_INTERVAL <= 0:
+            raise ValueError("PREDICTION_CACHE_MAX_ENTRIES and PREDICTION_CACHE_FLUSH_INTERVAL must be positive")
+        
+        if sum(1 for lane in cls.PREDICTION_LANES if lane["max_chars"] is None) != 1:
+            raise ValueError("Exactly one prediction lane must have max_chars set to None")
+        
+        for lane in cls.PREDICTION_LANES:
+            if lane["max_in_flight"] <= 0:
+                raise ValueError(f"Lane '{lane['name']}' max_in_flight must be positive")
+            if lane["max_queue"] < 0:
+                raise ValueError(f"Lane '{lane['name']}' max_queue must be zero or positive")
+        
+        if cls.MAX_INPUT_CHARS is not None and cls.MAX_INPUT_CHARS <= 0:
+            raise ValueError("MAX_INPUT_CHARS must be positive or None")
+        
+        if min(cls.SESSION_MAX_ACTIVE, cls.SESSION_IDLE_TIMEOUT, cls.SESSION_MAX_EVENT_STREAMS) <= 0:
+            raise ValueError("SESSION_MAX_ACTIVE, SESSION_IDLE_TIMEOUT and SESSION_MAX_EVENT_STREAMS must be positive")
+        
+        if min(cls.STREAM_MAX_CONNECTIONS, cls.STREAM_WINDOW, cls.STREAM_MAX_BATCH,
+               cls.STREAM_BATCH_WORKERS, cls.STREAM_QUEUE_SIZE) <= 0:
+            raise ValueError("STREAM_* sizes must be positive")
+        
+        if cls.ROUTER_STRATEGY not in ("hash", "round_robin"):
+            raise ValueError("ROUTER_STRATEGY must be 'hash' or 'round_robin'")
+        
+        if cls.ROUTER_VNODES <= 0 or cls.ROUTER_TIMEOUT <= 0:
+            raise ValueError("ROUTER_VNODES and ROUTER_TIMEOUT must be positive")
+        
+        if cls.ROUTER_HEALTH_INTERVAL < 0:
+            raise ValueError("ROUTER_HEALTH_INTERVAL must be zero or positive")
+        
         return True
     
     @classmethod
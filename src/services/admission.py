@@ -0,0 +1,305 @@
+"""
+Admission control for prediction requests.
+Caps concurrent predictions, queues a bounded number of waiting
+requests with a deadline, and sheds the rest so accepted requests
+keep a bounded latency under overload. Requests are split into
+size-based lanes so short inputs never queue behind long ones.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Iterable, Iterator, List, Optional
+
+
+class OverloadedError(Exception):
+    """
+    Raised when a request cannot be admitted.
+
+    Attributes:
+        retry_after: Suggested number of seconds before the client retries
+    """
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Limits in-flight work with a bounded FIFO wait queue.
+
+    Requests beyond the concurrency cap wait in the queue until a slot
+    frees up or their deadline passes. When the queue itself is full,
+    requests are rejected immediately.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int,
+                 queue_timeout: float, retry_after: int = 1):
+        """
+        Initialize the admission controller.
+
+        Args:
+            max_in_flight: Maximum number of requests processed at once
+            max_queue: Maximum number of requests waiting for a slot
+            queue_timeout: Seconds a request may wait before it is shed
+            retry_after: Retry-After hint given to rejected clients, in seconds
+        """
+        if max_in_flight <= 0:
+            raise ValueError("max_in_flight must be positive")
+        if max_queue < 0:
+            raise ValueError("max_queue must be zero or positive")
+        if queue_timeout < 0:
+            raise ValueError("queue_timeout must be zero or positive")
+
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        """
+        Take a processing slot, waiting in the queue if necessary.
+
+        Args:
+            timeout: Maximum seconds to wait. If None, uses queue_timeout.
+
+        Raises:
+            OverloadedError: If the queue is full or the deadline passes
+        """
+        timeout = self.queue_timeout if timeout is None else timeout
+
+        with self._cond:
+            # Only take a free slot directly if nobody is queued ahead of us
+            if self._in_flight < self.max_in_flight and self._waiting == 0:
+                self._in_flight += 1
+                self._admitted += 1
+                return
+
+            if self._waiting >= self.max_queue:
+                self._rejected += 1
+                raise OverloadedError("Server is overloaded, request queue is full",
+                                      self.retry_after)
+
+            deadline = time.monotonic() + timeout
+            self._waiting += 1
+            try:
+                while self._in_flight >= self.max_in_flight:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timed_out += 1
+                        # Pass on a wakeup this request may have consumed
+                        self._cond.notify()
+                        raise OverloadedError("Server is overloaded, timed out waiting in queue",
+                                              self.retry_after)
+                    self._cond.wait(remaining)
+                self._in_flight += 1
+                self._admitted += 1
+            finally:
+                self._waiting -= 1
+
+    def release(self) -> None:
+        """Give back a processing slot and wake the next queued request."""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def admit(self, timeout: Optional[float] = None) -> Iterator[None]:
+        """
+        Context manager holding a processing slot for the enclosed block.
+
+        Raises:
+            OverloadedError: If the request cannot be admitted
+        """
+        self.acquire(timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @property
+    def saturation(self) -> float:
+        """Fraction of in-flight and queue capacity currently in use."""
+        capacity = self.max_in_flight + self.max_queue
+        return (self._in_flight + self._waiting) / capacity
+
+    @property
+    def stats(self) -> dict:
+        """Get current load and admission counters."""
+        with self._cond:
+            return {
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "max_in_flight": self.max_in_flight,
+                "max_queue": self.max_queue,
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out
+            }
+
+
+class LatencyTracker:
+    """
+    Records request latencies and reports percentiles.
+
+    Keeps a bounded window of the most recent samples so memory use is
+    constant no matter how many requests are served.
+    """
+
+    def __init__(self, window: int = 1024):
+        """
+        Initialize the latency tracker.
+
+        Args:
+            window: Number of most recent latencies kept for percentiles
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._count = 0
+        self._total = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Record one request latency in seconds."""
+        with self._lock:
+            self._samples.append(seconds)
+            self._count += 1
+            self._total += seconds
+
+    @property
+    def stats(self) -> dict:
+        """Get request count, mean and recent percentiles in milliseconds."""
+        with self._lock:
+            window = sorted(self._samples)
+            count, total = self._count, self._total
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not window:
+                return None
+            index = min(len(window) - 1, int(fraction * len(window)))
+            return round(window[index] * 1000, 3)
+
+        return {
+            "count": count,
+            "mean_ms": round(total / count * 1000, 3) if count else None,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99)
+        }
+
+
+class Lane:
+    """
+    A size class of prediction requests with its own admission limits.
+
+    Attributes:
+        name: Lane name (e.g. "short", "long")
+        max_chars: Largest input size routed to this lane (None = unbounded)
+        controller: Admission controller limiting this lane's concurrency
+        latency: Latency tracker for requests served in this lane
+    """
+
+    def __init__(self, name: str, max_chars: Optional[int],
+                 controller: AdmissionController):
+        self.name = name
+        self.max_chars = max_chars
+        self.controller = controller
+        self.latency = LatencyTracker()
+
+
+class LaneRouter:
+    """
+    Routes prediction requests to lanes by input size.
+
+    Each lane has its own concurrency limit and wait queue, so a burst of
+    long articles can only exhaust the long lane while short headlines
+    keep being served from theirs.
+    """
+
+    def __init__(self, lanes: List[Lane]):
+        """
+        Initialize the lane router.
+
+        Args:
+            lanes: Lanes to route between; exactly one must be unbounded
+        """
+        if not lanes:
+            raise ValueError("At least one lane is required")
+        if sum(1 for lane in lanes if lane.max_chars is None) != 1:
+            raise ValueError("Exactly one lane must have max_chars set to None")
+
+        # Bounded lanes by increasing size, then the catch-all lane
+        self.lanes = sorted(
+            lanes,
+            key=lambda lane: (lane.max_chars is None, lane.max_chars or 0)
+        )
+
+    @classmethod
+    def from_config(cls, lane_configs: Iterable[dict], queue_timeout: float,
+                    retry_after: int = 1) -> "LaneRouter":
+        """
+        Build a router from lane configuration dictionaries.
+
+        Args:
+            lane_configs: Dicts with name, max_chars, max_in_flight and max_queue
+            queue_timeout: Seconds a queued request may wait in any lane
+            retry_after: Retry-After hint given to rejected clients, in seconds
+        """
+        return cls([
+            Lane(
+                name=lane["name"],
+                max_chars=lane["max_chars"],
+                controller=AdmissionController(
+                    max_in_flight=lane["max_in_flight"],
+                    max_queue=lane["max_queue"],
+                    queue_timeout=queue_timeout,
+                    retry_after=retry_after
+                )
+            )
+            for lane in lane_configs
+        ])
+
+    def lane_for(self, size: int) -> Lane:
+        """Get the lane serving inputs of the given size in characters."""
+        for lane in self.lanes:
+            if lane.max_chars is None or size <= lane.max_chars:
+                return lane
+        return self.lanes[-1]
+
+    @contextmanager
+    def admit(self, lane: Lane) -> Iterator[Lane]:
+        """
+        Hold a slot in a lane and record the latency of the enclosed block.
+
+        Raises:
+            OverloadedError: If the lane cannot admit the request
+        """
+        start = time.perf_counter()
+        with lane.controller.admit():
+            try:
+                yield lane
+            finally:
+                lane.latency.record(time.perf_counter() - start)
+
+    @property
+    def saturation(self) -> float:
+        """Saturation of the busiest lane."""
+        return max(lane.controller.saturation for lane in self.lanes)
+
+    @property
+    def stats(self) -> dict:
+        """Get admission counters and latency percentiles per lane."""
+        return {
+            lane.name: {
+                "max_chars": lane.max_chars,
+                **lane.controller.stats,
+                "latency": lane.latency.stats
+            }
+            for lane in self.lanes
+        }
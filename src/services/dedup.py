@@ -0,0 +1,213 @@
+"""
+Near-duplicate detection for prediction reuse.
+Indexes MinHash signatures of cleaned token sets with locality-sensitive
+hashing, so a lightly edited copy of an already-scored article (e.g. the
+same wire story from another outlet) can reuse its prediction instead of
+being vectorized and scored again.
+"""
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Universal hashing h(x) = ((a * x + b) mod p) & MAX_HASH over 32-bit token hashes
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Pick an LSH layout of (bands, rows per band) for a similarity threshold.
+
+    Two signatures become candidates when they agree on every row of at
+    least one band, which happens with probability 1 - (1 - s^rows)^bands
+    for Jaccard similarity s. The layout whose S-curve midpoint
+    (1 / bands) ** (1 / rows) is closest to the threshold from below is
+    used, so near-threshold pairs are still found and then verified.
+    """
+    layouts = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    below = [(b, r) for b, r in layouts if (1 / b) ** (1 / r) <= threshold]
+    if not below:
+        return layouts[0]
+    return max(below, key=lambda layout: (1 / layout[0]) ** (1 / layout[1]))
+
+
+class MinHasher:
+    """Computes fixed-size MinHash signatures of token sets."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        """
+        Initialize the hasher.
+
+        Args:
+            num_perm: Number of hash functions (signature length)
+            seed: Seed for the hash function parameters; signatures are
+                only comparable between hashers with the same seed
+        """
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)[:, None]
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)[:, None]
+
+    def signature(self, tokens: Iterable[str]) -> Optional[np.ndarray]:
+        """
+        MinHash signature of a token set.
+
+        Token hashes use CRC32, so signatures are stable across processes.
+
+        Returns:
+            uint32 array of length num_perm, or None for an empty set
+        """
+        unique = set(tokens)
+        if not unique:
+            return None
+        hashes = np.fromiter(
+            (zlib.crc32(token.encode('utf-8')) for token in unique),
+            dtype=np.uint64, count=len(unique)
+        )[None, :]
+        permuted = np.bitwise_and((self._a * hashes + self._b) % _MERSENNE_PRIME, _MAX_HASH)
+        return permuted.min(axis=1).astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """
+    LRU-bounded MinHash/LSH index from token sets to stored values.
+
+    A lookup hashes the signature's bands into per-band buckets, then
+    verifies candidates by the share of matching signature slots (an
+    estimate of Jaccard similarity) and returns the best match at or
+    above the threshold. Once max_entries is reached the least recently
+    used entry is evicted. All methods are thread-safe.
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 128,
+                 max_entries: int = 20000, seed: int = 1):
+        """
+        Initialize the index.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity for a match
+            num_perm: MinHash signature length
+            max_entries: Maximum number of stored signatures
+            seed: MinHash seed
+        """
+        if not (0 < threshold <= 1):
+            raise ValueError("threshold must be between 0 and 1")
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._hasher = MinHasher(num_perm=num_perm, seed=seed)
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        # entry id -> (signature, band keys, value), least recently used first
+        self._entries: "OrderedDict[int, Tuple[np.ndarray, List[bytes], Any]]" = OrderedDict()
+        self._buckets: List[Dict[bytes, set]] = [{} for _ in range(self.bands)]
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._lookups = 0
+        self._hits = 0
+        self._evictions = 0
+
+    @property
+    def params(self) -> dict:
+        """Constructor arguments, for building an identical index elsewhere."""
+        return {
+            "threshold": self.threshold,
+            "num_perm": self._hasher.num_perm,
+            "max_entries": self.max_entries,
+        }
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        rows = self.rows
+        return [signature[i * rows:(i + 1) * rows].tobytes() for i in range(self.bands)]
+
+    def signature(self, tokens: Iterable[str]) -> Optional[np.ndarray]:
+        """MinHash signature of a token set (None if empty)."""
+        return self._hasher.signature(tokens)
+
+    def lookup(self, signature: Optional[np.ndarray]) -> Optional[Any]:
+        """
+        Find the stored value of the most similar indexed token set.
+
+        Args:
+            signature: Signature from signature(); None never matches
+
+        Returns:
+            The matching value, or None if nothing is similar enough
+        """
+        if signature is None:
+            return None
+        band_keys = self._band_keys(signature)
+
+        with self._lock:
+            self._lookups += 1
+            candidates = set()
+            for bucket, key in zip(self._buckets, band_keys):
+                candidates.update(bucket.get(key, ()))
+
+            best_id, best_similarity = None, self.threshold
+            for entry_id in candidates:
+                similarity = float(np.count_nonzero(self._entries[entry_id][0] == signature)) / len(signature)
+                if similarity >= best_similarity:
+                    best_id, best_similarity = entry_id, similarity
+            if best_id is None:
+                return None
+
+            self._hits += 1
+            self._entries.move_to_end(best_id)
+            return self._entries[best_id][2]
+
+    def add(self, signature: Optional[np.ndarray], value: Any) -> None:
+        """Index a signature with its value, evicting the LRU entry when full."""
+        if signature is None:
+            return
+        band_keys = self._band_keys(signature)
+
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (signature, band_keys, value)
+            for bucket, key in zip(self._buckets, band_keys):
+                bucket.setdefault(key, set()).add(entry_id)
+
+            while len(self._entries) > self.max_entries:
+                old_id, (_, old_keys, _) = self._entries.popitem(last=False)
+                for bucket, key in zip(self._buckets, old_keys):
+                    ids = bucket[key]
+                    ids.discard(old_id)
+                    if not ids:
+                        del bucket[key]
+                self._evictions += 1
+
+    def record_reuse(self, count: int = 1) -> None:
+        """Count reuses found outside the index (e.g. copies within one batch)."""
+        with self._lock:
+            self._hits += count
+
+    def clear(self) -> None:
+        """Drop all entries (e.g. after the model changed); counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._buckets = [{} for _ in range(self.bands)]
+
+    @property
+    def stats(self) -> dict:
+        """Lookup, reuse and eviction counters plus current size."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "bands": self.bands,
+                "rows": self.rows,
+                "lookups": self._lookups,
+                "reused": self._hits,
+                "evictions": self._evictions,
+                "reuse_rate": self._hits / self._lookups if self._lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
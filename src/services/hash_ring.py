@@ -0,0 +1,122 @@
+"""
+Consistent hashing for routing predictions across inference nodes.
+Maps request texts onto a ring of virtual nodes, so the same text always
+reaches the same backend (and its caches), and adding or removing a
+backend only moves the keys that backend gains or loses.
+"""
+import bisect
+import hashlib
+import threading
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+def routing_key(text: str) -> str:
+    """
+    Normalize a text for routing.
+
+    Case and whitespace differences are ignored, so trivially different
+    copies of a text land on the same node. This is much cheaper than
+    the full TextProcessor cleaning, which the backend does anyway.
+    """
+    return " ".join(text.lower().split())
+
+
+def _hash(value: str) -> int:
+    """Stable 64-bit hash (Python's hash() is salted per process)."""
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class HashRing:
+    """
+    Consistent hash ring with virtual nodes.
+
+    Every node is placed on the ring vnodes times, which spreads keys
+    evenly; a key belongs to the first virtual node clockwise from its
+    hash. Methods are thread-safe.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 160):
+        """
+        Initialize the ring.
+
+        Args:
+            nodes: Initial node names (e.g. backend URLs)
+            vnodes: Virtual nodes per node
+        """
+        if vnodes <= 0:
+            raise ValueError("vnodes must be positive")
+
+        self.vnodes = vnodes
+        self._points: List[Tuple[int, str]] = []
+        self._hashes: List[int] = []
+        self._nodes: set = set()
+        self._lock = threading.Lock()
+        for node in nodes:
+            self.add_node(node)
+
+    def add_node(self, node: str) -> bool:
+        """
+        Place a node on the ring.
+
+        Returns:
+            bool: False if the node was already present
+        """
+        with self._lock:
+            if node in self._nodes:
+                return False
+            self._nodes.add(node)
+            points = self._points + [(_hash(f"{node}#{i}"), node) for i in range(self.vnodes)]
+            points.sort()
+            self._points = points
+            self._hashes = [point for point, _ in points]
+            return True
+
+    def remove_node(self, node: str) -> bool:
+        """
+        Take a node off the ring; its keys move to the next nodes clockwise.
+
+        Returns:
+            bool: False if the node was not present
+        """
+        with self._lock:
+            if node not in self._nodes:
+                return False
+            self._nodes.discard(node)
+            self._points = [point for point in self._points if point[1] != node]
+            self._hashes = [point for point, _ in self._points]
+            return True
+
+    def node_for(self, key: str) -> Optional[str]:
+        """Node owning a key (None if the ring is empty)."""
+        return next(self.iter_nodes(key), None)
+
+    def iter_nodes(self, key: str) -> Iterator[str]:
+        """
+        Distinct nodes in ring order starting at the key's owner.
+
+        Used for failover: if the owner is unreachable, the next node is
+        the one that takes over the key once the owner is removed.
+        """
+        with self._lock:
+            points, hashes, count = self._points, self._hashes, len(self._nodes)
+        if not points:
+            return
+
+        start = bisect.bisect(hashes, _hash(key)) % len(points)
+        seen = set()
+        for offset in range(len(points)):
+            node = points[(start + offset) % len(points)][1]
+            if node not in seen:
+                seen.add(node)
+                yield node
+                if len(seen) == count:
+                    return
+
+    @property
+    def nodes(self) -> List[str]:
+        """Nodes currently on the ring, sorted."""
+        with self._lock:
+            return sorted(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
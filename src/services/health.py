@@ -0,0 +1,109 @@
+"""
+Readiness monitoring for the prediction service.
+Runs a periodic canary prediction in the background and caches the
+outcome, so readiness probes never touch the model themselves.
+"""
+import threading
+import time
+from typing import Any, Optional, Sequence, Tuple
+
+
+class ReadinessMonitor:
+    """
+    Periodically checks that the model can actually produce predictions.
+
+    The latest canary outcome is stored as a single immutable tuple, so
+    probes read it without locking or doing any work of their own.
+    """
+
+    def __init__(self, model_service: Any, canary_text: str, interval: float,
+                 lanes: Sequence[Optional[str]] = (None,)):
+        """
+        Initialize the readiness monitor.
+
+        Args:
+            model_service: ModelService used for the canary prediction
+            canary_text: Text scored by every canary check
+            interval: Seconds between canary checks
+            lanes: Lanes the canary is scored in, so each lane's worker
+                pool is checked (None is the default backend)
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+
+        self.model_service = model_service
+        self.canary_text = canary_text
+        self.interval = interval
+        self.lanes = list(lanes)
+        # (ok, error, latency in seconds, monotonic time of the check)
+        self._status: Tuple[bool, Optional[str], Optional[float], Optional[float]] = (
+            False, "Canary prediction has not run yet", None, None
+        )
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> bool:
+        """
+        Run one canary prediction and store its outcome.
+
+        The canary goes through the serving backend (worker pools
+        included) once per lane, with the prediction cache and
+        near-duplicate index bypassed so the model itself is exercised.
+
+        Returns:
+            bool: True if the canary prediction succeeded
+        """
+        start = time.perf_counter()
+        try:
+            ok, error = True, None
+            for lane in self.lanes:
+                result = self.model_service.predict(self.canary_text, lane=lane, bypass_cache=True)
+                if not result.is_valid:
+                    ok = False
+                    error = f"{result.error} (lane {lane})" if lane is not None else result.error
+                    break
+        except Exception as e:
+            ok, error = False, f"Canary prediction failed: {str(e)}"
+        latency = time.perf_counter() - start
+
+        self._status = (ok, error, latency, time.monotonic())
+        return ok
+
+    def _run(self) -> None:
+        """Background loop running the canary until stopped."""
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        """Start the background canary thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="readiness-canary", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background canary thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def is_healthy(self) -> bool:
+        """Check that the last canary succeeded and is recent enough to trust."""
+        ok, _, _, checked_at = self._status
+        # Results older than a few intervals mean the canary loop is stuck
+        return ok and checked_at is not None and time.monotonic() - checked_at <= 3 * self.interval
+
+    @property
+    def status(self) -> dict:
+        """Get the cached outcome of the last canary prediction."""
+        ok, error, latency, checked_at = self._status
+        return {
+            "canary_ok": ok,
+            "canary_error": error,
+            "canary_latency_ms": round(latency * 1000, 3) if latency is not None else None,
+            "canary_age_seconds": round(time.monotonic() - checked_at, 3) if checked_at is not None else None
+        }
@@ -0,0 +1,230 @@
+"""
+Process-pool inference backend for the model service.
+Scores batches in worker processes that each hold a loaded model,
+so concurrent requests are not serialized on the GIL.
+"""
+import multiprocessing
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+# Result codes exchanged with the workers
+_CODE_ERROR = -1
+_CODE_FAKE = 0
+_CODE_TRUE = 1
+
+# Model service owned by each worker process
+_worker_service = None
+
+
+def _init_worker(model_path: str, dedup: Optional[dict] = None,
+                 prediction_cache: Optional[dict] = None) -> None:
+    """Load the model once when a worker process starts."""
+    global _worker_service
+    from src.services.model_service import ModelService
+
+    _worker_service = ModelService(model_path)
+    _worker_service.load_model()
+    if dedup is not None:
+        _worker_service.enable_dedup(**dedup)
+    if prediction_cache is not None:
+        _worker_service.enable_prediction_cache(**prediction_cache)
+
+
+def _ping() -> bool:
+    """No-op task used to start workers ahead of the first request."""
+    return _worker_service is not None
+
+
+def _score_chunk(texts: List[str], bypass_cache: bool = False) -> Tuple[bytes, bytes, Dict[int, str], Dict[str, int]]:
+    """
+    Score a chunk of texts inside a worker process.
+
+    Results are packed into two flat arrays (result code and confidence)
+    plus a sparse map of error messages, which is much cheaper to pickle
+    than a list of result objects. The last item is how much the worker's
+    reuse counters (near-duplicate index, prediction cache) grew during
+    this chunk. With bypass_cache, every text is scored by the model.
+    """
+    before = _worker_service.reuse_counters
+    codes = array('b')
+    confidences = array('d')
+    errors: Dict[int, str] = {}
+
+    for i, result in enumerate(_worker_service._predict_local(texts, bypass_cache=bypass_cache)):
+        if result.error is not None:
+            codes.append(_CODE_ERROR)
+            errors[i] = result.error
+        else:
+            codes.append(_CODE_FAKE if result.is_fake else _CODE_TRUE)
+        confidences.append(result.confidence)
+
+    after = _worker_service.reuse_counters
+    counters = {name: value - before[name] for name, value in after.items() if value != before[name]}
+    return codes.tobytes(), confidences.tobytes(), errors, counters
+
+
+class InferencePool:
+    """
+    Pool of worker processes that run model predictions.
+
+    Batches are split into chunks and scored in parallel; results are
+    returned in input order. If a worker crashes, the pool is rebuilt
+    and the batch is retried once.
+    """
+
+    def __init__(self, model_path: str, workers: int, chunk_size: int = 32,
+                 dedup: Optional[dict] = None, prediction_cache: Optional[dict] = None):
+        """
+        Initialize the inference pool.
+
+        Args:
+            model_path: Path to model pickle file loaded by every worker
+            workers: Number of worker processes
+            chunk_size: Maximum number of texts sent to a worker per task
+            dedup: Optional ModelService.enable_dedup arguments; each worker
+                then keeps its own near-duplicate index
+            prediction_cache: Optional ModelService.enable_prediction_cache
+                arguments; workers then share the persistent cache file
+        """
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
+        self.model_path = model_path
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._restarts = 0
+        self.dedup = dedup
+        self.prediction_cache = prediction_cache
+        self._counters: Dict[str, int] = {}
+
+    def start(self) -> None:
+        """Start the worker processes and wait until they have loaded the model."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._create_executor()
+            executor = self._executor
+
+        # Submitting one task per worker spawns the full pool up front
+        futures = [executor.submit(_ping) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        """Create a fresh executor whose workers preload the model."""
+        # Spawn avoids forking a multi-threaded server process
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.model_path, self.dedup, self.prediction_cache)
+        )
+
+    def _restart(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """Replace a broken executor, unless another thread already did."""
+        with self._lock:
+            if self._executor is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._create_executor()
+                self._restarts += 1
+            return self._executor
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Return the running executor, starting one if needed."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._create_executor()
+            return self._executor
+
+    def predict(self, texts: List[str], bypass_cache: bool = False) -> list:
+        """
+        Score texts in the worker processes.
+
+        Args:
+            texts: List of raw news texts to classify
+            bypass_cache: Have the workers skip their prediction cache and
+                near-duplicate index
+
+        Returns:
+            List of PredictionResult objects, in input order
+        """
+        executor = self._get_executor()
+        try:
+            return self._run(executor, texts, bypass_cache)
+        except BrokenProcessPool:
+            # A worker died mid-batch; rebuild the pool and retry once
+            return self._run(self._restart(executor), texts, bypass_cache)
+
+    def _run(self, executor: ProcessPoolExecutor, texts: List[str], bypass_cache: bool = False) -> list:
+        """Submit texts in chunks and unpack the results in order."""
+        from src.services.model_service import ModelService, PredictionResult
+
+        futures = [
+            executor.submit(_score_chunk, texts[start:start + self.chunk_size], bypass_cache)
+            for start in range(0, len(texts), self.chunk_size)
+        ]
+
+        results = []
+        for future in futures:
+            raw_codes, raw_confidences, errors, counters = future.result()
+            if counters:
+                with self._lock:
+                    for name, value in counters.items():
+                        self._counters[name] = self._counters.get(name, 0) + value
+            codes = array('b')
+            codes.frombytes(raw_codes)
+            confidences = array('d')
+            confidences.frombytes(raw_confidences)
+
+            for i, code in enumerate(codes):
+                if code == _CODE_ERROR:
+                    results.append(ModelService._error_result(errors[i]))
+                else:
+                    results.append(PredictionResult(
+                        label="FAKE" if code == _CODE_FAKE else "TRUE",
+                        confidence=confidences[i],
+                        is_fake=code == _CODE_FAKE
+                    ))
+
+        return results
+
+    def reload(self) -> None:
+        """
+        Replace the workers with fresh ones that load the current model file.
+
+        The new workers are started before they take over, and tasks
+        already submitted to the old workers still complete.
+        """
+        replacement = self._create_executor()
+        futures = [replacement.submit(_ping) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+        with self._lock:
+            old, self._executor = self._executor, replacement
+        if old is not None:
+            old.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        """Stop all worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @property
+    def restarts(self) -> int:
+        """Number of times the pool was rebuilt after a worker crash."""
+        return self._restarts
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        """Reuse counters summed over all workers (see ModelService.reuse_counters)."""
+        with self._lock:
+            return dict(self._counters)
@@ -1,12 +1,19 @@
 """
 Model service for loading ML model and making predictions.
-Handles model caching, text preprocessing, and prediction generation.
+Handles model caching, hot reloading, text preprocessing, and
+prediction generation.
 """
+import hashlib
+import os
 import pickle
+import threading
+import time
 from dataclasses import dataclass
-from typing import List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 from pathlib import Path
 from src.config import config
+from src.services.dedup import NearDuplicateIndex
+from src.services.prediction_cache import PredictionCache
 from src.utils.text_processor import TextProcessor
 
 
@@ -35,6 +42,16 @@ class PredictionResult:
     def is_valid(self) -> bool:
         """Check if this is a valid prediction (no error)."""
         return self.error is None
+    
+    def to_dict(self) -> dict:
+        """Convert the prediction to a JSON-serializable dictionary."""
+        if not self.is_valid:
+            return {"error": self.error}
+        return {
+            "label": self.label,
+            "confidence": self.confidence,
+            "is_fake": self.is_fake
+        }
 
 
 class ModelService:
@@ -54,19 +71,40 @@ class ModelService:
             model_path: Path to model pickle file. If None, uses config default.
         """
         self.model_path = model_path or config.get_model_path()
-        self._model: Optional[Any] = None
-        self._vectorizer: Optional[Any] = None
+        # (model, vectorizer), replaced as one object so a reload never
+        # pairs a new model with an old vectorizer
+        self._bundle: Optional[Tuple[Any, Any]] = None
         self._text_processor = TextProcessor()
         self._loaded = False
+        self._pool: Optional[Any] = None
+        self._lane_pools: Dict[str, Any] = {}
+        self._model_version: Optional[str] = None
+        self._load_listeners: List[Callable[[], None]] = []
+        self._load_lock = threading.RLock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._last_check = 0.0
+        self._reload_stop = threading.Event()
+        self._reload_thread: Optional[threading.Thread] = None
+        self._dedup: Optional[NearDuplicateIndex] = None
+        self._cache: Optional[PredictionCache] = None
     
     def load_model(self) -> None:
         """
         Load the ML model and vectorizer from pickle file.
         
+        The new model and vectorizer are validated before they replace the
+        current ones, so a failed load leaves the previous model serving.
+        Load listeners run once the new model is in place.
+        
         Raises:
             FileNotFoundError: If model file doesn't exist
             ValueError: If model file is corrupted or invalid
         """
+        self._load_bundle()
+        self._notify_load_listeners()
+    
+    def _load_bundle(self) -> None:
+        """Load and swap in the model and vectorizer without notifying listeners."""
         model_file = Path(self.model_path)
         
         if not model_file.exists():
@@ -75,135 +113,571 @@ class ModelService:
                 "Please train the model first using scripts/train_model.py"
             )
         
+        with self._load_lock:
+            try:
+                # Stat before reading so a replacement written meanwhile is seen next check
+                stat = model_file.stat()
+                with open(model_file, 'rb') as f:
+                    data = f.read()
+                model, vectorizer = pickle.loads(data)
+                
+                # Validate loaded objects
+                if not hasattr(model, 'predict'):
+                    raise ValueError("Loaded model doesn't have predict method")
+                
+                if not hasattr(vectorizer, 'transform'):
+                    raise ValueError("Loaded vectorizer doesn't have transform method")
+                
+                self._bundle = (model, vectorizer)
+                self._signature = (stat.st_mtime_ns, stat.st_size)
+                # Derived from the content, so copies of the same artifact
+                # (redeploys, other paths) share cached predictions
+                self._model_version = hashlib.sha1(data).hexdigest()[:12]
+                self._loaded = True
+                # Forget the previous model's predictions before any load
+                # listener (e.g. sample rescoring) predicts again
+                if self._dedup is not None:
+                    self._dedup.clear()
+                
+            except pickle.UnpicklingError as e:
+                raise ValueError(f"Corrupted model file: {e}")
+            except Exception as e:
+                raise ValueError(f"Error loading model: {e}")
+    
+    def _notify_load_listeners(self) -> None:
+        """Run every load listener."""
+        for listener in list(self._load_listeners):
+            listener()
+    
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        """Get the model file's (mtime in ns, size), or None if it is missing."""
         try:
-            with open(model_file, 'rb') as f:
-                self._model, self._vectorizer = pickle.load(f)
-            
-            # Validate loaded objects
-            if not hasattr(self._model, 'predict'):
-                raise ValueError("Loaded model doesn't have predict method")
-            
-            if not hasattr(self._vectorizer, 'transform'):
-                raise ValueError("Loaded vectorizer doesn't have transform method")
-            
-            self._loaded = True
+            stat = os.stat(self.model_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def check_for_updates(self, min_interval: Optional[float] = None) -> bool:
+        """
+        Reload the model if its file changed since it was last loaded.
+        
+        Change detection only compares the file's mtime and size, and runs
+        at most once per min_interval seconds. Artifacts should be replaced
+        atomically (written elsewhere, then renamed over the model path), as
+        scripts/update_model.py does. Worker pools are restarted so they
+        load the new artifact too.
+        
+        Args:
+            min_interval: Minimum seconds between checks. If None, uses config default.
             
-        except pickle.UnpicklingError as e:
-            raise ValueError(f"Corrupted model file: {e}")
-        except Exception as e:
-            raise ValueError(f"Error loading model: {e}")
+        Returns:
+            bool: True if a new model was loaded
+        """
+        if min_interval is None:
+            min_interval = config.MODEL_RELOAD_INTERVAL
+        
+        now = time.monotonic()
+        if not self._loaded or now - self._last_check < min_interval:
+            return False
+        self._last_check = now
+        
+        signature = self._file_signature()
+        if signature is None or signature == self._signature:
+            return False
+        
+        # Swap the worker pools before listeners (e.g. sample rescoring)
+        # predict with the new model
+        self._load_bundle()
+        for pool in [self._pool, *self._lane_pools.values()]:
+            if pool is not None:
+                pool.reload()
+        self._notify_load_listeners()
+        return True
+    
+    def start_auto_reload(self, interval: Optional[float] = None) -> None:
+        """
+        Watch the model file from a background thread.
+        
+        New artifacts are loaded on that thread and swapped in atomically,
+        so predictions keep being served by the old model until then.
+        
+        Args:
+            interval: Seconds between change checks. If None, uses config default.
+        """
+        interval = config.MODEL_RELOAD_INTERVAL if interval is None else interval
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if self._reload_thread is not None and self._reload_thread.is_alive():
+            return
+        
+        self._ensure_loaded()
+        
+        def watch():
+            while not self._reload_stop.wait(interval):
+                try:
+                    self.check_for_updates(min_interval=0)
+                except Exception as e:
+                    print(f"Error reloading model: {e}")
+        
+        self._reload_stop.clear()
+        self._reload_thread = threading.Thread(target=watch, name="model-reload", daemon=True)
+        self._reload_thread.start()
+    
+    def stop_auto_reload(self) -> None:
+        """Stop the background model file watcher."""
+        self._reload_stop.set()
+        if self._reload_thread is not None:
+            self._reload_thread.join()
+            self._reload_thread = None
+    
+    def add_load_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Register a callback run after every successful model load.
+        
+        Args:
+            listener: Callable taking no arguments
+        """
+        if listener not in self._load_listeners:
+            self._load_listeners.append(listener)
     
     def _ensure_loaded(self) -> None:
         """Ensure model is loaded before making predictions."""
         if not self._loaded:
             self.load_model()
     
-    def predict(self, text: str) -> PredictionResult:
+    @staticmethod
+    def _error_result(message: str) -> PredictionResult:
+        """Build a PredictionResult describing a failed prediction."""
+        return PredictionResult(
+            label="ERROR",
+            confidence=0.0,
+            is_fake=False,
+            error=message
+        )
+    
+    def predict(self, text: str, lane: Optional[str] = None, bypass_cache: bool = False) -> PredictionResult:
         """
         Predict if a news text is fake or true.
         
         Args:
             text: Raw news text to classify
+            lane: Optional size lane whose dedicated workers should score the text
+            bypass_cache: Score with the model even if the prediction cache or
+                near-duplicate index has an answer (e.g. for health checks)
             
         Returns:
             PredictionResult with label, confidence, and metadata
         """
-        try:
+        return self.predict_batch([text], lane=lane, bypass_cache=bypass_cache)[0]
+    
+    def predict_batch(self, texts: List[str], lane: Optional[str] = None,
+                      bypass_cache: bool = False) -> List[PredictionResult]:
+        """
+        Predict multiple news texts at once.
+        
+        Texts are vectorized and scored together. When the process-pool
+        backend is enabled the batch is scored by the worker processes,
+        using the lane's dedicated pool if it has one.
+        
+        Args:
+            texts: List of raw news texts to classify
+            lane: Optional size lane whose dedicated workers should score the texts
+            bypass_cache: Score every text with the model, without reading or
+                filling the prediction cache and near-duplicate index
+            
+        Returns:
+            List of PredictionResult objects, in input order
+        """
+        if not texts:
+            return []
+        
+        pool = self._lane_pools.get(lane, self._pool)
+        if pool is not None:
+            try:
+                return pool.predict(texts, bypass_cache=bypass_cache)
+            except Exception as e:
+                return [self._error_result(f"Prediction failed: {str(e)}") for _ in texts]
+        
+        return self._predict_local(texts, bypass_cache=bypass_cache)
+    
+    def _predict_local(self, texts: List[str], bypass_cache: bool = False) -> List[PredictionResult]:
+        """
+        Score a batch of texts in the current process.
+        
+        Cleaned texts are looked up in the persistent prediction cache
+        first, then in the near-duplicate index; only the rest are scored.
+        
+        Args:
+            texts: List of raw news texts to classify
+            bypass_cache: Skip the prediction cache and near-duplicate index
+            
+        Returns:
+            List of PredictionResult objects, in input order
+        """
+        results: List[Optional[PredictionResult]] = [None] * len(texts)
+        cleaned: List[Tuple[int, str]] = []
+        
+        for i, text in enumerate(texts):
             # Validate input
             if not text or not text.strip():
-                return PredictionResult(
-                    label="ERROR",
-                    confidence=0.0,
-                    is_fake=False,
-                    error="Empty text provided"
-                )
-            
-            # Ensure model is loaded
-            self._ensure_loaded()
+                results[i] = self._error_result("Empty text provided")
+                continue
             
             # Preprocess text
-            cleaned_text = self._text_processor.clean_text(text)
+            try:
+                cleaned_text = self._text_processor.clean_text(text)
+            except ValueError as e:
+                results[i] = self._error_result(str(e))
+                continue
+            except Exception as e:
+                results[i] = self._error_result(f"Prediction failed: {str(e)}")
+                continue
             
             # Check if cleaned text is empty
             if not cleaned_text:
-                return PredictionResult(
-                    label="ERROR",
-                    confidence=0.0,
-                    is_fake=False,
-                    error="Text contains no valid words after preprocessing"
+                results[i] = self._error_result(
+                    "Text contains no valid words after preprocessing"
                 )
+                continue
             
-            # Vectorize
-            vectorized = self._vectorizer.transform([cleaned_text])
-            
-            # Predict
-            prediction = self._model.predict(vectorized)[0]
-            probabilities = self._model.predict_proba(vectorized)[0]
-            
-            # Format result
-            label = "TRUE" if prediction == 1 else "FAKE"
-            confidence = float(max(probabilities))
-            is_fake = prediction == 0
+            cleaned.append((i, cleaned_text))
+        
+        cache = self._cache if not bypass_cache else None
+        version = self._model_version
+        if cache is not None and version is not None and cleaned:
+            cached = cache.get_many(version, [cleaned_text for _, cleaned_text in cleaned])
+            for (i, _), prediction in zip(cleaned, cached):
+                if prediction is not None:
+                    results[i] = PredictionResult(*prediction)
+            cleaned = [item for item, prediction in zip(cleaned, cached) if prediction is None]
+        
+        pending_indices: List[int] = []
+        pending_texts: List[str] = []
+        dedup = self._dedup if not bypass_cache else None
+        pending_signatures: list = []
+        # Near-duplicates within this batch: index of pending texts, and
+        # (result index, pending position) pairs that copy an earlier text
+        batch_index = NearDuplicateIndex(**dedup.params) if dedup is not None else None
+        copies: List[Tuple[int, int]] = []
+        
+        for i, cleaned_text in cleaned:
+            if dedup is not None:
+                signature = dedup.signature(cleaned_text.split())
+                previous = dedup.lookup(signature)
+                if previous is not None:
+                    results[i] = PredictionResult(*previous)
+                    continue
+                position = batch_index.lookup(signature)
+                if position is not None:
+                    copies.append((i, position))
+                    continue
+                batch_index.add(signature, len(pending_texts))
+                pending_signatures.append(signature)
             
-            return PredictionResult(
-                label=label,
-                confidence=confidence,
-                is_fake=is_fake
-            )
+            pending_indices.append(i)
+            pending_texts.append(cleaned_text)
+        
+        if pending_texts:
+            try:
+                # Ensure model is loaded
+                self._ensure_loaded()
+                
+                version = self._model_version
+                scored = self._score_cleaned(pending_texts)
+                for i, (label, confidence, is_fake) in zip(pending_indices, scored):
+                    results[i] = PredictionResult(
+                        label=label,
+                        confidence=confidence,
+                        is_fake=is_fake
+                    )
+                if dedup is not None:
+                    # Skip indexing if a reload (which clears the index) raced with scoring
+                    if self._model_version == version:
+                        for signature, prediction in zip(pending_signatures, scored):
+                            dedup.add(signature, prediction)
+                    for i, position in copies:
+                        results[i] = PredictionResult(*scored[position])
+                    dedup.record_reuse(len(copies))
+                # Skip storing if a reload raced with scoring
+                if cache is not None and self._model_version == version:
+                    cache.put_many(version, list(zip(pending_texts, scored)))
+            except ValueError as e:
+                for i in pending_indices + [i for i, _ in copies]:
+                    results[i] = self._error_result(str(e))
+            except Exception as e:
+                for i in pending_indices + [i for i, _ in copies]:
+                    results[i] = self._error_result(f"Prediction failed: {str(e)}")
+        
+        return results
+    
+    def _score_cleaned(self, cleaned_texts: List[str]) -> List[Tuple[str, float, bool]]:
+        """
+        Vectorize and classify already-cleaned texts in one pass.
+        
+        Args:
+            cleaned_texts: Non-empty cleaned texts
             
-        except ValueError as e:
-            # Re-raise ValueError (from text processor or validation)
-            return PredictionResult(
-                label="ERROR",
-                confidence=0.0,
-                is_fake=False,
-                error=str(e)
-            )
-        except Exception as e:
-            # Catch any other errors
-            return PredictionResult(
-                label="ERROR",
-                confidence=0.0,
-                is_fake=False,
-                error=f"Prediction failed: {str(e)}"
-            )
+        Returns:
+            List of (label, confidence, is_fake) tuples
+        """
+        # Use one model/vectorizer pair even if a reload happens meanwhile
+        model, vectorizer = self._bundle
+        
+        # Vectorize
+        vectorized = vectorizer.transform(cleaned_texts)
+        
+        return self.classify_vectors(model, vectorized)
     
-    def predict_batch(self, texts: List[str]) -> List[PredictionResult]:
+    @staticmethod
+    def classify_vectors(model: Any, vectorized: Any) -> List[Tuple[str, float, bool]]:
         """
-        Predict multiple news texts at once.
+        Classify texts already vectorized with the model's vectorizer.
+        
+        Lets callers run vectorization and scoring as separate steps,
+        with a (model, vectorizer) pair taken from model_snapshot().
         
         Args:
-            texts: List of raw news texts to classify
+            model: Classifier from model_snapshot()
+            vectorized: Feature matrix from the matching vectorizer
             
         Returns:
-            List of PredictionResult objects
+            List of (label, confidence, is_fake) tuples
         """
-        if not texts:
-            return []
+        # Predict
+        probabilities = model.predict_proba(vectorized)
+        best = probabilities.argmax(axis=1)
+        classes = model.classes_
         
-        results = []
-        for text in texts:
-            result = self.predict(text)
-            results.append(result)
+        # Format result
+        scored = []
+        for row, column in enumerate(best):
+            prediction = classes[column]
+            scored.append((
+                "TRUE" if prediction == 1 else "FAKE",
+                float(probabilities[row, column]),
+                bool(prediction == 0)
+            ))
+        return scored
+    
+    def enable_process_pool(self, workers: Optional[int] = None,
+                            chunk_size: Optional[int] = None,
+                            lane_workers: Optional[Dict[str, int]] = None) -> None:
+        """
+        Score predictions in a pool of worker processes.
         
-        return results
+        Each worker loads its own copy of the model, so cleaning and
+        lemmatization run outside this process and are not bound by the GIL.
+        Lanes listed in lane_workers get a separate pool of their own, so
+        their requests never wait behind other lanes' work.
+        
+        Args:
+            workers: Number of worker processes. If None, uses config default.
+            chunk_size: Texts sent to a worker per task. If None, uses config default.
+            lane_workers: Optional mapping of lane name to dedicated worker count
+        """
+        from src.services.inference_pool import InferencePool
+        
+        self.disable_process_pool()
+        chunk_size = chunk_size or config.INFERENCE_CHUNK_SIZE
+        
+        dedup = self._dedup.params if self._dedup is not None else None
+        prediction_cache = self._cache.params if self._cache is not None else None
+        
+        pool = InferencePool(
+            model_path=self.model_path,
+            workers=workers or config.INFERENCE_WORKERS,
+            chunk_size=chunk_size,
+            dedup=dedup,
+            prediction_cache=prediction_cache
+        )
+        pool.start()
+        self._pool = pool
+        
+        for lane, lane_worker_count in (lane_workers or {}).items():
+            if lane_worker_count > 0:
+                lane_pool = InferencePool(
+                    model_path=self.model_path,
+                    workers=lane_worker_count,
+                    chunk_size=chunk_size,
+                    dedup=dedup,
+                    prediction_cache=prediction_cache
+                )
+                lane_pool.start()
+                self._lane_pools[lane] = lane_pool
+    
+    def disable_process_pool(self) -> None:
+        """Shut down the process-pool backend and score in-process again."""
+        pools = [self._pool, *self._lane_pools.values()]
+        self._pool = None
+        self._lane_pools = {}
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown()
+    
+    def enable_dedup(self, threshold: Optional[float] = None,
+                     max_entries: Optional[int] = None,
+                     num_perm: Optional[int] = None) -> None:
+        """
+        Reuse predictions for near-duplicate texts.
+        
+        Cleaned token sets are indexed with MinHash/LSH; a text whose
+        estimated Jaccard similarity to an already-scored text reaches the
+        threshold gets that text's prediction without being scored. The
+        index is emptied whenever a model is loaded. Call this before
+        enable_process_pool so every worker keeps an index of its own.
+        
+        Args:
+            threshold: Minimum similarity for reuse. If None, uses config default.
+            max_entries: Maximum indexed texts. If None, uses config default.
+            num_perm: MinHash signature length. If None, uses config default.
+        """
+        self._dedup = NearDuplicateIndex(
+            threshold=threshold or config.DEDUP_THRESHOLD,
+            num_perm=num_perm or config.DEDUP_NUM_PERM,
+            max_entries=max_entries or config.DEDUP_MAX_ENTRIES
+        )
+    
+    def disable_dedup(self) -> None:
+        """Stop reusing near-duplicate predictions and drop the index."""
+        self._dedup = None
+    
+    def enable_prediction_cache(self, path: Optional[str] = None,
+                                max_entries: Optional[int] = None, **options) -> None:
+        """
+        Store predictions in a persistent cache shared across processes.
+        
+        Entries are keyed by model version (a digest of the model file's
+        content) and cleaned text, so a new model never sees its
+        predecessor's results. Rows of models no longer in use are not
+        purged; they age out through the cache's least-recently-used
+        eviction. Call this before enable_process_pool so the workers use
+        the cache too.
+        
+        Args:
+            path: SQLite database file. If None, uses config default.
+            max_entries: Maximum cached predictions. If None, uses config default.
+            **options: Further PredictionCache arguments (flush_interval,
+                batch_size, queue_size)
+        """
+        self.disable_prediction_cache()
+        options.setdefault("flush_interval", config.PREDICTION_CACHE_FLUSH_INTERVAL)
+        self._cache = PredictionCache(
+            path or config.PREDICTION_CACHE_PATH,
+            max_entries=max_entries or config.PREDICTION_CACHE_MAX_ENTRIES,
+            **options
+        )
+    
+    def disable_prediction_cache(self) -> None:
+        """Flush pending cache writes and stop using the persistent cache."""
+        cache, self._cache = self._cache, None
+        if cache is not None:
+            cache.close()
+    
+    @property
+    def reuse_counters(self) -> Dict[str, int]:
+        """Lookup and reuse counts of this process's dedup index and prediction cache."""
+        counters = {"dedup_lookups": 0, "dedup_reused": 0, "cache_hits": 0, "cache_misses": 0}
+        if self._dedup is not None:
+            stats = self._dedup.stats
+            counters["dedup_lookups"] = stats["lookups"]
+            counters["dedup_reused"] = stats["reused"]
+        if self._cache is not None:
+            counters["cache_hits"] = self._cache.hits
+            counters["cache_misses"] = self._cache.misses
+        return counters
+    
+    def _pool_counters(self) -> Optional[Dict[str, int]]:
+        """Reuse counters summed over all worker pools (None without pools)."""
+        pools = [pool for pool in [self._pool, *self._lane_pools.values()] if pool is not None]
+        if not pools:
+            return None
+        totals: Dict[str, int] = {}
+        for pool in pools:
+            for name, value in pool.counters.items():
+                totals[name] = totals.get(name, 0) + value
+        return totals
+    
+    @property
+    def dedup_stats(self) -> dict:
+        """
+        Near-duplicate reuse counters.
+        
+        With the process-pool backend, lookups and reuses are summed over
+        the workers' indexes.
+        """
+        if self._dedup is None:
+            return {"enabled": False}
+        
+        stats = {"enabled": True, **self._dedup.stats}
+        totals = self._pool_counters()
+        if totals is not None:
+            stats["scope"] = "per_worker"
+            stats["lookups"] = totals.get("dedup_lookups", 0)
+            stats["reused"] = totals.get("dedup_reused", 0)
+            stats["reuse_rate"] = stats["reused"] / stats["lookups"] if stats["lookups"] else 0.0
+            del stats["entries"], stats["evictions"]
+        return stats
+    
+    @property
+    def prediction_cache_stats(self) -> dict:
+        """
+        Persistent prediction cache counters.
+        
+        With the process-pool backend, hits and misses are summed over the
+        workers; the other counters describe this process's writer only.
+        """
+        if self._cache is None:
+            return {"enabled": False}
+        
+        stats = {"enabled": True, **self._cache.stats}
+        totals = self._pool_counters()
+        if totals is not None:
+            stats["hits"] = totals.get("cache_hits", 0)
+            stats["misses"] = totals.get("cache_misses", 0)
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+    
+    def model_snapshot(self) -> Tuple[Any, Any, Optional[str]]:
+        """
+        Get the loaded (model, vectorizer, model version), loading the model if needed.
+        
+        The three always belong together, even while a reload is in progress.
+        """
+        self._ensure_loaded()
+        with self._load_lock:
+            model, vectorizer = self._bundle
+            return model, vectorizer, self._model_version
+    
+    @property
+    def text_processor(self) -> TextProcessor:
+        """Text processor used to clean inputs."""
+        return self._text_processor
     
     @property
     def is_loaded(self) -> bool:
         """Check if model is loaded."""
         return self._loaded
     
+    @property
+    def model_version(self) -> Optional[str]:
+        """Short content digest of the loaded model artifact (None if not loaded)."""
+        return self._model_version
+    
     @property
     def model_info(self) -> dict:
         """Get information about the loaded model."""
         if not self._loaded:
             return {"loaded": False}
         
+        model, vectorizer = self._bundle
         return {
             "loaded": True,
-            "model_type": type(self._model).__name__,
-            "vectorizer_type": type(self._vectorizer).__name__,
-            "model_path": self.model_path
+            "model_type": type(model).__name__,
+            "vectorizer_type": type(vectorizer).__name__,
+            "model_path": self.model_path,
+            "model_version": self._model_version,
+            "backend": "process_pool" if self._pool is not None else "in_process"
         }
 
 
@@ -0,0 +1,316 @@
+"""
+Persistent prediction cache for the model service.
+Stores predictions in a SQLite database (WAL mode) keyed by model
+version and a hash of the cleaned text, so they survive restarts and
+are shared by every process that opens the same file. Writes are queued
+and committed in batches by a background thread, so the request path
+never waits on disk.
+"""
+import atexit
+import hashlib
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+# SQLite builds may limit statements to 999 bound parameters
+_MAX_PARAMS = 900
+
+# Eviction trims the cache to this share of max_entries, so the table
+# only needs counting again after that many more writes
+_EVICT_TO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    key BLOB PRIMARY KEY,
+    model_version TEXT NOT NULL,
+    label TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    is_fake INTEGER NOT NULL,
+    used_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS predictions_used_at ON predictions (used_at);
+"""
+
+Prediction = Tuple[str, float, bool]
+
+
+def cache_key(model_version: str, cleaned_text: str) -> bytes:
+    """16-byte key of a cleaned text scored by a given model version."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(model_version.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(cleaned_text.encode('utf-8'))
+    return digest.digest()
+
+
+class PredictionCache:
+    """
+    SQLite-backed (label, confidence, is_fake) store.
+
+    Reads run on a per-thread connection. Inserts and last-used updates
+    go through a bounded queue to one writer thread, which commits them
+    in a single transaction every flush_interval seconds (or once
+    batch_size rows are waiting). If the queue is full, writes are
+    dropped rather than blocking the caller. Once the rows may exceed
+    max_entries, the least recently used are deleted down to 90% of
+    it. Rows written by other processes are only noticed when this
+    process next counts, so the table may briefly run over. Any
+    database error turns into a cache miss; the cache never fails a
+    prediction.
+    """
+
+    def __init__(self, path: str, max_entries: int = 200000, flush_interval: float = 0.5,
+                 batch_size: int = 1000, queue_size: int = 10000):
+        """
+        Initialize the cache and start its writer thread.
+
+        Args:
+            path: SQLite database file (created if missing)
+            max_entries: Maximum rows kept; older rows are evicted
+            flush_interval: Maximum seconds a write waits before commit
+            batch_size: Pending writes that trigger an early commit
+            queue_size: Maximum queued write jobs (one per scored batch)
+                before new ones are dropped
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if flush_interval <= 0 or batch_size <= 0 or queue_size <= 0:
+            raise ValueError("flush_interval, batch_size and queue_size must be positive")
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=queue_size)
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._written = 0
+        self._dropped = 0
+        self._evicted = 0
+        self._errors = 0
+        self._closed = threading.Event()
+
+        # Create the schema up front so readers never see a missing table
+        connection = self._connect()
+        connection.executescript(_SCHEMA)
+        connection.commit()
+        # Upper bound on the row count, kept by the writer thread from its
+        # own inserts and only checked against the table once over max_entries
+        self._row_bound = connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        connection.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="prediction-cache-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    @property
+    def params(self) -> dict:
+        """Constructor arguments, for opening the same cache in another process."""
+        return {
+            "path": str(self.path),
+            "max_entries": self.max_entries,
+            "flush_interval": self.flush_interval,
+            "batch_size": self.batch_size,
+            "queue_size": self._queue.maxsize,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection configured for concurrent multi-process use."""
+        connection = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # WAL with NORMAL sync stays consistent on crashes; a power loss may
+        # only drop the last commits, which is fine for a cache
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        """This thread's read connection."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+        return connection
+
+    def get_many(self, model_version: str, cleaned_texts: Sequence[str]) -> List[Optional[Prediction]]:
+        """
+        Look up cached predictions.
+
+        Args:
+            model_version: Version of the model that would score the texts
+            cleaned_texts: Cleaned texts
+
+        Returns:
+            One (label, confidence, is_fake) tuple or None per text, in order
+        """
+        keys = [cache_key(model_version, text) for text in cleaned_texts]
+        found = {}
+        try:
+            connection = self._reader()
+            for start in range(0, len(keys), _MAX_PARAMS):
+                chunk = keys[start:start + _MAX_PARAMS]
+                rows = connection.execute(
+                    "SELECT key, label, confidence, is_fake FROM predictions "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+                for key, label, confidence, is_fake in rows:
+                    found[key] = (label, confidence, bool(is_fake))
+        except sqlite3.Error:
+            with self._stats_lock:
+                self._errors += 1
+
+        results = [found.get(key) for key in keys]
+        hits = [key for key in keys if key in found]
+        with self._stats_lock:
+            self._hits += len(hits)
+            self._misses += len(keys) - len(hits)
+        if hits:
+            self._enqueue(("touch", hits, time.time()))
+        return results
+
+    def put_many(self, model_version: str, items: Sequence[Tuple[str, Prediction]]) -> None:
+        """
+        Queue predictions for storage without waiting for the write.
+
+        Args:
+            model_version: Version of the model that produced the predictions
+            items: (cleaned text, (label, confidence, is_fake)) pairs
+        """
+        if not items:
+            return
+        now = time.time()
+        rows = [
+            (cache_key(model_version, text), model_version, label, confidence, int(is_fake), now)
+            for text, (label, confidence, is_fake) in items
+        ]
+        self._enqueue(("put", rows))
+
+    def _enqueue(self, job: tuple) -> None:
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._stats_lock:
+                self._dropped += len(job[1])
+
+    def _write_loop(self) -> None:
+        """Commit queued writes in batches until closed."""
+        connection = self._connect()
+        while True:
+            jobs = []
+            pending = 0
+            deadline = time.monotonic() + self.flush_interval
+            while pending < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    job = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                jobs.append(job)
+                pending += len(job[1])
+
+            # Pick up everything already queued when closing
+            closing = self._closed.is_set()
+            if closing:
+                while True:
+                    try:
+                        jobs.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+            if jobs:
+                try:
+                    self._commit(connection, jobs)
+                except sqlite3.Error as e:
+                    print(f"Warning: Prediction cache write failed: {e}")
+                    with self._stats_lock:
+                        self._errors += 1
+            if closing:
+                connection.close()
+                return
+
+    def _commit(self, connection: sqlite3.Connection, jobs: List[tuple]) -> None:
+        """Apply queued jobs in one transaction, then evict the overflow."""
+        written = 0
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for job in jobs:
+                if job[0] == "put":
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?, ?)", job[1]
+                    )
+                    written += len(job[1])
+                elif job[0] == "touch":
+                    connection.executemany(
+                        "UPDATE predictions SET used_at = ? WHERE key = ?",
+                        [(job[2], key) for key in job[1]]
+                    )
+
+            row_bound = self._row_bound + written
+            evicted = 0
+            if row_bound > self.max_entries:
+                row_bound = connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+                if row_bound > self.max_entries:
+                    evicted = connection.execute(
+                        "DELETE FROM predictions WHERE key IN "
+                        "(SELECT key FROM predictions ORDER BY used_at LIMIT ?)",
+                        (row_bound - int(self.max_entries * _EVICT_TO),)
+                    ).rowcount
+                    row_bound -= evicted
+            connection.execute("COMMIT")
+            self._row_bound = row_bound
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+
+        with self._stats_lock:
+            self._written += written
+            self._evicted += evicted
+
+    def close(self) -> None:
+        """Commit pending writes and stop the writer thread."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._writer.join()
+        atexit.unregister(self.close)
+
+    @property
+    def hits(self) -> int:
+        """Lookups answered from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Lookups not found in the cache."""
+        return self._misses
+
+    @property
+    def stats(self) -> dict:
+        """Hit, miss, write, drop and eviction counters plus current size."""
+        try:
+            entries = self._reader().execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+        with self._stats_lock:
+            lookups = self._hits + self._misses
+            return {
+                "path": str(self.path),
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "written": self._written,
+                "pending": self._queue.qsize(),
+                "dropped": self._dropped,
+                "evicted": self._evicted,
+                "errors": self._errors,
+            }
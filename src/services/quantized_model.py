@@ -0,0 +1,230 @@
+"""
+Reduced-precision model components for memory-constrained serving.
+Stores linear model coefficients and TF-IDF idf weights as int8 (with
+a scale) or float16, produces float32 sparse matrices with int32
+indices, and dequantizes only the weights a text actually touches
+while scoring. Quantized artifacts are drop-in (model, vectorizer)
+pairs for ModelService.
+"""
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+QUANTIZED_DTYPES = ("int8", "float16")
+
+
+def quantize(values: np.ndarray, dtype: str) -> Tuple[np.ndarray, float]:
+    """
+    Quantize a float array.
+
+    Args:
+        values: Array to quantize
+        dtype: 'int8' (symmetric, scaled to the largest magnitude) or 'float16'
+
+    Returns:
+        Tuple of (quantized array, scale); original ≈ quantized * scale
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if dtype == "float16":
+        return values.astype(np.float16), 1.0
+    if dtype == "int8":
+        largest = float(np.abs(values).max()) if values.size else 0.0
+        scale = largest / 127 if largest > 0 else 1.0
+        return np.clip(np.rint(values / scale), -127, 127).astype(np.int8), scale
+    raise ValueError(f"dtype must be one of {QUANTIZED_DTYPES}")
+
+
+class QuantizedLinearModel:
+    """
+    Binary linear classifier with quantized coefficients.
+
+    Provides the predict / predict_proba / classes_ interface ModelService
+    uses. Scores are computed straight from the sparse input: only the
+    coefficients of the features present in a text are dequantized.
+    """
+
+    def __init__(self, coef: np.ndarray, intercept: float, classes: np.ndarray,
+                 dtype: str = "int8"):
+        """
+        Initialize the quantized model.
+
+        Args:
+            coef: Coefficients of the positive class, shape (n_features,)
+            intercept: Intercept of the positive class
+            classes: The two class labels, negative class first
+            dtype: Storage type for the coefficients ('int8' or 'float16')
+        """
+        self.coef, self.scale = quantize(coef, dtype)
+        self.intercept = float(intercept)
+        self.classes_ = np.asarray(classes)
+        self.dtype = dtype
+
+    @classmethod
+    def from_sklearn(cls, model: Any, dtype: str = "int8") -> "QuantizedLinearModel":
+        """
+        Quantize a fitted binary linear sklearn classifier.
+
+        Raises:
+            ValueError: If the model is not a binary linear classifier
+                with logistic probability outputs
+        """
+        coef = getattr(model, 'coef_', None)
+        if coef is None or coef.shape[0] != 1 or len(model.classes_) != 2:
+            raise ValueError(f"Cannot quantize {type(model).__name__}: need a binary linear classifier")
+        if not hasattr(model, 'predict_proba'):
+            raise ValueError(f"Cannot quantize {type(model).__name__}: no predict_proba")
+        # predict_proba here is the logistic link; SGD losses such as
+        # modified_huber map scores to probabilities differently
+        if getattr(model, 'loss', 'log_loss') not in ('log_loss', 'log'):
+            raise ValueError(f"Cannot quantize {type(model).__name__} with loss '{model.loss}'")
+        return cls(coef[0], model.intercept_[0], model.classes_, dtype=dtype)
+
+    def decision_function(self, X) -> np.ndarray:
+        """Signed distance of each row from the decision boundary."""
+        X = sparse.csr_matrix(X)
+        weights = self.coef[X.indices].astype(np.float32) * np.float32(self.scale)
+        rows = np.repeat(np.arange(X.shape[0]), np.diff(X.indptr))
+        scores = np.bincount(rows, weights=X.data * weights, minlength=X.shape[0])
+        return scores + self.intercept
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities, one column per entry of classes_."""
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        """Predicted class label of each row."""
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+    @property
+    def n_features(self) -> int:
+        return len(self.coef)
+
+
+class QuantizedTfidfVectorizer:
+    """
+    TF-IDF vectorizer with a fixed vocabulary and quantized idf weights.
+
+    Tokenizes exactly like the TfidfVectorizer it was built from and
+    returns float32 CSR matrices with int32 indices. The analyzer is
+    rebuilt from the stored settings after unpickling rather than stored.
+    """
+
+    def __init__(self, vocabulary: Dict[str, int], idf: np.ndarray, analyzer_params: dict,
+                 norm: Optional[str] = "l2", sublinear_tf: bool = False, dtype: str = "int8"):
+        """
+        Initialize the quantized vectorizer.
+
+        Args:
+            vocabulary: Mapping of term to column index
+            idf: Inverse document frequency of each column
+            analyzer_params: CountVectorizer settings that define tokenization
+            norm: Row normalization ('l2', 'l1' or None)
+            sublinear_tf: Whether term frequencies are replaced by 1 + log(tf)
+            dtype: Storage type for the idf weights ('int8' or 'float16')
+        """
+        self.vocabulary = vocabulary
+        self.idf, self.scale = quantize(idf, dtype)
+        self.analyzer_params = analyzer_params
+        self.norm = norm
+        self.sublinear_tf = sublinear_tf
+        self.dtype = dtype
+        self._analyzer = None
+
+    @classmethod
+    def from_sklearn(cls, vectorizer: Any, dtype: str = "int8") -> "QuantizedTfidfVectorizer":
+        """
+        Quantize a fitted sklearn TfidfVectorizer.
+
+        Raises:
+            ValueError: If the vectorizer uses custom callables, no idf
+                or binary term counts
+        """
+        params = vectorizer.get_params()
+        if callable(params['analyzer']) or params['tokenizer'] or params['preprocessor']:
+            raise ValueError("Cannot quantize a vectorizer with custom analyzer callables")
+        if not params['use_idf']:
+            raise ValueError("Cannot quantize a vectorizer without idf weights")
+        if params['binary']:
+            raise ValueError("Cannot quantize a vectorizer with binary=True")
+        analyzer_params = {
+            key: params[key]
+            for key in ('analyzer', 'lowercase', 'token_pattern', 'ngram_range',
+                        'stop_words', 'strip_accents', 'encoding', 'decode_error', 'input')
+        }
+        vocabulary = {term: int(column) for term, column in vectorizer.vocabulary_.items()}
+        return cls(vocabulary, vectorizer.idf_, analyzer_params,
+                   norm=params['norm'], sublinear_tf=params['sublinear_tf'], dtype=dtype)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_analyzer'] = None
+        return state
+
+    def _get_analyzer(self):
+        """Build (once) the same analyzer the source TfidfVectorizer used."""
+        if self._analyzer is None:
+            from sklearn.feature_extraction.text import CountVectorizer
+            self._analyzer = CountVectorizer(**self.analyzer_params).build_analyzer()
+        return self._analyzer
+
+    def transform(self, texts: Iterable[str]) -> sparse.csr_matrix:
+        """
+        Convert texts to TF-IDF rows.
+
+        Returns:
+            float32 CSR matrix with int32 indices, shape (len(texts), n_features)
+        """
+        analyze = self._get_analyzer()
+        vocabulary = self.vocabulary
+        indptr = [0]
+        indices = []
+        counts = []
+        for text in texts:
+            row = Counter(vocabulary[term] for term in analyze(text) if term in vocabulary)
+            for column in sorted(row):
+                indices.append(column)
+                counts.append(row[column])
+            indptr.append(len(indices))
+
+        indices = np.asarray(indices, dtype=np.int32)
+        data = np.asarray(counts, dtype=np.float32)
+        if self.sublinear_tf:
+            data = np.log(data) + np.float32(1)
+        # Dequantize only the idf weights of terms that occur
+        data *= self.idf[indices].astype(np.float32) * np.float32(self.scale)
+
+        matrix = sparse.csr_matrix(
+            (data, indices, np.asarray(indptr, dtype=np.int32)),
+            shape=(len(indptr) - 1, len(self.idf))
+        )
+        if self.norm is not None:
+            from sklearn.preprocessing import normalize
+            matrix = normalize(matrix, norm=self.norm, copy=False)
+        return matrix
+
+    @property
+    def n_features(self) -> int:
+        return len(self.idf)
+
+
+def quantize_artifact(model: Any, vectorizer: Any, dtype: str = "int8") -> Tuple[Any, Any]:
+    """
+    Quantize a (model, vectorizer) pair as stored in the model pickle.
+
+    TF-IDF vectorizers are replaced by QuantizedTfidfVectorizer; stateless
+    vectorizers such as HashingVectorizer hold no weights and are kept.
+
+    Raises:
+        ValueError: If the model or vectorizer cannot be quantized
+    """
+    quantized_model = QuantizedLinearModel.from_sklearn(model, dtype=dtype)
+    if hasattr(vectorizer, 'idf_'):
+        quantized_vectorizer = QuantizedTfidfVectorizer.from_sklearn(vectorizer, dtype=dtype)
+    elif not hasattr(vectorizer, 'vocabulary_'):
+        quantized_vectorizer = vectorizer
+    else:
+        raise ValueError(f"Cannot quantize {type(vectorizer).__name__}")
+    return quantized_model, quantized_vectorizer
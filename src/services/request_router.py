@@ -0,0 +1,305 @@
+"""
+Request router for multiple inference nodes.
+Forwards prediction requests to Flask backends chosen by consistent
+hashing of the normalized text (or round-robin, for comparison), splits
+batch requests into per-node slices, fails over to the next node on the
+ring when a backend is unreachable, and re-admits it once healthy.
+"""
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+import requests
+
+from src.services.hash_ring import HashRing, routing_key
+
+ROUTING_STRATEGIES = ("hash", "round_robin")
+
+# Backend response headers passed through to clients
+_PASSTHROUGH_HEADERS = ("Content-Type", "Retry-After")
+
+# Minimum seconds between re-probes triggered by an empty ring
+_REPROBE_INTERVAL = 1.0
+
+
+class NoBackendError(Exception):
+    """Raised when no backend could take a request."""
+
+
+@dataclass
+class ForwardedResponse:
+    """HTTP response to relay to the client."""
+    status: int
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class RequestRouter:
+    """
+    Routes prediction requests to a set of backend nodes.
+
+    With the 'hash' strategy every text is sent to the node owning its
+    routing key on a consistent hash ring, so repeated texts reach the
+    node that already has them cached. Unreachable backends are taken
+    off the ring (only their keys move) and put back by the health
+    checker once their /livez answers again. If the ring runs empty,
+    requests re-probe the backends themselves.
+    """
+
+    def __init__(self, backends: Iterable[str], strategy: str = "hash",
+                 vnodes: int = 160, timeout: float = 10.0):
+        """
+        Initialize the router.
+
+        Args:
+            backends: Base URLs of the backend nodes (e.g. http://10.0.0.5:5000)
+            strategy: 'hash' (consistent hashing) or 'round_robin'
+            vnodes: Virtual nodes per backend on the hash ring
+            timeout: Seconds to wait for a backend response
+        """
+        if strategy not in ROUTING_STRATEGIES:
+            raise ValueError(f"strategy must be one of {ROUTING_STRATEGIES}")
+
+        self.strategy = strategy
+        self.timeout = timeout
+        self._backends: List[str] = []
+        self._ring = HashRing(vnodes=vnodes)
+        self._round_robin = itertools.count()
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="router-forward")
+        self._health_stop = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+        self._reprobe_lock = threading.Lock()
+        self._last_reprobe = 0.0
+        for backend in backends:
+            self.add_backend(backend)
+
+    def add_backend(self, backend: str) -> bool:
+        """
+        Register a backend and put it on the ring.
+
+        Returns:
+            bool: False if the backend was already registered
+        """
+        backend = backend.rstrip('/')
+        with self._stats_lock:
+            if backend in self._backends:
+                return False
+            self._backends.append(backend)
+            self._stats[backend] = {"requests": 0, "texts": 0, "failures": 0}
+        self._ring.add_node(backend)
+        return True
+
+    def remove_backend(self, backend: str) -> bool:
+        """
+        Unregister a backend; its keys move to the remaining nodes.
+
+        Returns:
+            bool: False if the backend was not registered
+        """
+        backend = backend.rstrip('/')
+        with self._stats_lock:
+            if backend not in self._backends:
+                return False
+            self._backends.remove(backend)
+            del self._stats[backend]
+        self._ring.remove_node(backend)
+        return True
+
+    def _session(self) -> requests.Session:
+        """This thread's HTTP session (keeps backend connections alive)."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def _candidates(self, key: str) -> List[str]:
+        """Backends to try for a key, in order."""
+        if self.strategy == "hash":
+            return list(self._ring.iter_nodes(key))
+        nodes = self._ring.nodes
+        if not nodes:
+            return []
+        start = next(self._round_robin) % len(nodes)
+        return nodes[start:] + nodes[:start]
+
+    def _mark_down(self, backend: str, error: Exception) -> None:
+        """Take an unreachable backend off the ring until it is healthy again."""
+        if self._ring.remove_node(backend):
+            print(f"Warning: Backend {backend} unreachable, removed from ring: {error}")
+        with self._stats_lock:
+            if backend in self._stats:
+                self._stats[backend]["failures"] += 1
+
+    def _reprobe(self) -> bool:
+        """
+        Probe the backends again once none is left on the ring.
+
+        Keeps the router from staying down after a short outage when
+        health checks are off. Probes run at most once a second; other
+        requests arriving meanwhile fail straight away.
+
+        Returns:
+            bool: True if any backend is back on the ring
+        """
+        if not self._reprobe_lock.acquire(blocking=False):
+            return False
+        try:
+            if time.monotonic() - self._last_reprobe < _REPROBE_INTERVAL:
+                return bool(self._ring.nodes)
+            self._last_reprobe = time.monotonic()
+            self.check_backends()
+            return bool(self._ring.nodes)
+        finally:
+            self._reprobe_lock.release()
+
+    def _post(self, backend: str, path: str, payload: dict, texts: int) -> Optional[requests.Response]:
+        """POST to a backend; None (and the backend marked down) if unreachable."""
+        try:
+            response = self._session().post(backend + path, json=payload, timeout=self.timeout)
+        except requests.RequestException as e:
+            self._mark_down(backend, e)
+            return None
+        with self._stats_lock:
+            if backend in self._stats:
+                self._stats[backend]["requests"] += 1
+                self._stats[backend]["texts"] += texts
+        return response
+
+    @staticmethod
+    def _relay(response: requests.Response) -> ForwardedResponse:
+        headers = {name: response.headers[name] for name in _PASSTHROUGH_HEADERS if name in response.headers}
+        return ForwardedResponse(response.status_code, response.content, headers)
+
+    def predict(self, payload: dict) -> ForwardedResponse:
+        """
+        Forward a /predict request to the text's node.
+
+        Raises:
+            NoBackendError: If every backend is unreachable
+        """
+        text = payload.get('text')
+        key = routing_key(text) if isinstance(text, str) else ""
+        for attempt in range(2):
+            for backend in self._candidates(key):
+                response = self._post(backend, '/predict', payload, texts=1)
+                if response is not None:
+                    return self._relay(response)
+            if attempt or not self._reprobe():
+                break
+        raise NoBackendError("No backend available")
+
+    def predict_batch(self, texts: List[str]) -> ForwardedResponse:
+        """
+        Split a batch by owning node, forward the slices in parallel and
+        merge the predictions back into input order.
+
+        Slices whose node is unreachable are re-split over the remaining
+        nodes. If any node rejects its slice (e.g. 413 or 503), that
+        response is returned for the whole batch.
+
+        Raises:
+            NoBackendError: If every backend is unreachable
+        """
+        keys = [routing_key(text) for text in texts]
+        predictions: List[Optional[dict]] = [None] * len(texts)
+        remaining = list(range(len(texts)))
+
+        while remaining:
+            groups: Dict[str, List[int]] = {}
+            for i in remaining:
+                candidates = self._candidates(keys[i])
+                if not candidates and self._reprobe():
+                    candidates = self._candidates(keys[i])
+                if not candidates:
+                    raise NoBackendError("No backend available")
+                groups.setdefault(candidates[0], []).append(i)
+
+            futures = [
+                (indices, self._executor.submit(
+                    self._post, backend, '/predict/batch',
+                    {"texts": [texts[i] for i in indices]}, len(indices)
+                ))
+                for backend, indices in groups.items()
+            ]
+
+            remaining = []
+            for indices, future in futures:
+                response = future.result()
+                if response is None:
+                    remaining.extend(indices)
+                    continue
+                if response.status_code != 200:
+                    return self._relay(response)
+                for i, prediction in zip(indices, response.json()["predictions"]):
+                    predictions[i] = prediction
+
+        body = json.dumps({"predictions": predictions}).encode('utf-8')
+        return ForwardedResponse(200, body, {"Content-Type": "application/json"})
+
+    def check_backends(self) -> None:
+        """Probe every backend's /livez and update ring membership."""
+        for backend in self.backends:
+            try:
+                healthy = self._session().get(backend + '/livez', timeout=min(self.timeout, 2.0)).ok
+            except requests.RequestException:
+                healthy = False
+
+            if healthy and backend in self.backends:
+                if self._ring.add_node(backend):
+                    print(f"Backend {backend} is healthy again, added to ring")
+            elif not healthy and self._ring.remove_node(backend):
+                print(f"Warning: Backend {backend} failed its health check, removed from ring")
+
+    def start_health_checks(self, interval: float) -> None:
+        """
+        Probe backends from a background thread.
+
+        Args:
+            interval: Seconds between probes of all backends
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if self._health_thread is not None and self._health_thread.is_alive():
+            return
+
+        def watch():
+            while not self._health_stop.wait(interval):
+                self.check_backends()
+
+        self._health_stop.clear()
+        self._health_thread = threading.Thread(target=watch, name="router-health", daemon=True)
+        self._health_thread.start()
+
+    def stop_health_checks(self) -> None:
+        """Stop the background health checker."""
+        self._health_stop.set()
+        if self._health_thread is not None:
+            self._health_thread.join()
+            self._health_thread = None
+
+    @property
+    def backends(self) -> List[str]:
+        """Registered backends, healthy or not."""
+        with self._stats_lock:
+            return list(self._backends)
+
+    @property
+    def stats(self) -> dict:
+        """Routing strategy, ring members and per-backend counters."""
+        healthy = set(self._ring.nodes)
+        with self._stats_lock:
+            return {
+                "strategy": self.strategy,
+                "backends": {
+                    backend: {"healthy": backend in healthy, **counters}
+                    for backend, counters in self._stats.items()
+                },
+            }
@@ -3,28 +3,42 @@ Sample headlines service for managing and accessing test data.
 Provides fake and true news samples for users to test the detector.
 """
 import json
+import os
 import random
-from dataclasses import dataclass
-from typing import List, Optional
+import sys
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 from pathlib import Path
 from src.config import config
+from src.services.search_index import SearchIndex
+from src.utils.json_stream import iter_json_array
 
+if TYPE_CHECKING:
+    from src.services.model_service import ModelService, PredictionResult
 
-@dataclass
+
+@dataclass(slots=True)
 class Sample:
     """
     Represents a sample news headline for testing.
     
+    Slotted to avoid a per-instance __dict__; label, category and source
+    are interned when loaded from file so repeated values share one string.
+    
     Attributes:
         text: The headline or article text
         label: Classification label ("fake" or "true")
         category: Topic category (e.g., "politics", "health")
         source: Optional source attribution
+        prediction: Model prediction precomputed when samples or model load
     """
     text: str
     label: str
     category: str = ""
     source: str = ""
+    prediction: Optional["PredictionResult"] = field(default=None, compare=False, repr=False)
     
     @property
     def is_fake(self) -> bool:
@@ -35,6 +49,69 @@ class Sample:
     def is_true(self) -> bool:
         """Check if this sample is true news."""
         return self.label.lower() == "true"
+    
+    def to_dict(self) -> dict:
+        """Convert the sample to a JSON-serializable dictionary."""
+        return {
+            "text": self.text,
+            "label": self.label,
+            "category": self.category,
+            "source": self.source,
+            "prediction": self.prediction.to_dict() if self.prediction is not None else None
+        }
+
+
+class SampleIndex:
+    """
+    Lookup structures over one loaded set of samples.
+    
+    Built once per load so label, category and random lookups never
+    scan the full sample list. Keys are lowercased; samples keep the
+    order they had in the source file.
+    
+    Attributes:
+        samples: All samples in file order
+        generation: Sample-set version this index was built for
+        by_text: First sample with each text
+        by_label: Samples grouped by label ("fake" and "true")
+        by_category: Samples grouped by category
+    """
+    
+    def __init__(self, samples: List[Sample], generation: int = 0):
+        self.samples: Tuple[Sample, ...] = tuple(samples)
+        self.generation = generation
+        self.by_text: Dict[str, Sample] = {}
+        self.by_label: Dict[str, List[Sample]] = {"fake": [], "true": []}
+        self.by_category: Dict[str, List[Sample]] = {}
+        self._by_category_label: Dict[Tuple[str, str], List[Sample]] = {}
+        
+        for sample in self.samples:
+            self.by_text.setdefault(sample.text, sample)
+            label = sample.label.lower()
+            category = sample.category.lower()
+            self.by_label.setdefault(label, []).append(sample)
+            self.by_category.setdefault(category, []).append(sample)
+            self._by_category_label.setdefault((category, label), []).append(sample)
+    
+    def filter(self, label: Optional[str] = None,
+               category: Optional[str] = None) -> Sequence[Sample]:
+        """
+        Get the samples matching optional label and category filters.
+        
+        Args:
+            label: Optional label filter ("fake" or "true")
+            category: Optional category filter
+            
+        Returns:
+            Matching samples in file order (shared, do not modify)
+        """
+        if label and category:
+            return self._by_category_label.get((category.lower(), label.lower()), [])
+        if label:
+            return self.by_label.get(label.lower(), [])
+        if category:
+            return self.by_category.get(category.lower(), [])
+        return self.samples
 
 
 class SampleService:
@@ -117,69 +194,245 @@ class SampleService:
             samples_path: Path to samples JSON file. If None, uses config default.
         """
         self.samples_path = samples_path or config.get_samples_path()
-        self._samples: List[Sample] = []
+        self._index = SampleIndex([])
         self._loaded = False
+        self._version = 0
+        self._model_service: Optional["ModelService"] = None
+        self._load_lock = threading.RLock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._last_check = 0.0
+        self._reload_stop = threading.Event()
+        self._reload_thread: Optional[threading.Thread] = None
+        self._search_index: Optional[SearchIndex] = None
     
     def load_samples(self) -> None:
         """
         Load samples from JSON file with fallback to hardcoded samples.
         
         If the JSON file is not found or contains invalid data,
-        falls back to hardcoded samples.
+        falls back to hardcoded samples. Samples are indexed by label and
+        category once here, the full-text search index is brought up to date,
+        and every load bumps the sample-set version so cached responses
+        built from older samples are invalidated.
+        """
+        with self._load_lock:
+            # Stat before reading so edits made during the read are seen next check
+            self._signature = self._file_signature()
+            samples = self._read_samples()
+            
+            # Score and index the new set before swapping it in, so readers
+            # only ever see a complete, scored sample set
+            if self._model_service is not None and self._model_service.is_loaded:
+                self._score(samples)
+            # The first load builds the search index aside and publishes it
+            # whole; later loads patch it under its own lock
+            search_index = self._search_index
+            if search_index is None:
+                search_index = SearchIndex()
+            search_index.update(sample.text for sample in samples)
+            self._version += 1
+            self._search_index = search_index
+            self._index = SampleIndex(samples, generation=self._version)
+            self._loaded = True
+    
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        """Get the samples file's (mtime in ns, size), or None if it is missing."""
+        try:
+            stat = os.stat(self.samples_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def check_for_updates(self, min_interval: Optional[float] = None) -> bool:
+        """
+        Reload the samples if the file changed since it was last loaded.
+        
+        Change detection only compares the file's mtime and size, and runs
+        at most once per min_interval seconds; calls in between return
+        immediately.
+        
+        Args:
+            min_interval: Minimum seconds between checks. If None, uses config default.
+            
+        Returns:
+            bool: True if the samples were reloaded
+        """
+        if min_interval is None:
+            min_interval = config.SAMPLES_RELOAD_INTERVAL
+        
+        now = time.monotonic()
+        if not self._loaded or now - self._last_check < min_interval:
+            return False
+        self._last_check = now
+        
+        if self._file_signature() == self._signature:
+            return False
+        
+        self.load_samples()
+        return True
+    
+    def start_auto_reload(self, interval: Optional[float] = None) -> None:
+        """
+        Watch the samples file from a background thread.
+        
+        Changes are parsed, scored and indexed on that thread and swapped
+        in atomically, so requests never wait on a reload.
+        
+        Args:
+            interval: Seconds between change checks. If None, uses config default.
+        """
+        interval = config.SAMPLES_RELOAD_INTERVAL if interval is None else interval
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if self._reload_thread is not None and self._reload_thread.is_alive():
+            return
+        
+        self._ensure_loaded()
+        
+        def watch():
+            while not self._reload_stop.wait(interval):
+                try:
+                    self.check_for_updates(min_interval=0)
+                except Exception as e:
+                    print(f"Error reloading samples: {e}")
+        
+        self._reload_stop.clear()
+        self._reload_thread = threading.Thread(target=watch, name="samples-reload", daemon=True)
+        self._reload_thread.start()
+    
+    def stop_auto_reload(self) -> None:
+        """Stop the background samples file watcher."""
+        self._reload_stop.set()
+        if self._reload_thread is not None:
+            self._reload_thread.join()
+            self._reload_thread = None
+    
+    def attach_model(self, model_service: "ModelService") -> None:
+        """
+        Precompute predictions for every sample with the given model.
+        
+        Samples are scored now if the model is loaded, and again whenever
+        the samples or the model are reloaded. Attaching the same service
+        twice is a no-op.
+        
+        Args:
+            model_service: ModelService used to score the samples
+        """
+        if self._model_service is model_service:
+            return
+        self._model_service = model_service
+        model_service.add_load_listener(self.score_samples)
+        if model_service.is_loaded:
+            self._ensure_loaded()
+            self.score_samples()
+    
+    def score_samples(self) -> None:
+        """
+        Score all loaded samples in one batched pass and store the results.
+        
+        Bumps the sample-set version so cached responses pick up the
+        new predictions. Scoring errors leave the samples unscored.
+        """
+        if self._model_service is None or not self._loaded:
+            return
+        
+        with self._load_lock:
+            if self._score(self._index.samples):
+                self._version += 1
+    
+    def _score(self, samples: Sequence[Sample]) -> bool:
+        """Attach predictions from the attached model to the given samples."""
+        try:
+            results = self._model_service.predict_batch([s.text for s in samples])
+        except Exception as e:
+            print(f"Error scoring samples: {e}")
+            return False
+        
+        for sample, result in zip(samples, results):
+            sample.prediction = result
+        return True
+    
+    def get_prediction(self, text: str) -> Optional["PredictionResult"]:
         """
+        Get the precomputed prediction for a sample text.
+        
+        Args:
+            text: Exact text of a sample
+            
+        Returns:
+            Stored PredictionResult, or None if the text is not a scored sample
+        """
+        self._ensure_loaded()
+        sample = self._index.by_text.get(text)
+        return sample.prediction if sample is not None else None
+    
+    def _fallback_samples(self) -> List[Sample]:
+        """Fresh copies of the hardcoded samples, safe to attach predictions to."""
+        return [replace(sample) for sample in self.FALLBACK_SAMPLES]
+    
+    def _read_samples(self) -> List[Sample]:
+        """Parse the samples file, falling back to hardcoded samples on error."""
         try:
             samples_file = Path(self.samples_path)
             
             if not samples_file.exists():
                 print(f"Warning: Samples file not found at {self.samples_path}, using fallback samples")
-                self._samples = self.FALLBACK_SAMPLES.copy()
-                self._loaded = True
-                return
+                return self._fallback_samples()
             
+            # Parse samples one at a time instead of loading the whole document
+            samples = []
             with open(samples_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Validate JSON structure
-            if 'samples' not in data:
-                raise ValueError("JSON file must contain 'samples' key")
-            
-            # Parse samples
-            self._samples = []
-            for item in data['samples']:
-                # Validate required fields
-                if 'text' not in item or 'label' not in item:
-                    print(f"Warning: Skipping invalid sample (missing text or label): {item}")
-                    continue
-                
-                # Validate label
-                if item['label'].lower() not in ['fake', 'true']:
-                    print(f"Warning: Skipping sample with invalid label: {item['label']}")
-                    continue
-                
-                sample = Sample(
-                    text=item['text'],
-                    label=item['label'],
-                    category=item.get('category', ''),
-                    source=item.get('source', '')
-                )
-                self._samples.append(sample)
-            
-            if not self._samples:
+                for item in iter_json_array(f, 'samples'):
+                    sample = self._parse_sample(item)
+                    if sample is not None:
+                        samples.append(sample)
+            
+            if not samples:
                 print("Warning: No valid samples found in file, using fallback samples")
-                self._samples = self.FALLBACK_SAMPLES.copy()
+                return self._fallback_samples()
             
-            self._loaded = True
+            return samples
             
         except json.JSONDecodeError as e:
             print(f"Error: Invalid JSON in samples file: {e}")
             print("Using fallback samples")
-            self._samples = self.FALLBACK_SAMPLES.copy()
-            self._loaded = True
+            return self._fallback_samples()
         except Exception as e:
             print(f"Error loading samples: {e}")
             print("Using fallback samples")
-            self._samples = self.FALLBACK_SAMPLES.copy()
-            self._loaded = True
+            return self._fallback_samples()
+    
+    @staticmethod
+    def _parse_sample(item: Any) -> Optional[Sample]:
+        """
+        Validate one raw sample record and build a Sample from it.
+        
+        Args:
+            item: Decoded JSON value for one sample
+            
+        Returns:
+            Sample, or None if the record is invalid and should be skipped
+        """
+        # Validate required fields
+        if not isinstance(item, dict) or 'text' not in item or 'label' not in item:
+            print(f"Warning: Skipping invalid sample (missing text or label): {item}")
+            return None
+        
+        # Validate label
+        if not isinstance(item['label'], str) or item['label'].lower() not in ['fake', 'true']:
+            print(f"Warning: Skipping sample with invalid label: {item['label']}")
+            return None
+        
+        # Intern the low-cardinality fields so repeated values share memory;
+        # missing or non-string values become ''
+        category = item.get('category')
+        source = item.get('source')
+        return Sample(
+            text=item['text'],
+            label=sys.intern(item['label']),
+            category=sys.intern(category) if isinstance(category, str) else '',
+            source=sys.intern(source) if isinstance(source, str) else ''
+        )
     
     def _ensure_loaded(self) -> None:
         """Ensure samples are loaded before accessing them."""
@@ -197,8 +450,7 @@ class SampleService:
             List of fake news samples
         """
         self._ensure_loaded()
-        fake_samples = [s for s in self._samples if s.is_fake]
-        return fake_samples[:count]
+        return self._index.by_label["fake"][:count]
     
     def get_true_samples(self, count: int = 5) -> List[Sample]:
         """
@@ -211,8 +463,55 @@ class SampleService:
             List of true news samples
         """
         self._ensure_loaded()
-        true_samples = [s for s in self._samples if s.is_true]
-        return true_samples[:count]
+        return self._index.by_label["true"][:count]
+    
+    def get_by_category(self, category: str, count: int = 5,
+                        label: Optional[str] = None) -> List[Sample]:
+        """
+        Get samples in a category, optionally filtered by label.
+        
+        Args:
+            category: Category name (case-insensitive)
+            count: Maximum number of samples to return
+            label: Optional label filter ("fake" or "true")
+            
+        Returns:
+            List of matching samples
+        """
+        self._ensure_loaded()
+        return list(self._index.filter(label=label, category=category)[:count])
+    
+    def get_page(self, limit: int, offset: int = 0, label: Optional[str] = None,
+                 category: Optional[str] = None) -> Tuple[List[Sample], int, int]:
+        """
+        Get one page of samples, optionally filtered by label and category.
+        
+        Pages are sliced straight from the precomputed indexes, so the
+        cost is proportional to the page size, not the corpus size.
+        
+        Args:
+            limit: Maximum number of samples on the page
+            offset: Position of the first sample in the filtered sequence
+            label: Optional label filter ("fake" or "true")
+            category: Optional category filter
+            
+        Returns:
+            Tuple of (page samples, total matching samples, index generation)
+        """
+        self._ensure_loaded()
+        index = self._index
+        matching = index.filter(label=label, category=category)
+        return list(matching[offset:offset + limit]), len(matching), index.generation
+    
+    def get_categories(self) -> List[str]:
+        """
+        Get the categories present in the loaded samples.
+        
+        Returns:
+            Sorted list of category names
+        """
+        self._ensure_loaded()
+        return sorted(self._index.by_category)
     
     def get_all_samples(self) -> List[Sample]:
         """
@@ -222,7 +521,7 @@ class SampleService:
             List of all samples
         """
         self._ensure_loaded()
-        return self._samples.copy()
+        return list(self._index.samples)
     
     def get_random_sample(self, label: Optional[str] = None) -> Optional[Sample]:
         """
@@ -235,19 +534,43 @@ class SampleService:
             Random sample or None if no samples available
         """
         self._ensure_loaded()
+        index = self._index
         
-        if label:
-            label_lower = label.lower()
-            if label_lower == "fake":
-                samples = [s for s in self._samples if s.is_fake]
-            elif label_lower == "true":
-                samples = [s for s in self._samples if s.is_true]
-            else:
-                samples = self._samples
-        else:
-            samples = self._samples
-        
+        samples = index.by_label.get(label.lower(), index.samples) if label else index.samples
         return random.choice(samples) if samples else None
+    
+    def search(self, query: str, limit: int = 10,
+               offset: int = 0) -> Tuple[int, List[Tuple[Sample, float]]]:
+        """
+        Full-text search over sample texts, ranked by relevance.
+        
+        The inverted index is built when the samples load and kept up to
+        date incrementally on every reload, so queries never build it.
+        
+        Args:
+            query: Free-text query
+            limit: Maximum number of results to return
+            offset: Number of top-ranked results to skip
+            
+        Returns:
+            Tuple of (total matching samples, [(sample, score), ...] for the page)
+        """
+        self._ensure_loaded()
+        total, page = self._search_index.search(query, limit=limit, offset=offset)
+        by_text = self._index.by_text
+        return total, [(by_text[text], score) for text, score in page if text in by_text]
+    
+    @property
+    def sample_count(self) -> int:
+        """Number of loaded samples."""
+        self._ensure_loaded()
+        return len(self._index.samples)
+    
+    @property
+    def version(self) -> int:
+        """Sample-set version, incremented every time samples are loaded."""
+        self._ensure_loaded()
+        return self._version
 
 
 # Create a singleton instance for convenience
@@ -0,0 +1,500 @@
+"""
+Incremental scoring sessions for as-you-type predictions.
+A session keeps the text being edited split into independently cleaned
+units, its n-gram counts and the running TF-IDF sums of a linear model,
+so each edit only re-cleans and re-scores the units it touches instead
+of the whole document.
+"""
+import math
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# TextProcessor.clean_text removes [...] and <...> spans, which can cross
+# words; none of its patterns cross a newline. Lines containing these
+# characters are therefore cleaned as one unit, all others word by word.
+_SPANNING_CHARS = re.compile(r"[\[\]<>]")
+_LINES = re.compile(r"[^\n]*\n|[^\n]+")
+_WORD_UNITS = re.compile(r"\S+\s*|\s+")
+
+# Running sums are recomputed from the counts this often to stop float drift
+_RESYNC_EVERY = 500
+
+
+class StaleRevisionError(ValueError):
+    """Raised when an edit was made against an outdated session revision."""
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    """Length of the common prefix (binary search over C-level slice compares)."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_length(a: str, b: str, limit: int) -> int:
+    """Length of the common suffix, at most limit characters."""
+    lo, hi = 0, min(len(a), len(b), limit)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def split_units(text: str) -> List[str]:
+    """Split raw text into units that clean_text can process independently."""
+    units = []
+    for line in _LINES.findall(text):
+        if _SPANNING_CHARS.search(line):
+            units.append(line)
+        else:
+            units.extend(_WORD_UNITS.findall(line))
+    return units
+
+
+class LinearScorer:
+    """
+    Scores n-gram counts with a TF-IDF vectorizer and a binary logistic model.
+
+    Built once per model version. If the model or vectorizer is not of a
+    supported kind (TfidfVectorizer over words; binary LogisticRegression
+    or log-loss SGDClassifier), incremental is False and sessions fall
+    back to vectorizing their whole cleaned text on every update.
+    """
+
+    def __init__(self, model: Any, vectorizer: Any, version: Optional[str]):
+        """
+        Initialize the scorer.
+
+        Args:
+            model: Fitted classifier
+            vectorizer: Fitted vectorizer
+            version: Model version the pair belongs to
+        """
+        self.model = model
+        self.vectorizer = vectorizer
+        self.version = version
+        self.incremental = self._supports_incremental(model, vectorizer)
+
+        if self.incremental:
+            self.vocabulary: Dict[str, int] = vectorizer.vocabulary_
+            self.min_n, self.max_n = vectorizer.ngram_range
+            self.idf = vectorizer.idf_ if vectorizer.use_idf else np.ones(len(self.vocabulary))
+            self.coef = model.coef_[0]
+            self.intercept = float(model.intercept_[0])
+            self.norm = vectorizer.norm
+            self.sublinear_tf = vectorizer.sublinear_tf
+            self.classes = model.classes_
+            preprocess = vectorizer.build_preprocessor()
+            tokenize = vectorizer.build_tokenizer()
+            stop_words = vectorizer.get_stop_words() or ()
+            self.tokenize = lambda text: [t for t in tokenize(preprocess(text)) if t not in stop_words]
+        else:
+            self.tokenize = str.split
+
+    @staticmethod
+    def _supports_incremental(model: Any, vectorizer: Any) -> bool:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+        if not isinstance(vectorizer, TfidfVectorizer) or vectorizer.analyzer != 'word':
+            return False
+        if not hasattr(vectorizer, 'vocabulary_'):
+            return False
+        logistic = isinstance(model, LogisticRegression) or (
+            isinstance(model, SGDClassifier) and model.loss == 'log_loss'
+        )
+        return logistic and getattr(model, 'coef_', np.empty((0, 0))).shape[0] == 1
+
+    def weight(self, column: int, count: int) -> float:
+        """TF-IDF weight (before normalization) of a column occurring count times."""
+        if count <= 0:
+            return 0.0
+        tf = 1.0 + math.log(count) if self.sublinear_tf else float(count)
+        return tf * float(self.idf[column])
+
+    def ngram_columns(self, tokens: List[str], lo: int, hi: int) -> List[int]:
+        """
+        Vocabulary columns of the n-grams that start at a position in
+        [lo, hi) or overlap it, within the token list.
+        """
+        columns = []
+        vocabulary = self.vocabulary
+        for n in range(self.min_n, self.max_n + 1):
+            for i in range(max(lo - n + 1, 0), min(hi, len(tokens) - n + 1)):
+                column = vocabulary.get(tokens[i] if n == 1 else " ".join(tokens[i:i + n]))
+                if column is not None:
+                    columns.append(column)
+        return columns
+
+    def result(self, decision: float) -> Tuple[str, float, bool]:
+        """(label, confidence, is_fake) from a decision value, as ModelService reports it."""
+        positive = 1.0 / (1.0 + math.exp(-decision)) if decision > -700 else 0.0
+        prediction = self.classes[1] if positive > 0.5 else self.classes[0]
+        confidence = positive if positive > 0.5 else 1.0 - positive
+        return ("TRUE" if prediction == 1 else "FAKE", float(confidence), bool(prediction == 0))
+
+    def score_full(self, tokens: List[str]) -> Tuple[str, float, bool]:
+        """Score by vectorizing the whole cleaned text (non-incremental models)."""
+        probabilities = self.model.predict_proba(self.vectorizer.transform([" ".join(tokens)]))[0]
+        column = int(probabilities.argmax())
+        prediction = self.model.classes_[column]
+        return ("TRUE" if prediction == 1 else "FAKE", float(probabilities[column]), bool(prediction == 0))
+
+
+class ScoringSession:
+    """
+    Text being edited, with the state needed to re-score it incrementally.
+
+    Updates are serialized by a lock. Each one bumps the revision and
+    wakes listeners waiting in wait_for_update (the event stream).
+    """
+
+    def __init__(self, session_id: str, processor: Any, scorer: LinearScorer):
+        """
+        Initialize an empty session.
+
+        Args:
+            session_id: Identifier handed to the client
+            processor: TextProcessor used to clean units
+            scorer: Scorer for the current model version
+        """
+        self.session_id = session_id
+        self.revision = 0
+        self.last_used = time.monotonic()
+        self.closed = False
+        self._processor = processor
+        self._condition = threading.Condition()
+        self._result: dict = {}
+        self._reset_state(scorer)
+
+    def _reset_state(self, scorer: LinearScorer) -> None:
+        self._scorer = scorer
+        self._text = ""
+        self._units: List[str] = []
+        self._unit_chars = np.zeros(0, dtype=np.int64)
+        self._unit_tokens = np.zeros(0, dtype=np.int64)
+        self._tokens: List[str] = []
+        self._counts: Dict[int, int] = {}
+        self._dot = 0.0
+        self._sum_squares = 0.0
+        self._sum_weights = 0.0
+        self._updates = 0
+
+    @property
+    def text(self) -> str:
+        """Current text of the session."""
+        return self._text
+
+    @property
+    def result(self) -> dict:
+        """Latest scoring result (with revision)."""
+        with self._condition:
+            return dict(self._result)
+
+    def set_text(self, text: str, scorer: LinearScorer) -> dict:
+        """
+        Replace the whole text; only the changed region is re-processed.
+
+        The region is found from the common prefix and suffix of the old
+        and new text.
+        """
+        with self._condition:
+            old = self._text
+            prefix = _common_prefix_length(old, text)
+            suffix = _common_suffix_length(old, text, min(len(old), len(text)) - prefix)
+            return self._apply(prefix, len(old) - suffix, text[prefix:len(text) - suffix], scorer)
+
+    def apply_edit(self, start: int, end: int, replacement: str, scorer: LinearScorer,
+                   revision: Optional[int] = None) -> dict:
+        """
+        Replace text[start:end] with replacement.
+
+        Args:
+            start, end: Character range of the current text to replace
+            replacement: New text for that range
+            scorer: Scorer for the current model version
+            revision: Revision the edit was made against; if given and not
+                current, the edit is rejected
+
+        Raises:
+            StaleRevisionError: If the revision is not current
+            ValueError: If the range is outside the text
+        """
+        with self._condition:
+            if revision is not None and revision != self.revision:
+                raise StaleRevisionError(f"Stale revision {revision}; current revision is {self.revision}")
+            if not (0 <= start <= end <= len(self._text)):
+                raise ValueError("Edit range is outside the text")
+            return self._apply(start, end, replacement, scorer)
+
+    def _apply(self, start: int, end: int, replacement: str, scorer: LinearScorer) -> dict:
+        """Apply an edit and re-score; the caller holds the condition lock."""
+        started = time.perf_counter()
+        self.last_used = time.monotonic()
+
+        if scorer is not self._scorer:
+            # New model: rebuild everything once against it
+            text = self._text[:start] + replacement + self._text[end:]
+            self._reset_state(scorer)
+            start, end, replacement = 0, 0, text
+
+        processed = self._replace_region(start, end, replacement)
+
+        if not self._text.strip():
+            result = {"error": "Empty text provided"}
+        elif not self._tokens:
+            result = {"error": "Text contains no valid words after preprocessing"}
+        else:
+            label, confidence, is_fake = self._score()
+            result = {"label": label, "confidence": confidence, "is_fake": is_fake}
+
+        self.revision += 1
+        self._result = {
+            **result,
+            "revision": self.revision,
+            "chars_processed": processed,
+            "incremental": self._scorer.incremental,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+        self._condition.notify_all()
+        return dict(self._result)
+
+    def _replace_region(self, start: int, end: int, replacement: str) -> int:
+        """
+        Re-split, re-clean and re-count the units around an edit.
+
+        Returns:
+            Number of raw characters that were re-cleaned
+        """
+        units = self._units
+        ends = np.cumsum(self._unit_chars)
+        count = len(units)
+
+        # Units overlapping the edit, plus one neighbour on each side so
+        # words merged or split by the edit are re-cleaned too
+        first = int(np.searchsorted(ends, start, side='right'))
+        last = int(np.searchsorted(ends, end, side='left')) + 1
+        first = max(first - 1, 0)
+        last = min(last + 1, count)
+
+        def region_bounds(first: int, last: int) -> Tuple[int, int]:
+            region_start = int(ends[first] - self._unit_chars[first]) if first < count else len(self._text)
+            region_end = int(ends[last - 1]) if last > first else region_start
+            return region_start, region_end
+
+        region_start, region_end = region_bounds(first, last)
+        region = self._text[region_start:start] + replacement + self._text[end:region_end]
+        if _SPANNING_CHARS.search(region):
+            # The region's lines must be cleaned whole
+            while first > 0 and not units[first - 1].endswith("\n"):
+                first -= 1
+            while last < count and not units[last - 1].endswith("\n"):
+                last += 1
+            region_start, region_end = region_bounds(first, last)
+            region = self._text[region_start:start] + replacement + self._text[end:region_end]
+
+        new_units = split_units(region)
+        tokenize = self._scorer.tokenize
+        clean = self._processor.clean_text
+        new_unit_tokens = [tokenize(clean(unit)) if unit.strip() else [] for unit in new_units]
+        new_tokens = [token for tokens in new_unit_tokens for token in tokens]
+
+        token_start = int(self._unit_tokens[:first].sum())
+        token_end = token_start + int(self._unit_tokens[first:last].sum())
+
+        # N-grams overlapping the replaced tokens (including those spanning
+        # into the unchanged neighbours) are uncounted, then the new ones counted
+        scorer = self._scorer
+        delta: Dict[int, int] = {}
+        if scorer.incremental:
+            for column in scorer.ngram_columns(self._tokens, token_start, token_end):
+                delta[column] = delta.get(column, 0) - 1
+        self._tokens[token_start:token_end] = new_tokens
+        if scorer.incremental:
+            for column in scorer.ngram_columns(self._tokens, token_start, token_start + len(new_tokens)):
+                delta[column] = delta.get(column, 0) + 1
+            self._apply_counts(delta)
+
+        units[first:last] = new_units
+        self._unit_chars = np.concatenate([
+            self._unit_chars[:first],
+            np.fromiter((len(unit) for unit in new_units), dtype=np.int64, count=len(new_units)),
+            self._unit_chars[last:]
+        ])
+        self._unit_tokens = np.concatenate([
+            self._unit_tokens[:first],
+            np.fromiter((len(tokens) for tokens in new_unit_tokens), dtype=np.int64, count=len(new_units)),
+            self._unit_tokens[last:]
+        ])
+        self._text = self._text[:start] + replacement + self._text[end:]
+        return len(region)
+
+    def _apply_counts(self, delta: Dict[int, int]) -> None:
+        """Update n-gram counts and the running TF-IDF sums."""
+        scorer = self._scorer
+        counts = self._counts
+        for column, change in delta.items():
+            if not change:
+                continue
+            old = counts.get(column, 0)
+            new = old + change
+            if new:
+                counts[column] = new
+            else:
+                del counts[column]
+            old_weight = scorer.weight(column, old)
+            new_weight = scorer.weight(column, new)
+            self._dot += (new_weight - old_weight) * float(scorer.coef[column])
+            self._sum_squares += new_weight * new_weight - old_weight * old_weight
+            self._sum_weights += new_weight - old_weight
+
+        self._updates += 1
+        if self._updates % _RESYNC_EVERY == 0:
+            weights = {column: scorer.weight(column, value) for column, value in counts.items()}
+            self._dot = math.fsum(w * float(scorer.coef[c]) for c, w in weights.items())
+            self._sum_squares = math.fsum(w * w for w in weights.values())
+            self._sum_weights = math.fsum(weights.values())
+
+    def _score(self) -> Tuple[str, float, bool]:
+        scorer = self._scorer
+        if not scorer.incremental:
+            return scorer.score_full(self._tokens)
+
+        if scorer.norm == 'l2':
+            norm = math.sqrt(max(self._sum_squares, 0.0))
+        elif scorer.norm == 'l1':
+            norm = self._sum_weights
+        else:
+            norm = 1.0
+        decision = scorer.intercept + (self._dot / norm if norm > 1e-12 else 0.0)
+        return scorer.result(decision)
+
+    def wait_for_update(self, after_revision: int, timeout: float) -> Optional[dict]:
+        """
+        Block until the session has a revision newer than after_revision.
+
+        Returns:
+            The latest result, or None on timeout or when the session closed
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.revision > after_revision or self.closed, timeout)
+            if self.closed or self.revision <= after_revision:
+                return None
+            return dict(self._result)
+
+    def close(self) -> None:
+        """Mark the session closed and release waiting listeners."""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+
+class ScoringSessionManager:
+    """
+    Bounded set of scoring sessions for a model service.
+
+    Sessions idle for longer than idle_timeout are dropped, and the least
+    recently used session is dropped when max_sessions is reached.
+    Scoring always runs in this process, since session state lives here.
+    """
+
+    def __init__(self, service: Any, max_sessions: int = 1000, idle_timeout: float = 600.0):
+        """
+        Initialize the manager.
+
+        Args:
+            service: ModelService providing the model and text processor
+            max_sessions: Maximum concurrent sessions
+            idle_timeout: Seconds after which an unused session is dropped
+        """
+        if max_sessions <= 0 or idle_timeout <= 0:
+            raise ValueError("max_sessions and idle_timeout must be positive")
+
+        self._service = service
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions: "OrderedDict[str, ScoringSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._scorer: Optional[LinearScorer] = None
+
+    def _current_scorer(self) -> LinearScorer:
+        """Scorer for the loaded model, rebuilt when the model version changes."""
+        model, vectorizer, version = self._service.model_snapshot()
+        scorer = self._scorer
+        if scorer is None or scorer.model is not model or scorer.vectorizer is not vectorizer:
+            scorer = LinearScorer(model, vectorizer, version)
+            self._scorer = scorer
+        return scorer
+
+    def _expire(self, make_room: bool = False) -> None:
+        """Drop idle sessions (and the oldest one if room is needed); the caller holds the lock."""
+        cutoff = time.monotonic() - self.idle_timeout
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            full = make_room and len(self._sessions) >= self.max_sessions
+            if session.last_used >= cutoff and not full:
+                break
+            del self._sessions[session_id]
+            session.close()
+
+    def create(self, text: str = "") -> ScoringSession:
+        """Open a session, scoring its initial text if any."""
+        scorer = self._current_scorer()
+        session = ScoringSession(uuid.uuid4().hex, self._service.text_processor, scorer)
+        with self._lock:
+            self._expire(make_room=True)
+            self._sessions[session.session_id] = session
+        session.set_text(text, scorer)
+        return session
+
+    def get(self, session_id: str) -> ScoringSession:
+        """
+        Look up a live session.
+
+        Raises:
+            KeyError: If there is no such session (or it expired)
+        """
+        with self._lock:
+            self._expire()
+            session = self._sessions[session_id]
+            self._sessions.move_to_end(session_id)
+            session.last_used = time.monotonic()
+            return session
+
+    def set_text(self, session_id: str, text: str) -> dict:
+        """Replace a session's text and return the new result."""
+        return self.get(session_id).set_text(text, self._current_scorer())
+
+    def apply_edit(self, session_id: str, start: int, end: int, replacement: str,
+                   revision: Optional[int] = None) -> dict:
+        """Apply a range edit to a session and return the new result."""
+        return self.get(session_id).apply_edit(start, end, replacement, self._current_scorer(), revision)
+
+    def close(self, session_id: str) -> bool:
+        """Close a session; False if it did not exist."""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        session.close()
+        return True
+
+    @property
+    def active_sessions(self) -> int:
+        """Number of open sessions."""
+        with self._lock:
+            return len(self._sessions)
@@ -0,0 +1,190 @@
+"""
+Full-text search over sample texts.
+Maintains a BM25-ranked inverted index built from the same cleaned
+tokens the model sees, and updates it incrementally when the sample
+set changes.
+"""
+import math
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from src.utils.text_processor import TextProcessor
+
+
+class SearchIndex:
+    """
+    Inverted index mapping cleaned terms to the texts containing them.
+
+    Updates only clean texts that were not indexed before and remove
+    texts that disappeared; unchanged texts keep their postings. For
+    queries, each term's postings are compiled once into numpy arrays
+    of document ids and BM25 weights, so scoring a term costs a few
+    vectorized operations regardless of how many documents contain it.
+    """
+
+    def __init__(self, text_processor: Optional[TextProcessor] = None,
+                 k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize the search index.
+
+        Args:
+            text_processor: Processor used to tokenize texts and queries
+            k1: BM25 term-frequency saturation parameter
+            b: BM25 document-length normalization parameter
+        """
+        self._text_processor = text_processor or TextProcessor()
+        self.k1 = k1
+        self.b = b
+        # term -> {doc id: term frequency}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._doc_ids: Dict[str, int] = {}
+        self._doc_texts: Dict[int, str] = {}
+        self._doc_terms: Dict[int, Counter] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._total_length = 0
+        self._next_id = 0
+        # term -> (doc ids, BM25 term weights), valid until the next update
+        self._compiled: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def tokenize(self, text: str) -> List[str]:
+        """Split text into the cleaned, lemmatized terms used for indexing."""
+        return self._text_processor.clean_text(text).split()
+
+    def update(self, texts: Iterable[str]) -> Tuple[int, int]:
+        """
+        Make the index contain exactly the given texts.
+
+        New texts are tokenized before the index lock is taken, so
+        searches only wait while postings are being patched.
+
+        Args:
+            texts: Full set of texts that should be searchable
+
+        Returns:
+            Tuple of (texts added, texts removed)
+        """
+        wanted = set(texts)
+        current = self._doc_ids
+        added = [(text, Counter(self.tokenize(text))) for text in wanted if text not in current]
+
+        with self._lock:
+            removed = [text for text in self._doc_ids if text not in wanted]
+            for text in removed:
+                self._remove(text)
+            for text, terms in added:
+                self._add(text, terms)
+            if removed or added:
+                # Average document length changed, so every weight is stale
+                self._compiled = {}
+
+        return len(added), len(removed)
+
+    def _add(self, text: str, terms: Counter) -> None:
+        """Add one document's postings (caller holds the lock)."""
+        doc_id = self._next_id
+        self._next_id += 1
+
+        self._doc_ids[text] = doc_id
+        self._doc_texts[doc_id] = text
+        self._doc_terms[doc_id] = terms
+        length = sum(terms.values())
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+
+    def _remove(self, text: str) -> None:
+        """Remove one document's postings (caller holds the lock)."""
+        doc_id = self._doc_ids.pop(text)
+        del self._doc_texts[doc_id]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+
+        for term in self._doc_terms.pop(doc_id):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> Tuple[int, List[Tuple[str, float]]]:
+        """
+        Find texts matching any query term, ranked by BM25 score.
+
+        Args:
+            query: Free-text query, cleaned the same way as indexed texts
+            limit: Maximum number of results to return
+            offset: Number of top-ranked results to skip
+
+        Returns:
+            Tuple of (total matching texts, [(text, score), ...] for the page)
+        """
+        terms = set(self.tokenize(query))
+        if not terms or limit <= 0:
+            return 0, []
+
+        with self._lock:
+            doc_count = len(self._doc_ids)
+            if doc_count == 0:
+                return 0, []
+
+            ids_parts, score_parts = [], []
+            for term in terms:
+                compiled = self._compile(term)
+                if compiled is None:
+                    continue
+                doc_ids, weights = compiled
+                idf = math.log(1 + (doc_count - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+                ids_parts.append(doc_ids)
+                score_parts.append(weights * idf)
+
+            if not ids_parts:
+                return 0, []
+            if len(ids_parts) == 1:
+                doc_ids, scores = ids_parts[0], score_parts[0]
+            else:
+                # Sum the per-term scores of documents matching several terms
+                dense = np.bincount(np.concatenate(ids_parts), weights=np.concatenate(score_parts))
+                doc_ids = np.flatnonzero(dense > 0)
+                scores = dense[doc_ids]
+
+            total = len(doc_ids)
+            wanted = min(offset + limit, total)
+            if offset >= total:
+                return total, []
+            if wanted < total:
+                candidates = np.argpartition(-scores, wanted - 1)[:wanted]
+            else:
+                candidates = np.arange(total)
+            # Order by descending score, then by insertion order for stable pages
+            order = candidates[np.lexsort((doc_ids[candidates], -scores[candidates]))]
+            page = [
+                (self._doc_texts[int(doc_ids[i])], float(scores[i]))
+                for i in order[offset:wanted]
+            ]
+
+        return total, page
+
+    def _compile(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Get a term's doc ids and BM25 weights as arrays (caller holds the lock)."""
+        compiled = self._compiled.get(term)
+        if compiled is None:
+            postings = self._postings.get(term)
+            if not postings:
+                return None
+            doc_ids = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+            frequencies = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+            lengths = np.fromiter(
+                (self._doc_lengths[doc_id] for doc_id in postings),
+                dtype=np.float64, count=len(postings)
+            )
+            average_length = self._total_length / len(self._doc_ids)
+            norms = self.k1 * (1 - self.b + self.b * lengths / average_length)
+            weights = frequencies * (self.k1 + 1) / (frequencies + norms)
+            compiled = (doc_ids, weights)
+            self._compiled[term] = compiled
+        return compiled
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
@@ -0,0 +1,304 @@
+"""
+Streaming prediction for long-lived feed connections.
+Items read from many client streams are coalesced into micro-batches for
+the model service, and results go back to each stream as they finish.
+Every stage is bounded: a stream stops reading its client once too many
+of its results are undelivered, and the shared batch queue blocks
+producers when scoring falls behind.
+"""
+import json
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Marker put on a stream's output queue once its reader has finished
+_END = object()
+
+
+class MicroBatcher:
+    """
+    Coalesces texts submitted from any thread into model batches.
+
+    A batch is scored as soon as max_batch texts are queued or max_wait
+    seconds after its first text arrived, whichever comes first, so a
+    busy feed gets large batches and a quiet one low latency.
+    """
+
+    def __init__(self, service: Any, max_batch: int = 64, max_wait: float = 0.01,
+                 workers: int = 2, max_queue: int = 1024):
+        """
+        Initialize the batcher; worker threads start on first use.
+
+        Args:
+            service: ModelService used to score batches
+            max_batch: Maximum texts per batch
+            max_wait: Seconds to wait for a batch to fill up
+            workers: Batches scored concurrently (useful with the process pool)
+            max_queue: Maximum texts waiting to be batched
+        """
+        if max_batch <= 0 or workers <= 0 or max_queue <= 0:
+            raise ValueError("max_batch, workers and max_queue must be positive")
+        if max_wait < 0:
+            raise ValueError("max_wait must be zero or positive")
+
+        self._service = service
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.workers = workers
+        self._queue: "queue.Queue[Tuple[str, Callable[[dict], None]]]" = queue.Queue(maxsize=max_queue)
+        self._threads: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._largest = 0
+        self._busy_seconds = 0.0
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"stream-batcher-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, text: str, callback: Callable[[dict], None], timeout: Optional[float] = None) -> None:
+        """
+        Queue a text for scoring.
+
+        Args:
+            text: Text to score
+            callback: Called from a batcher thread with the result dict
+            timeout: Seconds to wait while the queue is full (None blocks)
+
+        Raises:
+            queue.Full: If the queue stayed full for timeout seconds
+        """
+        self._ensure_started()
+        self._queue.put((text, callback), timeout=timeout)
+
+    def _next_batch(self) -> List[Tuple[str, Callable[[dict], None]]]:
+        """Block for one item, then gather more until the batch is full or max_wait passes."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            started = time.perf_counter()
+            try:
+                results = [result.to_dict() for result in self._service.predict_batch([text for text, _ in batch])]
+            except Exception as e:
+                results = [{"error": f"Prediction failed: {str(e)}"}] * len(batch)
+
+            with self._stats_lock:
+                self._batches += 1
+                self._items += len(batch)
+                self._largest = max(self._largest, len(batch))
+                self._busy_seconds += time.perf_counter() - started
+
+            for (_, callback), result in zip(batch, results):
+                try:
+                    callback(result)
+                except Exception as e:
+                    print(f"Warning: Stream result callback failed: {e}")
+
+    @property
+    def stats(self) -> dict:
+        """Batch counters and current queue depth."""
+        with self._stats_lock:
+            return {
+                "batches": self._batches,
+                "items": self._items,
+                "mean_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+                "largest_batch": self._largest,
+                "busy_seconds": round(self._busy_seconds, 3),
+                "queue_depth": self._queue.qsize(),
+                "max_batch": self.max_batch,
+                "max_wait": self.max_wait,
+                "workers": self.workers,
+            }
+
+
+def _iter_lines(stream: Any, max_line_bytes: int) -> Iterator[Optional[bytes]]:
+    """
+    Read lines from a request body, yielding each as soon as it arrives.
+
+    Lines longer than max_line_bytes are skipped and yielded as None.
+    The stream is read as is, never through a BufferedReader: raw chunked
+    inputs such as werkzeug's fill a whole buffer before returning, which
+    would hold back items until kilobytes more had arrived.
+    """
+    while True:
+        line = stream.readline(max_line_bytes)
+        if not line:
+            return
+        if len(line) >= max_line_bytes and not line.endswith(b"\n"):
+            yield None
+            while True:
+                rest = stream.readline(max_line_bytes)
+                if not rest or rest.endswith(b"\n"):
+                    break
+            continue
+        yield line
+
+
+class ScoringStream:
+    """
+    One client connection of a scoring feed.
+
+    A reader thread parses items from the request body and submits them
+    to the batcher; results() yields them back in completion order. At
+    most window items may be read but not yet handed to the client, so a
+    slow consumer stops the reader and, through TCP, the producer.
+    """
+
+    def __init__(self, batcher: MicroBatcher, body: Any, window: int = 256,
+                 max_chars: Optional[int] = None, max_line_bytes: int = 1_000_000):
+        """
+        Initialize the stream and start reading.
+
+        Args:
+            batcher: Shared micro-batcher
+            body: Request body stream of newline-delimited items
+            window: Maximum items read but not yet delivered
+            max_chars: Texts longer than this are answered with an error
+            max_line_bytes: Lines longer than this are answered with an error
+        """
+        if window <= 0:
+            raise ValueError("window must be positive")
+
+        self._batcher = batcher
+        self._body = body
+        self.window = window
+        self.max_chars = max_chars
+        self.max_line_bytes = max_line_bytes
+        self._slots = threading.Semaphore(window)
+        self._output: "queue.Queue[Any]" = queue.Queue()
+        self._closed = threading.Event()
+        self.received = 0
+        self.delivered = 0
+        self._reader = threading.Thread(target=self._read, name="stream-reader", daemon=True)
+        self._reader.start()
+
+    def _parse(self, line: bytes, seq: int) -> Tuple[Any, Optional[str], Optional[str]]:
+        """
+        Parse one input line.
+
+        Lines are JSON objects {"id": ..., "text": ...} (id optional,
+        defaulting to the item's 1-based sequence number) or bare JSON
+        strings.
+
+        Returns:
+            (item id, text, error message)
+        """
+        try:
+            item = json.loads(line)
+        except ValueError:
+            return seq, None, "Line is not valid JSON"
+
+        if isinstance(item, str):
+            item_id, text = seq, item
+        elif isinstance(item, dict):
+            item_id, text = item.get("id", seq), item.get("text")
+        else:
+            return seq, None, "Item must be a JSON object or string"
+
+        if not isinstance(text, str) or not text.strip():
+            return item_id, None, "Empty text provided"
+        if self.max_chars is not None and len(text) > self.max_chars:
+            return item_id, None, f"Text exceeds maximum length of {self.max_chars} characters"
+        return item_id, text, None
+
+    def _wait(self, action: Callable[[], bool]) -> bool:
+        """Retry a blocking action with a short timeout until it succeeds or the stream closes."""
+        while not self._closed.is_set():
+            if action():
+                return True
+        return False
+
+    def _read(self) -> None:
+        def submit() -> bool:
+            try:
+                self._batcher.submit(text, deliver, timeout=0.5)
+                return True
+            except queue.Full:
+                return False
+
+        try:
+            for line in _iter_lines(self._body, self.max_line_bytes):
+                if line is not None:
+                    line = line.strip()
+                    if not line:
+                        continue
+                if not self._wait(lambda: self._slots.acquire(timeout=0.5)):
+                    return
+                self.received += 1
+                if line is None:
+                    item_id, text, error = self.received, None, f"Line exceeds {self.max_line_bytes} bytes"
+                else:
+                    item_id, text, error = self._parse(line, self.received)
+
+                if error is not None:
+                    self._output.put({"id": item_id, "error": error})
+                    continue
+
+                def deliver(result: dict, item_id: Any = item_id) -> None:
+                    self._output.put({"id": item_id, **result})
+
+                if not self._wait(submit):
+                    return
+        except Exception as e:
+            # Client went away mid-body; results already queued are still delivered
+            print(f"Warning: Stream input ended early: {e}")
+        finally:
+            self._output.put(_END)
+
+    def results(self, keepalive: Optional[float] = None) -> Iterator[Optional[dict]]:
+        """
+        Yield results as they finish, until every received item is answered.
+
+        Each result frees a window slot once the consumer asks for the
+        next one, i.e. after the previous result has been written out.
+
+        Args:
+            keepalive: If set, None is yielded after this many idle seconds
+
+        Yields:
+            Result dicts with the item id, or None as a keep-alive tick
+        """
+        finished = False
+        try:
+            while not finished or self.delivered < self.received:
+                try:
+                    item = self._output.get(timeout=keepalive)
+                except queue.Empty:
+                    yield None
+                    continue
+                if item is _END:
+                    finished = True
+                    continue
+                self.delivered += 1
+                yield item
+                self._slots.release()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop reading; results still in flight are dropped."""
+        self._closed.set()
+
+    @property
+    def summary(self) -> Dict[str, int]:
+        """Items received and delivered so far."""
+        return {"received": self.received, "delivered": self.delivered}
+
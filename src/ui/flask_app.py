@@ -2,12 +2,20 @@
 Flask API for the Fake News Detector.
 Provides RESTful endpoints for predictions and sample headlines.
 """
-from flask import Flask, request, jsonify, send_from_directory
+import base64
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
 from pathlib import Path
 from src.config import config
+from src.services.admission import AdmissionController, LaneRouter, OverloadedError
+from src.services.health import ReadinessMonitor
 from src.services.model_service import model_service
 from src.services.sample_service import sample_service
+from src.services.scoring_session import ScoringSessionManager, StaleRevisionError
+from src.services.stream_scoring import MicroBatcher, ScoringStream
 
 
 # Initialize Flask app
@@ -18,11 +26,86 @@ CORS(app)
 try:
     model_service.load_model()
     sample_service.load_samples()
+    sample_service.attach_model(model_service)
+    if config.DEDUP_ENABLED:
+        model_service.enable_dedup()
+    if config.PREDICTION_CACHE_ENABLED:
+        model_service.enable_prediction_cache()
+    if config.SAMPLES_RELOAD_INTERVAL > 0:
+        sample_service.start_auto_reload(config.SAMPLES_RELOAD_INTERVAL)
+    if config.MODEL_RELOAD_INTERVAL > 0:
+        model_service.start_auto_reload(config.MODEL_RELOAD_INTERVAL)
     print("✓ Model and samples loaded successfully")
 except Exception as e:
     print(f"✗ Error loading services: {e}")
 
 
+# Size-based admission lanes shared by the prediction routes
+prediction_lanes = LaneRouter.from_config(
+    config.PREDICTION_LANES,
+    queue_timeout=config.PREDICTION_QUEUE_TIMEOUT,
+    retry_after=config.RETRY_AFTER_SECONDS
+)
+
+# Background canary backing the readiness probe, scored in every lane
+readiness_monitor = ReadinessMonitor(
+    model_service,
+    canary_text=config.CANARY_TEXT,
+    interval=config.READINESS_CHECK_INTERVAL,
+    lanes=[lane.name for lane in prediction_lanes.lanes]
+)
+readiness_monitor.start()
+
+
+# Incremental as-you-type scoring sessions
+scoring_sessions = ScoringSessionManager(
+    model_service,
+    max_sessions=config.SESSION_MAX_ACTIVE,
+    idle_timeout=config.SESSION_IDLE_TIMEOUT
+)
+session_streams = AdmissionController(
+    max_in_flight=config.SESSION_MAX_EVENT_STREAMS,
+    max_queue=0,
+    queue_timeout=0,
+    retry_after=config.RETRY_AFTER_SECONDS
+)
+
+# Long-lived feed connections share one micro-batcher
+stream_batcher = MicroBatcher(
+    model_service,
+    max_batch=config.STREAM_MAX_BATCH,
+    max_wait=config.STREAM_MAX_WAIT,
+    workers=config.STREAM_BATCH_WORKERS,
+    max_queue=config.STREAM_QUEUE_SIZE
+)
+stream_connections = AdmissionController(
+    max_in_flight=config.STREAM_MAX_CONNECTIONS,
+    max_queue=0,
+    queue_timeout=0,
+    retry_after=config.RETRY_AFTER_SECONDS
+)
+
+
+def overloaded_response(error: OverloadedError) -> Response:
+    """Build a 503 response telling the client when to retry."""
+    response = jsonify({"error": str(error)})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+def too_long_response() -> Response:
+    """413 response for a text over MAX_INPUT_CHARS."""
+    response = jsonify({"error": f"Text exceeds maximum length of {config.MAX_INPUT_CHARS} characters"})
+    response.status_code = 413
+    return response
+
+
+def text_too_long(text: str) -> bool:
+    """Check a text against the configured input size cap."""
+    return config.MAX_INPUT_CHARS is not None and len(text) > config.MAX_INPUT_CHARS
+
+
 @app.route('/')
 def index():
     """Serve the main HTML page."""
@@ -51,6 +134,9 @@ def predict():
         {
             "error": "Error message"
         }
+    
+    Returns 413 when the text exceeds MAX_INPUT_CHARS, and 503 with a
+    Retry-After header when the server is overloaded.
     """
     try:
         # Get request data
@@ -58,11 +144,20 @@ def predict():
         text = payload.get('text', '')
         
         # Validate input
-        if not text or not text.strip():
+        if not isinstance(text, str) or not text.strip():
             return jsonify({"error": "Empty text provided"}), 400
         
-        # Make prediction
-        result = model_service.predict(text)
+        if text_too_long(text):
+            return too_long_response()
+        
+        # Sample texts are answered from their precomputed predictions
+        result = sample_service.get_prediction(text)
+        
+        # Make prediction in the lane matching the input size
+        if result is None:
+            lane = prediction_lanes.lane_for(len(text))
+            with prediction_lanes.admit(lane):
+                result = model_service.predict(text, lane=lane.name)
         
         # Check for prediction errors
         if not result.is_valid:
@@ -75,14 +170,286 @@ def predict():
             "is_fake": result.is_fake
         })
         
+    except OverloadedError as e:
+        return overloaded_response(e)
     except Exception as e:
         return jsonify({"error": f"Prediction failed: {str(e)}"}), 500
 
 
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """
+    Predict a batch of news texts in one request.
+    
+    Request JSON:
+        {
+            "texts": ["First headline", "Second headline", ...]
+        }
+    
+    Response JSON:
+        {
+            "predictions": [
+                {"label": "FAKE", "confidence": 0.95, "is_fake": true},
+                {"error": "Empty text provided"},
+                ...
+            ]
+        }
+    """
+    try:
+        # Get request data
+        payload = request.get_json(force=True) or {}
+        texts = payload.get('texts')
+        
+        # Validate input
+        if not isinstance(texts, list) or not texts:
+            return jsonify({"error": "'texts' must be a non-empty list"}), 400
+        
+        if not all(isinstance(text, str) for text in texts):
+            return jsonify({"error": "All texts must be strings"}), 400
+        
+        if any(text_too_long(text) for text in texts):
+            return too_long_response()
+        
+        # Group texts by size lane and score each group in its own lane
+        groups: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            groups.setdefault(prediction_lanes.lane_for(len(text)).name, []).append(i)
+        
+        results = [None] * len(texts)
+        for lane in prediction_lanes.lanes:
+            indices = groups.get(lane.name)
+            if not indices:
+                continue
+            with prediction_lanes.admit(lane):
+                lane_results = model_service.predict_batch(
+                    [texts[i] for i in indices], lane=lane.name
+                )
+            for i, result in zip(indices, lane_results):
+                results[i] = result
+        
+        return jsonify({
+            "predictions": [
+                {
+                    "label": r.label,
+                    "confidence": r.confidence,
+                    "is_fake": r.is_fake
+                } if r.is_valid else {"error": r.error}
+                for r in results
+            ]
+        })
+        
+    except OverloadedError as e:
+        return overloaded_response(e)
+    except Exception as e:
+        return jsonify({"error": f"Prediction failed: {str(e)}"}), 500
+
+
+class ResponseCache:
+    """
+    Cache of serialized JSON response bodies for one sample-set version.
+    
+    Bodies and their strong ETags are built once per version and reused
+    until the samples reload, at which point the whole cache is dropped.
+    """
+    
+    def __init__(self, max_entries: int = 128):
+        """
+        Initialize the response cache.
+        
+        Args:
+            max_entries: Maximum number of cached bodies per version
+        """
+        self.max_entries = max_entries
+        self._version = None
+        self._entries: Dict[Hashable, Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, version: Hashable,
+            build_payload: Callable[[], Any]) -> Tuple[bytes, str]:
+        """
+        Get the serialized body and ETag for a key, building it if needed.
+        
+        Args:
+            key: Cache key identifying the response (e.g. endpoint and arguments)
+            version: Version of the data the response is built from
+            build_payload: Callable returning the JSON payload to serialize
+            
+        Returns:
+            Tuple of (body bytes, ETag)
+        """
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            
+            entry = self._entries.get(key)
+            if entry is None:
+                body = app.json.dumps(build_payload()).encode('utf-8')
+                entry = (body, hashlib.sha256(body).hexdigest()[:32])
+                if len(self._entries) >= self.max_entries:
+                    # Drop the oldest entry (dicts keep insertion order)
+                    self._entries.pop(next(iter(self._entries)))
+                self._entries[key] = entry
+            
+            return entry
+
+
+samples_cache = ResponseCache()
+
+
+def cached_json_response(key: Hashable, build_payload: Callable[[], Any]) -> Response:
+    """
+    Serve a cached JSON body with ETag and Cache-Control headers.
+    
+    Answers with 304 Not Modified when the client's If-None-Match
+    header matches the current ETag.
+    """
+    version = sample_service.version
+    body, etag = samples_cache.get(key, version, build_payload)
+    response = Response(body, mimetype='application/json')
+    response.headers['X-Samples-Version'] = str(version)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = config.SAMPLES_CACHE_CONTROL
+    return response.make_conditional(request)
+
+
+def encode_cursor(generation: int, offset: int) -> str:
+    """Encode a sample-set generation and offset as an opaque cursor."""
+    raw = f"{generation}:{offset}".encode('ascii')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii')
+        generation, offset = (int(part) for part in raw.split(':'))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if offset < 0:
+        raise ValueError("Invalid cursor")
+    return generation, offset
+
+
+def stream_samples_page(samples: List[Any], total: int,
+                        next_cursor: Optional[str]) -> Iterator[bytes]:
+    """Encode a page of samples one element at a time."""
+    yield b'{"samples":['
+    for i, sample in enumerate(samples):
+        yield (b',' if i else b'') + app.json.dumps(sample.to_dict()).encode('utf-8')
+    meta = app.json.dumps({"count": len(samples), "total": total, "next_cursor": next_cursor})
+    # Splice the metadata object's members into the enclosing object
+    yield b'],' + meta[1:].encode('utf-8')
+
+
+@app.route('/predict/stream', methods=['POST'])
+def predict_stream():
+    """
+    Score a feed of articles over one long-lived connection.
+    
+    The request body is newline-delimited JSON, sent as it becomes
+    available (chunked transfer encoding), one item per line:
+        {"id": "reuters-1841", "text": "Article text"}
+    or just a JSON string. Items without an id are numbered from 1.
+    
+    Predictions are streamed back as they finish, not in input order:
+        {"id": "reuters-1841", "label": "FAKE", "confidence": 0.95, "is_fake": true}
+        {"id": 7, "error": "Empty text provided"}
+    followed by {"done": true, "received": n, "delivered": n} once the
+    request body has ended and every item is answered. With
+    "Accept: text/event-stream" the same objects are sent as "prediction"
+    and "done" server-sent events.
+    
+    Texts from all streams are micro-batched together. A connection
+    stops reading its request body while STREAM_WINDOW of its results
+    are unread, so clients must read the response while still sending.
+    Returns 503 with Retry-After when STREAM_MAX_CONNECTIONS streams are
+    open.
+    """
+    try:
+        stream_connections.acquire()
+    except OverloadedError as e:
+        return overloaded_response(e)
+    
+    try:
+        stream = ScoringStream(
+            stream_batcher,
+            request.stream,
+            window=config.STREAM_WINDOW,
+            max_chars=config.MAX_INPUT_CHARS
+        )
+    except Exception:
+        stream_connections.release()
+        raise
+    
+    use_sse = request.accept_mimetypes.best_match(
+        ['application/x-ndjson', 'text/event-stream']
+    ) == 'text/event-stream'
+    
+    def encode(event: str, payload: Optional[dict]) -> str:
+        if payload is None:
+            return ": keep-alive\n\n" if use_sse else "\n"
+        data = app.json.dumps(payload)
+        return f"event: {event}\ndata: {data}\n\n" if use_sse else data + "\n"
+    
+    def generate() -> Iterator[str]:
+        # Send the headers right away, before the first prediction is ready
+        yield ""
+        for result in stream.results(keepalive=config.STREAM_KEEPALIVE):
+            yield encode("prediction", result)
+        yield encode("done", {"done": True, **stream.summary})
+    
+    def finish() -> None:
+        stream.close()
+        stream_connections.release()
+    
+    response = Response(
+        generate(),
+        mimetype='text/event-stream' if use_sse else 'application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # Runs even if the client disconnects before the body is iterated
+    response.call_on_close(finish)
+    return response
+
+
+@app.route('/metrics/stream', methods=['GET'])
+def stream_metrics():
+    """
+    Streaming endpoint counters.
+    
+    Response JSON:
+        {
+            "connections": {"in_flight": 3, "rejected": 0, ...},
+            "batcher": {"batches": 412, "items": 18800, "mean_batch_size": 45.6, "queue_depth": 12, ...}
+        }
+    """
+    return jsonify({
+        "connections": stream_connections.stats,
+        "batcher": stream_batcher.stats
+    })
+
+
 @app.route('/samples', methods=['GET'])
 def get_samples():
     """
-    Get all sample headlines.
+    Get sample headlines, all at once or one page at a time.
+    
+    Without query parameters, all samples are returned in one cached
+    response with an ETag (304 Not Modified when the client is current).
+    Passing any of the parameters below switches to cursor pagination;
+    pages are encoded incrementally as they are sent.
+    
+    Query Parameters:
+        limit: Samples per page (default: 100, max: 1000)
+        cursor: Opaque cursor from the previous page's next_cursor
+        label: Optional label filter ("fake" or "true")
+        category: Optional category filter
     
     Response JSON:
         {
@@ -91,25 +458,65 @@ def get_samples():
                     "text": "Headline text",
                     "label": "fake" or "true",
                     "category": "politics",
-                    "source": "Source name"
+                    "source": "Source name",
+                    "prediction": {
+                        "label": "FAKE",
+                        "confidence": 0.95,
+                        "is_fake": true
+                    }
                 },
                 ...
-            ]
+            ],
+            "count": 100,                 (paginated responses only)
+            "total": 2500,                (paginated responses only)
+            "next_cursor": "MzoxMDA"      (paginated responses only, null on the last page)
         }
+    
+    A cursor from before the samples were reloaded is rejected with 410.
     """
+    paginate = any(name in request.args for name in ('limit', 'cursor', 'label', 'category'))
+    
     try:
-        samples = sample_service.get_all_samples()
-        return jsonify({
-            "samples": [
-                {
-                    "text": s.text,
-                    "label": s.label,
-                    "category": s.category,
-                    "source": s.source
-                }
-                for s in samples
-            ]
-        })
+        if not paginate:
+            return cached_json_response(
+                ('all',),
+                lambda: {"samples": [s.to_dict() for s in sample_service.get_all_samples()]}
+            )
+        
+        limit = request.args.get('limit', default=config.SAMPLES_PAGE_DEFAULT_LIMIT, type=int)
+        if not 1 <= limit <= config.SAMPLES_PAGE_MAX_LIMIT:
+            return jsonify({
+                "error": f"limit must be between 1 and {config.SAMPLES_PAGE_MAX_LIMIT}"
+            }), 400
+        
+        cursor = request.args.get('cursor')
+        generation, offset = None, 0
+        if cursor:
+            try:
+                generation, offset = decode_cursor(cursor)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+        
+        label = request.args.get('label') or None
+        category = request.args.get('category') or None
+        page, total, current_generation = sample_service.get_page(
+            limit, offset=offset, label=label, category=category
+        )
+        
+        if generation is not None and generation != current_generation:
+            return jsonify({
+                "error": "Cursor expired because the samples were reloaded; start again without a cursor"
+            }), 410
+        
+        next_offset = offset + len(page)
+        next_cursor = encode_cursor(current_generation, next_offset) if next_offset < total else None
+        
+        response = Response(
+            stream_samples_page(page, total, next_cursor),
+            mimetype='application/json'
+        )
+        response.headers['X-Samples-Version'] = str(current_generation)
+        return response
     except Exception as e:
         return jsonify({"error": f"Failed to load samples: {str(e)}"}), 500
 
@@ -129,18 +536,10 @@ def get_fake_samples():
     """
     try:
         count = request.args.get('count', default=5, type=int)
-        samples = sample_service.get_fake_samples(count=count)
-        return jsonify({
-            "samples": [
-                {
-                    "text": s.text,
-                    "label": s.label,
-                    "category": s.category,
-                    "source": s.source
-                }
-                for s in samples
-            ]
-        })
+        return cached_json_response(
+            ('fake', count),
+            lambda: {"samples": [s.to_dict() for s in sample_service.get_fake_samples(count=count)]}
+        )
     except Exception as e:
         return jsonify({"error": f"Failed to load fake samples: {str(e)}"}), 500
 
@@ -160,20 +559,59 @@ def get_true_samples():
     """
     try:
         count = request.args.get('count', default=5, type=int)
-        samples = sample_service.get_true_samples(count=count)
+        return cached_json_response(
+            ('true', count),
+            lambda: {"samples": [s.to_dict() for s in sample_service.get_true_samples(count=count)]}
+        )
+    except Exception as e:
+        return jsonify({"error": f"Failed to load true samples: {str(e)}"}), 500
+
+
+@app.route('/samples/search', methods=['GET'])
+def search_samples():
+    """
+    Full-text search over sample headlines.
+    
+    Query Parameters:
+        q: Search query (required)
+        limit: Number of results per page (default: 10, max: 100)
+        offset: Number of top-ranked results to skip (default: 0)
+    
+    Response JSON:
+        {
+            "query": "vaccine",
+            "total": 3,
+            "offset": 0,
+            "limit": 10,
+            "results": [
+                {"text": "...", "label": "true", ..., "score": 2.31},
+                ...
+            ]
+        }
+    """
+    query = request.args.get('q', default='', type=str)
+    if not query.strip():
+        return jsonify({"error": "Query parameter 'q' is required"}), 400
+    
+    limit = request.args.get('limit', default=10, type=int)
+    offset = request.args.get('offset', default=0, type=int)
+    if not 1 <= limit <= 100 or offset < 0:
+        return jsonify({"error": "limit must be between 1 and 100 and offset must not be negative"}), 400
+    
+    try:
+        total, page = sample_service.search(query, limit=limit, offset=offset)
         return jsonify({
-            "samples": [
-                {
-                    "text": s.text,
-                    "label": s.label,
-                    "category": s.category,
-                    "source": s.source
-                }
-                for s in samples
+            "query": query,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "results": [
+                {**sample.to_dict(), "score": round(score, 4)}
+                for sample, score in page
             ]
         })
     except Exception as e:
-        return jsonify({"error": f"Failed to load true samples: {str(e)}"}), 500
+        return jsonify({"error": f"Search failed: {str(e)}"}), 500
 
 
 @app.route('/health', methods=['GET'])
@@ -185,21 +623,310 @@ def health():
         {
             "status": "ok",
             "model_loaded": true,
-            "samples_loaded": true
+            "samples_loaded": true,
+            "samples_version": 3
         }
     """
     return jsonify({
         "status": "ok",
         "model_loaded": model_service.is_loaded,
-        "samples_loaded": len(sample_service.get_all_samples()) > 0
+        "samples_loaded": sample_service.sample_count > 0,
+        "samples_version": sample_service.version
     })
 
 
-def run_app():
-    """Run the Flask application."""
+# Liveness never changes, so its body is built once
+LIVEZ_BODY = b'{"status":"ok"}\n'
+
+
+@app.route('/livez', methods=['GET'])
+def livez():
+    """
+    Liveness probe: constant-time, touches no services.
+    
+    Response JSON:
+        {"status": "ok"}
+    """
+    return Response(LIVEZ_BODY, mimetype='application/json')
+
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """
+    Readiness probe based on the cached canary result and lane saturation.
+    
+    Returns 200 when the last background canary prediction succeeded
+    recently and no lane is saturated beyond READINESS_MAX_SATURATION,
+    otherwise 503. Probes never run a prediction themselves.
+    
+    Response JSON:
+        {
+            "ready": true,
+            "canary_ok": true,
+            "canary_error": null,
+            "canary_latency_ms": 3.2,
+            "canary_age_seconds": 4.1,
+            "saturation": 0.12
+        }
+    """
+    saturation = prediction_lanes.saturation
+    ready = readiness_monitor.is_healthy and saturation <= config.READINESS_MAX_SATURATION
+    payload = {
+        "ready": ready,
+        **readiness_monitor.status,
+        "saturation": round(saturation, 3)
+    }
+    return jsonify(payload), 200 if ready else 503
+
+
+@app.route('/metrics/lanes', methods=['GET'])
+def lane_metrics():
+    """
+    Per-lane admission counters and latency percentiles.
+    
+    Response JSON:
+        {
+            "short": {
+                "max_chars": 2000,
+                "in_flight": 1,
+                "waiting": 0,
+                ...
+                "latency": {"count": 120, "mean_ms": 4.1, "p50_ms": 3.2, "p95_ms": 9.8, "p99_ms": 15.0}
+            },
+            "long": {...}
+        }
+    """
+    return jsonify(prediction_lanes.stats)
+
+
+@app.route('/metrics/dedup', methods=['GET'])
+def dedup_metrics():
+    """
+    Near-duplicate reuse counters (see DEDUP_ENABLED).
+    
+    Response JSON:
+        {
+            "enabled": true,
+            "entries": 1520,
+            "lookups": 4210,
+            "reused": 1330,
+            "reuse_rate": 0.316,
+            ...
+        }
+    """
+    return jsonify(model_service.dedup_stats)
+
+
+@app.route('/metrics/prediction-cache', methods=['GET'])
+def prediction_cache_metrics():
+    """
+    Persistent prediction cache counters (see PREDICTION_CACHE_ENABLED).
+    
+    Response JSON:
+        {
+            "enabled": true,
+            "entries": 48210,
+            "hits": 9120,
+            "misses": 30544,
+            "hit_rate": 0.23,
+            "pending": 0,
+            "dropped": 0,
+            ...
+        }
+    """
+    return jsonify(model_service.prediction_cache_stats)
+
+
+@app.route('/sessions', methods=['POST'])
+def create_session():
+    """
+    Open an incremental scoring session for a text being edited.
+    
+    Request JSON:
+        {
+            "text": "Initial text (optional)"
+        }
+    
+    Response JSON (201):
+        {
+            "session_id": "3f2a...",
+            "label": "FAKE",
+            "confidence": 0.91,
+            "is_fake": true,
+            "revision": 1,
+            "chars_processed": 84,
+            "incremental": true,
+            "elapsed_ms": 0.41
+        }
+    
+    Results of texts with no scorable words carry "error" instead of
+    label/confidence/is_fake. Scoring is admitted through the prediction
+    lanes, so an overloaded lane returns 503 with Retry-After.
+    """
+    try:
+        payload = request.get_json(force=True, silent=True) or {}
+        text = payload.get('text', '') if isinstance(payload, dict) else None
+        
+        if not isinstance(text, str):
+            return jsonify({"error": "'text' must be a string"}), 400
+        
+        if text_too_long(text):
+            return too_long_response()
+        
+        lane = prediction_lanes.lane_for(len(text))
+        with prediction_lanes.admit(lane):
+            session = scoring_sessions.create(text)
+        return jsonify({"session_id": session.session_id, **session.result}), 201
+        
+    except OverloadedError as e:
+        return overloaded_response(e)
+    except Exception as e:
+        return jsonify({"error": f"Could not open session: {str(e)}"}), 500
+
+
+@app.route('/sessions/<session_id>', methods=['POST', 'DELETE'])
+def update_session(session_id: str):
+    """
+    Update or close a scoring session.
+    
+    POST takes either the full current text, of which only the changed
+    region is re-processed:
+        {
+            "text": "Full current text"
+        }
+    or a range edit made against a known revision:
+        {
+            "edit": {"start": 120, "end": 124, "text": "replacement"},
+            "revision": 7
+        }
+    and returns the new result (as for POST /sessions). An edit against
+    an outdated revision is rejected with 409; the client should then
+    send the full text. Unknown or expired sessions return 404. Updates
+    are admitted through the prediction lane for the new text's length.
+    
+    DELETE closes the session and ends its event stream.
+    """
+    if request.method == 'DELETE':
+        if not scoring_sessions.close(session_id):
+            return jsonify({"error": "Unknown session"}), 404
+        return '', 204
+    
+    try:
+        payload = request.get_json(force=True, silent=True)
+        if not isinstance(payload, dict):
+            return jsonify({"error": "Request body must be a JSON object"}), 400
+        
+        session = scoring_sessions.get(session_id)
+        
+        if 'edit' in payload:
+            edit = payload['edit']
+            revision = payload.get('revision')
+            if (not isinstance(edit, dict)
+                    or not all(isinstance(edit.get(key), int) for key in ('start', 'end'))
+                    or not isinstance(edit.get('text', ''), str)
+                    or (revision is not None and not isinstance(revision, int))):
+                return jsonify({"error": "'edit' needs integer start/end and a string text"}), 400
+            
+            start, end, replacement = edit['start'], edit['end'], edit.get('text', '')
+            new_length = len(session.text) - max(end - start, 0) + len(replacement)
+            if config.MAX_INPUT_CHARS is not None and new_length > config.MAX_INPUT_CHARS:
+                return too_long_response()
+            lane = prediction_lanes.lane_for(new_length)
+            with prediction_lanes.admit(lane):
+                result = scoring_sessions.apply_edit(session_id, start, end, replacement, revision)
+        else:
+            text = payload.get('text')
+            if not isinstance(text, str):
+                return jsonify({"error": "Provide 'text' or 'edit'"}), 400
+            if text_too_long(text):
+                return too_long_response()
+            lane = prediction_lanes.lane_for(len(text))
+            with prediction_lanes.admit(lane):
+                result = scoring_sessions.set_text(session_id, text)
+        
+        return jsonify(result)
+        
+    except KeyError:
+        return jsonify({"error": "Unknown session"}), 404
+    except StaleRevisionError as e:
+        return jsonify({"error": str(e), "revision": session.revision}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except OverloadedError as e:
+        return overloaded_response(e)
+    except Exception as e:
+        return jsonify({"error": f"Prediction failed: {str(e)}"}), 500
+
+
+@app.route('/sessions/<session_id>/events', methods=['GET'])
+def session_events(session_id: str):
+    """
+    Stream a session's results as server-sent events.
+    
+    Every new revision is sent as a "score" event whose data is the
+    result JSON and whose id is the revision, so a reconnecting
+    EventSource (Last-Event-ID) only gets revisions it has not seen.
+    Comment lines are sent while idle to keep proxies from closing the
+    connection; the stream ends when the session is closed or expires.
+    Returns 503 with Retry-After when SESSION_MAX_EVENT_STREAMS streams
+    are open.
+    """
+    try:
+        session = scoring_sessions.get(session_id)
+    except KeyError:
+        return jsonify({"error": "Unknown session"}), 404
+    
+    try:
+        session_streams.acquire()
+    except OverloadedError as e:
+        return overloaded_response(e)
+    
+    last_seen = request.headers.get('Last-Event-ID', '')
+    after = int(last_seen) if last_seen.isdigit() else 0
+    
+    def events() -> Iterator[str]:
+        revision = after
+        yield "retry: 2000\n\n"
+        while True:
+            result = session.wait_for_update(revision, config.SESSION_EVENT_KEEPALIVE)
+            if result is None:
+                if session.closed:
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            revision = result["revision"]
+            yield f"id: {revision}\nevent: score\ndata: {app.json.dumps(result)}\n\n"
+    
+    response = Response(
+        events(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # Runs even if the client disconnects before the body is iterated
+    response.call_on_close(session_streams.release)
+    return response
+
+
+def run_app(host: Optional[str] = None, port: Optional[int] = None):
+    """
+    Run the Flask application.
+    
+    Args:
+        host: Interface to bind. If None, uses config default.
+        port: Port to listen on. If None, uses config default.
+    """
+    # Worker processes are started here rather than at import time, so
+    # spawned workers re-importing this module don't start pools of their own
+    if config.INFERENCE_WORKERS > 0:
+        model_service.enable_process_pool(
+            config.INFERENCE_WORKERS,
+            lane_workers={lane["name"]: lane["workers"] for lane in config.PREDICTION_LANES}
+        )
+        print(f"✓ Process-pool inference backend started with {config.INFERENCE_WORKERS} workers")
+    
     app.run(
-        host=config.FLASK_HOST,
-        port=config.FLASK_PORT,
+        host=host or config.FLASK_HOST,
+        port=port or config.FLASK_PORT,
         debug=config.FLASK_DEBUG
     )
 
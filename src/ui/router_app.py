@@ -0,0 +1,167 @@
+"""
+Router front end for multiple Fake News Detector nodes.
+Accepts the same /predict and /predict/batch requests as the Flask app
+and forwards them to backend nodes with consistent hashing, so each
+node's caches see every repeat of the texts it owns.
+"""
+import hmac
+import ipaddress
+from typing import Optional, Sequence
+from flask import Flask, Response, request, jsonify
+from flask_cors import CORS
+from src.config import config
+from src.services.request_router import ForwardedResponse, NoBackendError, RequestRouter
+
+
+# Initialize Flask app
+app = Flask(__name__)
+CORS(app)
+
+# Backends and strategy can be overridden by run_router before serving
+request_router = RequestRouter(
+    config.ROUTER_BACKENDS,
+    strategy=config.ROUTER_STRATEGY,
+    vnodes=config.ROUTER_VNODES,
+    timeout=config.ROUTER_TIMEOUT
+)
+
+
+def relay(forwarded: ForwardedResponse) -> Response:
+    """Turn a forwarded backend response into a Flask response."""
+    return Response(forwarded.body, status=forwarded.status, headers=forwarded.headers)
+
+
+def unavailable_response() -> Response:
+    """503 response for when no backend is reachable."""
+    response = jsonify({"error": "No inference backend available"})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(config.RETRY_AFTER_SECONDS)
+    return response
+
+
+def admin_allowed() -> bool:
+    """
+    Whether the current request may change the backend set.
+
+    With ROUTER_ADMIN_TOKEN set, the request must carry it as a bearer
+    token; otherwise only loopback clients are allowed.
+    """
+    if config.ROUTER_ADMIN_TOKEN:
+        supplied = request.headers.get('Authorization', '')
+        expected = f"Bearer {config.ROUTER_ADMIN_TOKEN}"
+        return hmac.compare_digest(supplied.encode('utf-8'), expected.encode('utf-8'))
+    try:
+        return ipaddress.ip_address(request.remote_addr or '').is_loopback
+    except ValueError:
+        return False
+
+
+@app.route('/predict', methods=['POST'])
+def predict():
+    """
+    Forward a prediction to the node owning the text.
+
+    Request and response JSON are those of the Flask app's /predict.
+    """
+    payload = request.get_json(force=True, silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    try:
+        return relay(request_router.predict(payload))
+    except NoBackendError:
+        return unavailable_response()
+
+
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """
+    Split a batch across the nodes owning its texts and merge the results.
+
+    Request and response JSON are those of the Flask app's /predict/batch;
+    predictions are returned in input order.
+    """
+    payload = request.get_json(force=True, silent=True) or {}
+    texts = payload.get('texts') if isinstance(payload, dict) else None
+
+    if not isinstance(texts, list) or not texts:
+        return jsonify({"error": "'texts' must be a non-empty list"}), 400
+
+    if not all(isinstance(text, str) for text in texts):
+        return jsonify({"error": "All texts must be strings"}), 400
+
+    try:
+        return relay(request_router.predict_batch(texts))
+    except NoBackendError:
+        return unavailable_response()
+
+
+@app.route('/router/backends', methods=['GET', 'POST', 'DELETE'])
+def backends():
+    """
+    List, add or remove backend nodes.
+
+    POST and DELETE take {"url": "http://host:port"}. Only the keys of the
+    added or removed node move to a different node. They need the
+    ROUTER_ADMIN_TOKEN bearer token, or a loopback client if none is set.
+
+    Response JSON:
+        {
+            "strategy": "hash",
+            "backends": {
+                "http://127.0.0.1:5001": {"healthy": true, "requests": 120, "texts": 480, "failures": 0},
+                ...
+            }
+        }
+    """
+    if request.method != 'GET':
+        if not admin_allowed():
+            return jsonify({"error": "Changing backends is not allowed for this client"}), 403
+        payload = request.get_json(force=True, silent=True) or {}
+        url = payload.get('url') if isinstance(payload, dict) else None
+        if not isinstance(url, str) or not url.startswith(('http://', 'https://')):
+            return jsonify({"error": "'url' must be an http(s) URL"}), 400
+        if request.method == 'POST':
+            request_router.add_backend(url)
+        else:
+            request_router.remove_backend(url)
+    return jsonify(request_router.stats)
+
+
+@app.route('/livez', methods=['GET'])
+def livez():
+    """Liveness probe for the router itself."""
+    return jsonify({"status": "ok"})
+
+
+def run_router(host: Optional[str] = None, port: Optional[int] = None,
+               backends: Optional[Sequence[str]] = None, strategy: Optional[str] = None):
+    """
+    Run the router.
+
+    Args:
+        host: Interface to bind. If None, uses config default.
+        port: Port to listen on. If None, uses config default.
+        backends: Backend base URLs. If None, uses config default.
+        strategy: 'hash' or 'round_robin'. If None, uses config default.
+    """
+    global request_router
+    if backends is not None or strategy is not None:
+        request_router = RequestRouter(
+            config.ROUTER_BACKENDS if backends is None else backends,
+            strategy=strategy or config.ROUTER_STRATEGY,
+            vnodes=config.ROUTER_VNODES,
+            timeout=config.ROUTER_TIMEOUT
+        )
+    if config.ROUTER_HEALTH_INTERVAL > 0:
+        request_router.start_health_checks(config.ROUTER_HEALTH_INTERVAL)
+
+    app.run(
+        host=host or config.ROUTER_HOST,
+        port=port or config.ROUTER_PORT,
+        debug=False,
+        threaded=True
+    )
+
+
+if __name__ == '__main__':
+    run_router()
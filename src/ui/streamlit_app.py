@@ -111,8 +111,11 @@ def main():
     
     # Load services
     try:
-        model_service.load_model()
-        sample_service.load_samples()
+        if not model_service.is_loaded:
+            model_service.load_model()
+        model_service.check_for_updates()
+        sample_service.attach_model(model_service)
+        sample_service.check_for_updates()
     except Exception as e:
         st.error(f"Error loading services: {e}")
         st.stop()
@@ -178,7 +181,7 @@ def main():
                 use_container_width=True
             ):
                 st.session_state.selected_sample = sample.text
-                result = model_service.predict(sample.text)
+                result = sample_service.get_prediction(sample.text) or model_service.predict(sample.text)
                 st.session_state.prediction_result = result
                 st.rerun()
     
@@ -191,7 +194,7 @@ def main():
                 use_container_width=True
             ):
                 st.session_state.selected_sample = sample.text
-                result = model_service.predict(sample.text)
+                result = sample_service.get_prediction(sample.text) or model_service.predict(sample.text)
                 st.session_state.prediction_result = result
                 st.rerun()
     
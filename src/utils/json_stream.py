@@ -0,0 +1,140 @@
+"""
+Incremental JSON parsing utilities.
+Streams the elements of a large top-level JSON array without
+materializing the whole document in memory.
+"""
+import json
+import re
+from typing import Any, Iterator, TextIO
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters a number could still continue with after a chunk boundary
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
+
+class _StreamReader:
+    """Buffered reader that decodes JSON values one at a time from a file."""
+
+    def __init__(self, file: TextIO, chunk_size: int):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read another chunk, discarding already-consumed input."""
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._pos)
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of input)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._fill():
+                break
+        return self._buffer[self._pos:self._pos + 1]
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be char."""
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def _may_continue(self, value: Any, end: int) -> bool:
+        """Whether the value decoded up to end could be a prefix of a longer one."""
+        if end == len(self._buffer):
+            return True
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return _NUMBER_TAIL.match(self._buffer, end).end() == len(self._buffer)
+        return False
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # The value may just be cut off at the end of the buffer
+                if self._fill():
+                    continue
+                raise
+            # A value ending at the buffer edge, or a number cut off after
+            # e.g. "0." or "2.5e", may continue in the next chunk
+            if self._may_continue(value, end) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def iter_json_array(file: TextIO, key: str, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Stream the elements of an array stored under a top-level object key.
+
+    Only one element plus one read chunk is held in memory at a time, so
+    peak memory stays flat no matter how large the array is. Other keys
+    of the top-level object are parsed and discarded.
+
+    Args:
+        file: Text file positioned at the start of a JSON object
+        key: Top-level key holding the array to stream
+        chunk_size: Number of characters read from the file at a time
+
+    Yields:
+        Decoded array elements, in file order
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+        ValueError: If the key is missing or does not hold an array
+    """
+    reader = _StreamReader(file, chunk_size)
+    found = False
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        raise ValueError(f"JSON file must contain '{key}' key")
+
+    while True:
+        name = reader.value()
+        if not isinstance(name, str):
+            raise reader._error("Expecting property name")
+        reader.expect(":")
+
+        if name == key:
+            if reader.peek() != "[":
+                raise ValueError(f"'{key}' must be a JSON array")
+            reader.expect("[")
+            found = True
+            if reader.peek() == "]":
+                reader.expect("]")
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.peek() == ",":
+                        reader.expect(",")
+                        continue
+                    reader.expect("]")
+                    break
+        else:
+            reader.value()
+
+        if reader.peek() == ",":
+            reader.expect(",")
+            continue
+        reader.expect("}")
+        break
+
+    if not found:
+        raise ValueError(f"JSON file must contain '{key}' key")
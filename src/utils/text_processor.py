@@ -2,6 +2,7 @@
 Text processing utilities for cleaning and preprocessing news text.
 Handles stopword removal, lemmatization, and text normalization.
 """
+import hashlib
 import re
 from typing import List, Optional
 from src.config import config
@@ -130,6 +131,28 @@ class TextProcessor:
         
         return cleaned_texts
     
+    @property
+    def fingerprint(self) -> str:
+        """
+        Stable hash of everything that affects clean_text output.
+        
+        Covers the stopword list, minimum word length and lemmatizer, so
+        caches of cleaned text can be invalidated when any of them change.
+        """
+        lemmatizer = type(self._lemmatizer)
+        try:
+            # A lemmatizer whose data is missing falls back to no lemmatization
+            probe = self._lemmatizer.lemmatize("articles")
+        except Exception:
+            probe = "unavailable"
+        parts = [
+            ",".join(sorted(self._stop_words)),
+            str(config.MIN_WORD_LENGTH),
+            f"{lemmatizer.__module__}.{lemmatizer.__qualname__}",
+            probe,
+        ]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+    
     @property
     def has_stopwords(self) -> bool:
         """Check if stopwords are available."""
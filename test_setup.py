@@ -117,6 +117,100 @@ def test_model_service():
         print(f"✗ Model service failed: {e}")
         return False
 
+def test_streaming_feed():
+    """Test that streamed predictions come back while the feed is still open."""
+    print("\nTesting streaming feed...")
+    server = None
+    try:
+        import json
+        import socket
+        import threading
+        from werkzeug.serving import make_server
+        from src.ui.flask_app import app
+        
+        # Chunked bodies on the development server are the slowest to deliver items
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        
+        connection = socket.create_connection(("127.0.0.1", server.port), timeout=5)
+        connection.sendall(
+            b"POST /predict/stream HTTP/1.1\r\nHost: localhost\r\n"
+            b"Content-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n\r\n"
+        )
+        for i in range(3):
+            line = json.dumps({"id": i, "text": "Senate confirms new Federal Reserve chairman"}).encode() + b"\n"
+            connection.sendall(b"%x\r\n%s\r\n" % (len(line), line))
+        
+        # The body stays open: a prediction must arrive before it ends
+        received = b""
+        try:
+            while b'"label"' not in received:
+                data = connection.recv(4096)
+                if not data:
+                    break
+                received += data
+        except socket.timeout:
+            pass
+        connection.sendall(b"0\r\n\r\n")
+        connection.close()
+        
+        if b'"label"' in received:
+            print("✓ Predictions stream back while the feed is open")
+            return True
+        else:
+            print("✗ No prediction arrived before the feed ended")
+            return False
+    except Exception as e:
+        print(f"✗ Streaming feed failed: {e}")
+        return False
+    finally:
+        if server is not None:
+            server.shutdown()
+
+def test_scoring_session():
+    """Test that incremental session results match full predictions after edits."""
+    print("\nTesting scoring sessions...")
+    try:
+        import random
+        from src.services.model_service import model_service
+        from src.services.scoring_session import ScoringSessionManager
+        
+        if not model_service.is_loaded:
+            model_service.load_model()
+        sessions = ScoringSessionManager(model_service, max_sessions=1)
+        
+        rng = random.Random(0)
+        words = ("Senate confirms new Federal Reserve chairman after hearing. "
+                 "BREAKING: shocking truth they don't want you to know! "
+                 "Officials said on Tuesday the report [link] was <b>wrong</b>\n").split(" ")
+        session = sessions.create(" ".join(words))
+        mismatches = 0
+        edits = 300
+        for _ in range(edits):
+            text = session.text
+            start = rng.randint(0, len(text))
+            end = min(len(text), start + rng.randint(0, 30))
+            replacement = " ".join(rng.choice(words) for _ in range(rng.randint(0, 4)))
+            result = sessions.apply_edit(session.session_id, start, end, replacement)
+            
+            expected = model_service.predict(session.text, bypass_cache=True)
+            if expected.is_valid != ("label" in result):
+                mismatches += 1
+            elif expected.is_valid and (expected.label != result["label"]
+                                        or abs(expected.confidence - result["confidence"]) > 1e-6):
+                mismatches += 1
+        
+        print(f"  {edits} random edits, {mismatches} mismatches")
+        if mismatches == 0:
+            print("✓ Session results match full predictions")
+            return True
+        else:
+            print("✗ Session results drifted from full predictions")
+            return False
+    except Exception as e:
+        print(f"✗ Scoring sessions failed: {e}")
+        return False
+
 def main():
     """Run all tests."""
     print("=" * 60)
@@ -128,7 +222,9 @@ def main():
         test_config,
         test_text_processor,
         test_sample_service,
-        test_model_service
+        test_model_service,
+        test_streaming_feed,
+        test_scoring_session
     ]
     
     results = []